@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Cave Game Balance Report
+
+Evaluates every (class, weapon) combination against every enemy
+profile in config.ENEMY_PROFILES with the combat simulator, spreading the
+cells over a process pool, and writes the matrix as CSV and/or JSON:
+
+    expected_dps       Expected damage per turn, from the damage tables
+    win_rate           Simulated win probability (also escape/defeat rates)
+    mean_turns         Mean turns per fight, and turns_variance
+    mean_damage_taken  Mean health lost per fight, and damage_variance
+    outliers           Metrics more than --threshold standard deviations
+                       from the other cells against the same enemy
+
+Cells use the class's starting stats. There is no level axis: leveling up
+in the game only restores health (GameCore.level_up), so every level
+fights alike. Every cell draws from its own split of the seed's random
+streams, so the report does not depend on how many workers ran it.
+
+Usage:
+    python balance.py [--fights N] [--workers N] [--seed N]
+                      [--policy basic_attack=0.7,defend=0.2,run=0.1]
+                      [--csv report.csv] [--json report.json]
+"""
+
+import argparse
+import csv
+import json
+import statistics
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from config import ENEMY_PROFILES
+from content import load_content
+from random_streams import RandomStreams
+from simulator import WON, Policy, matrix_cells, parse_policy, simulate
+
+# Metrics checked for outliers
+OUTLIER_METRICS = ('expected_dps', 'win_rate', 'mean_turns')
+
+CSV_FIELDS = ('enemy', 'class', 'weapon', 'stat_value', 'fights', 'expected_dps',
+              'win_rate', 'escape_rate', 'defeat_rate', 'mean_turns', 'turns_variance',
+              'mean_damage_taken', 'damage_variance', 'outliers')
+
+Task = Tuple[int, str, str, str, int, Policy, int]
+
+_worker_content: Optional[Dict[str, Any]] = None
+
+
+def _init_worker() -> None:
+    """Load content once per worker process"""
+    global _worker_content
+    _worker_content = load_content()
+
+
+def damage_stat(class_data: Dict[str, Any], stat: Optional[str]) -> int:
+    """Value of the stat a class's damage scales with, 0 if it scales with none"""
+    return 0 if stat is None else class_data[stat]
+
+
+def expected_damage(content: Dict[str, Any], class_key: str, weapon: str, stat_value: int) -> float:
+    """Expected basic attack damage, averaging in critical hits"""
+    hit, critical_hit = content['damage_tables'].lookup(class_key, weapon, stat_value)
+    critical_chance = content['classes'][class_key]['combat_skills']['basic_attack'].get('critical_chance', 0.0)
+    return hit * (1 - critical_chance) + critical_hit * critical_chance
+
+
+def attack_share(policy: Policy) -> float:
+    """Fraction of turns the policy spends attacking"""
+    if isinstance(policy, str):
+        return 1.0 if policy == 'basic_attack' else 0.0
+    return policy.get('basic_attack', 0.0) / sum(policy.values())
+
+
+def evaluate_cell(task: Task, content: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Simulate one cell of the matrix and return its report row"""
+    index, class_key, weapon, enemy_key, fights, policy, seed = task
+    content = content if content is not None else (_worker_content or load_content())
+    class_data = content['classes'][class_key]
+    stat_value = damage_stat(class_data, content['damage_tables'].class_stat[class_key])
+    stats = simulate(class_key, fights, weapon, policy, content, streams=RandomStreams(seed).split(index),
+                     stat_value=stat_value, enemy=ENEMY_PROFILES[enemy_key])
+
+    summary = stats.summary()
+    return {
+        'enemy': enemy_key,
+        'class': class_key,
+        'weapon': weapon,
+        'stat_value': stat_value,
+        'fights': fights,
+        'expected_dps': expected_damage(content, class_key, weapon, stat_value) * attack_share(policy),
+        'win_rate': summary['win_rate'],
+        'escape_rate': summary['escape_rate'],
+        'defeat_rate': summary['defeat_rate'],
+        'mean_turns': float(stats.turns.mean()),
+        'turns_variance': float(stats.turns.var()),
+        'mean_damage_taken': summary['mean_damage_taken'],
+        'damage_variance': float(stats.damage_taken.var()),
+        'turns_to_kill': stats.turns_to_kill() if (stats.outcome == WON).any() else {},
+        'outliers': [],
+    }
+
+
+def build_tasks(content: Dict[str, Any], fights: int, policy: Policy, seed: int) -> List[Task]:
+    """List every cell of the matrix as a picklable task"""
+    cells = [(enemy_key, class_key, weapon)
+             for enemy_key in ENEMY_PROFILES
+             for class_key, weapon in matrix_cells(content)]
+    return [(index, class_key, weapon, enemy_key, fights, policy, seed)
+            for index, (enemy_key, class_key, weapon) in enumerate(cells)]
+
+
+def flag_outliers(rows: List[Dict[str, Any]], threshold: float = 2.0) -> None:
+    """Mark metrics far from the other cells against the same enemy"""
+    groups: Dict[str, List[Dict[str, Any]]] = {}
+    for row in rows:
+        groups.setdefault(row['enemy'], []).append(row)
+    for group in groups.values():
+        for metric in OUTLIER_METRICS:
+            values = [row[metric] for row in group]
+            if len(values) < 3:
+                continue
+            mean = statistics.fmean(values)
+            spread = statistics.pstdev(values)
+            if not spread:
+                continue
+            for row in group:
+                score = (row[metric] - mean) / spread
+                if abs(score) > threshold:
+                    row['outliers'].append(f"{metric}_{'high' if score > 0 else 'low'}")
+
+
+def balance_report(fights: int = 100000, policy: Policy = 'basic_attack', seed: int = 1,
+                   workers: Optional[int] = None, threshold: float = 2.0) -> List[Dict[str, Any]]:
+    """Evaluate the whole matrix, in parallel unless workers is 1"""
+    content = load_content()
+    tasks = build_tasks(content, fights, policy, seed)
+    if workers == 1:
+        rows = [evaluate_cell(task, content) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+            rows = list(pool.map(evaluate_cell, tasks, chunksize=4))
+    flag_outliers(rows, threshold)
+    return rows
+
+
+def write_csv(rows: List[Dict[str, Any]], path: str) -> None:
+    """Write the matrix as CSV, one row per cell"""
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=CSV_FIELDS, extrasaction='ignore')
+        writer.writeheader()
+        for row in rows:
+            writer.writerow(dict(row, outliers=';'.join(row['outliers'])))
+
+
+def write_json(rows: List[Dict[str, Any]], path: str, settings: Dict[str, Any]) -> None:
+    """Write the matrix and the settings that produced it as JSON"""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'settings': settings, 'cells': rows}, f, indent=2)
+
+
+def main(argv: List[str]) -> int:
+    """Run the balance report from the command line"""
+    parser = argparse.ArgumentParser(description="Evaluate combat balance across classes and weapons")
+    parser.add_argument('--fights', type=int, default=100000, help="fights per cell")
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (default: one per CPU)")
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--policy', type=parse_policy, default='basic_attack',
+                        help="skill key or weights, e.g. basic_attack=0.7,defend=0.2,run=0.1")
+    parser.add_argument('--threshold', type=float, default=2.0, help="outlier z-score")
+    parser.add_argument('--csv', help="write the matrix to this CSV file")
+    parser.add_argument('--json', help="write the matrix to this JSON file")
+    args = parser.parse_args(argv[1:])
+
+    try:
+        start = time.perf_counter()
+        rows = balance_report(args.fights, args.policy, args.seed, args.workers, args.threshold)
+        elapsed = time.perf_counter() - start
+    except ImportError as e:
+        print(f"❌ {e}")
+        return 1
+
+    if args.csv:
+        write_csv(rows, args.csv)
+    if args.json:
+        settings = {key: getattr(args, key) for key in ('fights', 'seed', 'policy', 'threshold')}
+        write_json(rows, args.json, settings)
+
+    print(f"📊 {len(rows)} cells x {args.fights:,} fights in {elapsed:.1f}s")
+    for row in rows:
+        if row['outliers']:
+            print(f"⚠️  {row['enemy']} {row['class']} / {row['weapon']}: "
+                  f"{', '.join(row['outliers'])} (dps {row['expected_dps']:.1f}, "
+                  f"win {row['win_rate']:.1%}, turns {row['mean_turns']:.2f})")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv))
@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+Cave Game Combat Log
+
+A compact binary record of what happened in combat, for replays, balance
+analytics and regression tests. A log is a header followed by fixed-width
+records:
+
+    header  magic b'CVLG', format version (u8), run seed (u64)
+    record  kind (u8), turn (u16), actor (u16), target (u16), amount (i16), health (i16)
+
+actor is who acted and target who it was done to, each ACTOR_PLAYER or an
+enemy's number in its encounter; target is NO_TARGET for records without
+one. The player acts in every record but DAMAGE. amount and health depend
+on the kind:
+
+                target  amount, health
+    START       -       encounter number (in config.ENCOUNTERS, or
+                        UNKNOWN_ENCOUNTER), enemy count
+    ATTACK      enemy   damage dealt, the target's health after it
+    CRIT        enemy   as ATTACK, for a critical hit
+    DEFEND      -       -, player health
+    DAMAGE      player  damage taken, player health after it
+    ESCAPE      -       -, player health
+    FLEE_FAIL   -       -, player health
+    KILL        enemy   -, enemies remaining
+    VICTORY     -       experience gained, player health
+    DEFEAT      -       -, player health
+
+Eleven bytes a record means a million events fit in 11 MB, and the
+reader decodes them in large chunks with struct.iter_unpack, so it
+streams logs of any size in constant memory:
+
+    log = CombatLog(seed, open('fight.cvlg', 'wb'))
+    core = GameCore(seed=seed, combat_log=log)
+    ...
+    log.close()
+    with open('fight.cvlg', 'rb') as f:
+        reader = LogReader(f)
+        for event in reader:
+            ...
+
+Usage:
+    python combat_log.py LOG...   # Summarize logs
+"""
+
+import struct
+import sys
+from collections import Counter
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from config import ENCOUNTERS
+
+MAGIC = b'CVLG'
+LOG_FORMAT = 1
+
+HEADER = struct.Struct('<4sBQ')
+RECORD = struct.Struct('<BHHHhh')
+
+# Record kinds
+START = 1
+ATTACK = 2
+CRIT = 3
+DEFEND = 4
+DAMAGE = 5
+ESCAPE = 6
+FLEE_FAIL = 7
+KILL = 8
+VICTORY = 9
+DEFEAT = 10
+
+KIND_NAMES = {START: 'start', ATTACK: 'attack', CRIT: 'crit', DEFEND: 'defend', DAMAGE: 'damage',
+              ESCAPE: 'escape', FLEE_FAIL: 'flee_fail', KILL: 'kill', VICTORY: 'victory', DEFEAT: 'defeat'}
+
+# Actor or target meaning the player, and target of records that have none
+ACTOR_PLAYER = 0xFFFF
+NO_TARGET = 0xFFFE
+
+# Encounter keys by the number START records store, and that number by key;
+# an encounter missing from config.ENCOUNTERS is logged as UNKNOWN_ENCOUNTER
+ENCOUNTER_KEYS = tuple(ENCOUNTERS)
+ENCOUNTER_NUMBERS = {key: number for number, key in enumerate(ENCOUNTER_KEYS)}
+UNKNOWN_ENCOUNTER = -1
+
+# Records buffered before a writer flushes to its stream, and read per chunk
+CHUNK_RECORDS = 4096
+
+Record = Tuple[int, int, int, int, int, int]  # (kind, turn, actor, target, amount, health)
+
+
+class CombatEvent(NamedTuple):
+    """One decoded combat log record"""
+    kind: int
+    turn: int
+    actor: int
+    target: int
+    amount: int
+    health: int
+
+    @property
+    def name(self) -> str:
+        return KIND_NAMES.get(self.kind, str(self.kind))
+
+
+class LogFormatError(ValueError):
+    """Raised when a stream is not a combat log this version can read."""
+
+
+def _clamp(value: int, low: int, high: int) -> int:
+    return low if value < low else high if value > high else value
+
+
+class CombatLog:
+    """
+    Append-only binary combat log.
+
+    Records accumulate in a buffer; with a stream, the buffer is written
+    out every CHUNK_RECORDS records and on flush() or close().
+
+    Attributes:
+        seed (int): Seed of the run the log records
+        count (int): Number of records written so far
+    """
+    def __init__(self, seed: int, stream: Optional[BinaryIO] = None) -> None:
+        self.seed = seed
+        self.count = 0
+        self._stream = stream
+        self._buffer = bytearray(HEADER.pack(MAGIC, LOG_FORMAT, seed & 0xFFFFFFFFFFFFFFFF))
+        self._flush_at = RECORD.size * CHUNK_RECORDS
+
+    def record(self, kind: int, turn: int, actor: int, target: int, amount: int, health: int) -> None:
+        """Append one record; values are clamped to their field widths"""
+        self._buffer += RECORD.pack(kind, turn & 0xFFFF, actor & 0xFFFF, target & 0xFFFF,
+                                    _clamp(amount, -32768, 32767), _clamp(health, -32768, 32767))
+        self.count += 1
+        if self._stream is not None and len(self._buffer) >= self._flush_at:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write buffered records to the stream"""
+        if self._stream is not None and self._buffer:
+            self._stream.write(self._buffer)
+            self._buffer = bytearray()
+
+    def close(self) -> None:
+        """Flush and close the stream"""
+        self.flush()
+        if self._stream is not None:
+            self._stream.close()
+
+    def getvalue(self) -> bytes:
+        """Return the whole log, for logs kept in memory"""
+        if self._stream is not None:
+            raise ValueError("The log was written to a stream; read it back with LogReader")
+        return bytes(self._buffer)
+
+
+class LogReader:
+    """
+    Streaming reader for a combat log.
+
+    Attributes:
+        seed (int): Seed of the run the log records
+        version (int): Log format version
+    """
+    def __init__(self, stream: BinaryIO) -> None:
+        header = stream.read(HEADER.size)
+        if len(header) < HEADER.size:
+            raise LogFormatError("Combat log is truncated")
+        magic, self.version, self.seed = HEADER.unpack(header)
+        if magic != MAGIC:
+            raise LogFormatError("Not a combat log")
+        if self.version > LOG_FORMAT:
+            raise LogFormatError(f"Combat log format {self.version} is newer than this reader ({LOG_FORMAT})")
+        self._stream = stream
+
+    def records(self) -> Iterator[Record]:
+        """Yield raw (kind, turn, actor, target, amount, health) tuples"""
+        chunk_size = RECORD.size * CHUNK_RECORDS
+        pending = b''
+        while True:
+            chunk = self._stream.read(chunk_size)
+            if not chunk:
+                break
+            data = pending + chunk
+            usable = len(data) - len(data) % RECORD.size
+            yield from RECORD.iter_unpack(data[:usable])
+            pending = data[usable:]
+        if pending:
+            raise LogFormatError("Combat log ends in a partial record")
+
+    def __iter__(self) -> Iterator[CombatEvent]:
+        for record in self.records():
+            yield CombatEvent(*record)
+
+
+def summarize(records: Iterable[Record]) -> Dict[str, Any]:
+    """Count events by kind and total the damage dealt and taken"""
+    kinds = Counter()
+    dealt = taken = 0
+    for kind, _turn, _actor, _target, amount, _health in records:
+        kinds[kind] += 1
+        if kind == ATTACK or kind == CRIT:
+            dealt += amount
+        elif kind == DAMAGE:
+            taken += amount
+    fights = kinds[START]
+    return {
+        'events': sum(kinds.values()),
+        'fights': fights,
+        'by_kind': {KIND_NAMES.get(kind, str(kind)): count for kind, count in sorted(kinds.items())},
+        'win_rate': kinds[VICTORY] / fights if fights else None,
+        'crit_rate': kinds[CRIT] / (kinds[ATTACK] + kinds[CRIT]) if kinds[ATTACK] + kinds[CRIT] else None,
+        'damage_dealt': dealt,
+        'damage_taken': taken,
+    }
+
+
+def main(argv: List[str]) -> int:
+    """Print a summary of each log given on the command line"""
+    if len(argv) < 2:
+        print("Usage: python combat_log.py LOG...")
+        return 1
+    for path in argv[1:]:
+        try:
+            with open(path, 'rb') as f:
+                reader = LogReader(f)
+                summary = summarize(reader.records())
+        except (OSError, LogFormatError) as e:
+            print(f"❌ {path}: {e}")
+            return 1
+        print(f"📜 {path}: seed {reader.seed}, {summary['events']:,} events, {summary['fights']:,} fights")
+        for name, count in summary['by_kind'].items():
+            print(f"   {name:<10} {count:>10,}")
+        if summary['win_rate'] is not None:
+            print(f"   win rate {summary['win_rate']:.1%}, damage dealt {summary['damage_dealt']:,}, "
+                  f"taken {summary['damage_taken']:,}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv))
@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""
+Cave Game Combat Solver
+
+Exact combat outcome probabilities by dynamic programming. At the
+player's turn a fight is fully described by (player health, enemy health,
+phase), so instead of sampling fights the solver computes, for every such
+state, the probability of winning, escaping and being defeated and the
+expected number of turns left, under a fixed policy over combat skills.
+The rules are the same as GameCore's combat skills and the simulator's.
+
+The phase is the player's place in the initiative cycle
+(encounter.lone_enemy_turns): it decides how many times the enemy acts
+before the player's next turn, all of them through a defense if the player
+defended. Against an enemy as fast as the player there is one phase and
+one enemy turn per player turn.
+
+States are filled bottom-up (a turn never raises either health) and kept,
+so after the first query every state up to that size is a table lookup.
+The phases of one pair of healths can lead into one another when nobody
+is hurt, so they are solved together around the cycle.
+With exact=True the probabilities are Fractions, for tests that pin
+balance numbers down exactly.
+
+    solver = CombatSolver('rogue')
+    solver.solve(80, 30).win          # 0.97...
+    solver.action_odds(80, 30, 2)     # outcome of each skill on the third turn
+
+Usage:
+    python combat_solver.py [policy]   # Exact odds for every class and weapon
+"""
+
+import sys
+import time
+from fractions import Fraction
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple, Union
+
+from config import ENEMY_PROFILES, PLAYER_SPEED
+from content import load_content
+from encounter import lone_enemy_turns
+from equipment import armor_absorbs
+
+# Enemy fought when no profile is given
+DEFAULT_ENEMY = 'ground_dwelling_creature'
+
+Number = Union[float, Fraction]
+State = Tuple[int, int, int]  # (player health, enemy health, phase)
+
+
+class Outcome(NamedTuple):
+    """Probabilities of each way a fight ends, and the expected turns until it does"""
+    win: Number
+    escape: Number
+    defeat: Number
+    expected_turns: Number
+
+
+class CombatSolver:
+    """
+    Memoized exact solver for one class, weapon, policy and enemy.
+
+    Attributes:
+        class_key (str): Class that fights
+        weapon (str): Weapon the class attacks with
+        policy (Dict[str, Number]): Probability of picking each skill per turn
+        enemy (Dict[str, Any]): Enemy profile, as in config.ENEMY_PROFILES
+        defense (int): Percentage of each enemy hit the player's armor absorbs
+        player_speed (int): Initiative speed of the player
+        exact (bool): Whether probabilities are Fractions rather than floats
+    """
+    def __init__(self, class_key: str, weapon: Optional[str] = None,
+                 policy: Union[str, Dict[str, float]] = 'basic_attack',
+                 content: Optional[Dict[str, Any]] = None, enemy: Optional[Dict[str, Any]] = None,
+                 stat_value: Optional[int] = None, defense: int = 0, player_speed: int = PLAYER_SPEED,
+                 exact: bool = False) -> None:
+        content = content if content is not None else load_content()
+        class_data = content['classes'][class_key]
+        skills = class_data['combat_skills']
+        self.class_key = class_key
+        self.weapon = weapon or class_data['starting_weapon']
+        self.enemy = enemy if enemy is not None else ENEMY_PROFILES[DEFAULT_ENEMY]
+        self.defense = defense
+        self.player_speed = player_speed
+        self.exact = exact
+
+        weights = {policy: 1} if isinstance(policy, str) else dict(policy)
+        unknown = [skill for skill in weights if skill not in skills]
+        if unknown:
+            raise ValueError(f"Policy uses skills this class does not have: {', '.join(unknown)}")
+        total = sum(self._number(weight) for weight in weights.values())
+        if total <= 0:
+            raise ValueError("Policy must give some skill a positive weight")
+        self.policy = {skill: self._number(weight) / total for skill, weight in weights.items() if weight}
+
+        self._hit = self._critical_hit = 0
+        self._critical_chance = self._number(0)
+        if 'basic_attack' in skills:
+            tables = content['damage_tables']
+            stat = tables.class_stat[class_key]
+            if stat_value is None:
+                stat_value = class_data[stat] if stat else 0
+            self._hit, self._critical_hit = tables.lookup(class_key, self.weapon, stat_value)
+            self._critical_chance = self._number(skills['basic_attack'].get('critical_chance', 0))
+        self._success_chance = self._number(skills['run']['success_chance']) if 'run' in skills else 0
+
+        # Enemy damage per roll, plain and through a defense, then armor, as GameCore deals it
+        low, high = self.enemy['damage']
+        reduction = skills['defend']['damage_reduction'] if 'defend' in skills else 0.0
+        roll_chance = self._number(1) / (high - low + 1)
+        rolls = {
+            False: list(range(low, high + 1)),
+            True: [int(damage * (1 - reduction)) for damage in range(low, high + 1)],
+        }
+        self._enemy_rolls = {
+            defending: [(damage - armor_absorbs(damage, defense), roll_chance) for damage in damages]
+            for defending, damages in rolls.items()
+        }
+        self._volleys: Dict[Tuple[int, bool], List[Tuple[int, Number]]] = {}
+        self._opening, self._cycle = lone_enemy_turns(player_speed, self.enemy.get('speed', player_speed))
+
+        self._table: Dict[State, Outcome] = {}
+        self._filled = (0, 0)
+
+    def _number(self, value: Any) -> Number:
+        """Convert a content number to the solver's arithmetic"""
+        return Fraction(str(value)) if self.exact else float(value)
+
+    # ------------------------------------------------------------------
+    # Dynamic programming
+    # ------------------------------------------------------------------
+    def _fill(self, player_health: int, enemy_health: int) -> None:
+        """Compute every state up to the given healths, smallest first"""
+        filled_player, filled_enemy = self._filled
+        if player_health <= filled_player and enemy_health <= filled_enemy:
+            return
+        player_health = max(player_health, filled_player)
+        enemy_health = max(enemy_health, filled_enemy)
+        for p in range(1, player_health + 1):
+            for e in range(1, enemy_health + 1):
+                if (p, e, 0) not in self._table:
+                    self._solve_cycle(p, e)
+        self._filled = (player_health, enemy_health)
+
+    def _action_terms(self, state: State, skill: str):
+        """Yield (probability, terminal outcome or next state) for one skill"""
+        p, e, phase = state
+        attacks = self._cycle[phase]
+        following = (phase + 1) % len(self._cycle)
+        if skill == 'basic_attack':
+            hits = [(self._hit, 1 - self._critical_chance)]
+            if self._critical_chance:
+                hits.append((self._critical_hit, self._critical_chance))
+            for damage, chance in hits:
+                if e - damage <= 0:
+                    yield chance, 'win'
+                else:
+                    yield from self._enemy_terms(chance, p, e - damage, attacks, False, following)
+        elif skill == 'defend':
+            yield from self._enemy_terms(1, p, e, attacks, True, following)
+        elif skill == 'run':
+            if self._success_chance:
+                yield self._success_chance, 'escape'
+            yield from self._enemy_terms(1 - self._success_chance, p, e, attacks, False, following)
+
+    def _volley(self, attacks: int, defending: bool) -> List[Tuple[int, Number]]:
+        """Distribution of the total damage of several enemy turns in a row"""
+        volley = self._volleys.get((attacks, defending))
+        if volley is None:
+            totals = {0: self._number(1)}
+            for _ in range(attacks):
+                following: Dict[int, Number] = {}
+                for total, chance in totals.items():
+                    for damage, roll_chance in self._enemy_rolls[defending]:
+                        following[total + damage] = following.get(total + damage, 0) + chance * roll_chance
+                totals = following
+            volley = self._volleys[(attacks, defending)] = sorted(totals.items())
+        return volley
+
+    def _enemy_terms(self, chance: Number, p: int, e: int, attacks: int, defending: bool, phase: int):
+        """Yield the outcomes of the enemy's turns before the player's next one
+
+        Damage only adds up, so the player falls during the turns exactly
+        when their total reaches its health.
+        """
+        if not chance:
+            return
+        for damage, volley_chance in self._volley(attacks, defending):
+            if p - damage <= 0:
+                yield chance * volley_chance, 'defeat'
+            else:
+                yield chance * volley_chance, (p - damage, e, phase)
+
+    def _outcome_of(self, terms, turns: Number, loop_state: Optional[State] = None) -> Tuple[Outcome, Number]:
+        """Combine weighted terms into an outcome taking turns turns, and the chance of reaching loop_state
+
+        The outcome leaves out the terms that reach loop_state.
+        """
+        zero = self._number(0)
+        win = escape = defeat = loop = zero
+        for chance, result in terms:
+            if result == 'win':
+                win += chance
+            elif result == 'escape':
+                escape += chance
+            elif result == 'defeat':
+                defeat += chance
+            elif result == loop_state:
+                loop += chance
+            else:
+                following = self._table[result]
+                win += chance * following.win
+                escape += chance * following.escape
+                defeat += chance * following.defeat
+                turns += chance * following.expected_turns
+        return Outcome(win, escape, defeat, turns), loop
+
+    def _solve_cycle(self, p: int, e: int) -> None:
+        """Solve every phase of one pair of healths
+
+        Phase i leads to phase i + 1 with the same healths with chance
+        loop[i], so outcome[i] = partial[i] + loop[i] * outcome[i + 1]
+        around the cycle: unroll it from phase 0, then fill in backwards.
+        """
+        length = len(self._cycle)
+        parts = []
+        for phase in range(length):
+            terms = [(weight * chance, result)
+                     for skill, weight in self.policy.items()
+                     for chance, result in self._action_terms((p, e, phase), skill)]
+            parts.append(self._outcome_of(terms, self._number(1), (p, e, (phase + 1) % length)))
+
+        zero = self._number(0)
+        total = Outcome(zero, zero, zero, zero)
+        reach = self._number(1)
+        for partial, loop in parts:
+            total = Outcome(*(value + reach * part for value, part in zip(total, partial)))
+            reach *= loop
+        if reach >= 1:
+            raise ValueError(f"The fight from {(p, e)} never ends under this policy")
+        outcome = Outcome(*(value / (1 - reach) for value in total))
+        self._table[(p, e, 0)] = outcome
+        for phase in range(length - 1, 0, -1):
+            partial, loop = parts[phase]
+            outcome = Outcome(*(part + loop * value for part, value in zip(partial, outcome)))
+            self._table[(p, e, phase)] = outcome
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+    def solve(self, player_health: int, enemy_health: Optional[int] = None, turn: Optional[int] = None) -> Outcome:
+        """Return the outcome of a fight from the given state
+
+        turn is the number of actions the player has taken, at its next
+        turn; None is a fight about to start, including any enemy turns
+        before the player's first.
+        """
+        enemy_health = self.enemy['health'] if enemy_health is None else enemy_health
+        zero = self._number(0)
+        if enemy_health <= 0:
+            return Outcome(self._number(1), zero, zero, zero)
+        if player_health <= 0:
+            return Outcome(zero, zero, self._number(1), zero)
+        self._fill(player_health, enemy_health)
+        if turn is not None:
+            return self._table[(player_health, enemy_health, turn % len(self._cycle))]
+        terms = self._enemy_terms(1, player_health, enemy_health, self._opening, False, 0)
+        return self._outcome_of(terms, zero)[0]
+
+    def action_odds(self, player_health: int, enemy_health: Optional[int] = None,
+                    turn: int = 0) -> Dict[str, Outcome]:
+        """Return the outcome of using each skill on the given turn and following the policy after"""
+        enemy_health = self.enemy['health'] if enemy_health is None else enemy_health
+        self._fill(player_health, enemy_health)
+        state = (player_health, enemy_health, turn % len(self._cycle))
+        return {skill: self._outcome_of(self._action_terms(state, skill), self._number(1))[0]
+                for skill in ('basic_attack', 'defend', 'run')
+                if skill != 'basic_attack' or self._hit or self._critical_hit}
+
+
+def main(argv: List[str]) -> int:
+    """Print exact odds for the whole matrix against the default enemy"""
+    from simulator import matrix_cells, parse_policy  # Optional module; only the report needs it
+    policy = parse_policy(argv[1]) if len(argv) > 1 else 'basic_attack'
+    content = load_content()
+    start = time.perf_counter()
+    rows = []
+    for class_key, weapon in matrix_cells(content):
+        solver = CombatSolver(class_key, weapon, policy, content)
+        rows.append((class_key, weapon, solver.solve(content['classes'][class_key]['health'])))
+    elapsed = time.perf_counter() - start
+
+    print(f"{'Class':<8} {'Weapon':<17} {'Win':>8} {'Escape':>8} {'Defeat':>8} {'Turns':>6}")
+    for class_key, weapon, outcome in rows:
+        print(f"{class_key:<8} {weapon:<17} {outcome.win:>8.3%} {outcome.escape:>8.3%} "
+              f"{outcome.defeat:>8.3%} {outcome.expected_turns:>6.2f}")
+    print(f"🎯 Solved {len(rows)} fights exactly in {elapsed * 1000:.0f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv))
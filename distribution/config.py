@@ -10,6 +10,14 @@ Constants:
     STARTING_STAT_VALUE: Initial value for all player stats
     LEVEL_UP_POINTS: Points gained per level up
     FINAL_BOSS_STAT_REQUIREMENT: Combined stat requirement for final boss
+    UNDO_HISTORY_DEPTH: Number of actions that can be undone
+    ALLEY_ENEMY_HEALTH: Starting health of the alley creature
+    ENEMY_DAMAGE_RANGE: Inclusive range of damage an enemy attack deals
+    CLASS_DAMAGE_BONUS: Stat each class adds to its attack damage, and how much
+    ENEMY_PROFILES: Health, damage range and initiative speed of every enemy
+    PLAYER_SPEED: Initiative speed of the player
+    ENCOUNTERS: Enemies, rewards and story text of every fight
+    MAX_ACCESSORIES: Number of accessories that can be worn at once
 """
 
 # Combat and Progression Constants
@@ -23,10 +31,67 @@ STARTING_HEALTH = 100
 BASE_DAMAGE_MODIFIER = 1.0
 ENHANCED_WEAPON_BONUS = 2.0
 
+# Combat Settings
+ALLEY_ENEMY_HEALTH = 30
+ENEMY_DAMAGE_RANGE = (8, 15)  # Inclusive, as passed to random.randint
+CLASS_DAMAGE_BONUS = {
+    'warrior': ('strength', 0.5),
+    'rogue': ('agility', 0.3),
+    'mage': ('intelligence', 0.4)
+}
+PLAYER_SPEED = 10
+ENEMY_PROFILES = {
+    'ground_dwelling_creature': {
+        'name': 'Ground Dwelling Creature',
+        'health': ALLEY_ENEMY_HEALTH,
+        'damage': ENEMY_DAMAGE_RANGE,
+        'speed': PLAYER_SPEED
+    },
+    'corrupted_villager': {
+        'name': 'Corrupted Villager',
+        'health': 10,
+        'damage': (1, 2),
+        'speed': 5
+    },
+    'shadow_wraith': {
+        'name': 'Shadow Wraith',
+        'health': 30,
+        'damage': (3, 6),
+        'speed': 12
+    }
+}
+ENCOUNTERS = {
+    'alley': {
+        'enemies': (('ground_dwelling_creature', 1),),
+        'intro': "The ground dwelling creature attacks! Combat begins!",
+        'experience': 15,
+        'key_for': 'armory',
+        'victory': ("The creature drops an armory key as it falls.",
+                    "You pick up the armory key. This might be useful for accessing the armory building.")
+    },
+    'village_finale': {
+        'enemies': (('corrupted_villager', 6), ('shadow_wraith', 1)),
+        'intro': "Corrupted villagers pour out of every doorway, and a shadow wraith rises behind them!",
+        'experience': 40,
+        'key_for': None,
+        'victory': ("The wraith dissolves and the villagers fall still. The corruption lifts from the village.",)
+    }
+}
+
+# Equipment Settings
+MAX_ACCESSORIES = 3
+
+# Autosave Settings
+AUTOSAVE_COMPACT_EVERY = 50  # Journal records kept before compacting into a full checkpoint
+
+# Undo Settings
+UNDO_HISTORY_DEPTH = 50  # Snapshots kept for undo; 0 disables undo
+
 # Scene Names (for consistency)
 SCENE_NAMES = {
     'CAVE_ENTRANCE': 'Cave Entrance',
     'SKULL_CHAMBER': 'Skull Chamber',
+    'CAVE_IN': 'Cave-In',
     'PRIMITIVE_VILLAGE': 'Primitive Village',
     'ALLEY': 'Alley',
     'ARMORY': 'Armory',
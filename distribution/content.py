@@ -0,0 +1,365 @@
+#!/usr/bin/env python3
+"""
+Cave Game Content Module
+
+This module loads the declarative game content (classes, weapons, items,
+scenes and consequences) from the JSON files in the data/ directory.
+
+Compiling checks every cross reference (choice -> consequence, exit and
+effect -> scene, lock, effect and starting items -> item, class -> weapon
+and skills) and fails on the first dangling one. It also numbers scenes and consequences densely, so
+the game core resolves a choice by list indexing rather than by name, and
+precomputes the scene graph analytics (see scene_graph.py), the attack
+damage tables (see damage_tables.py) and the item registry of the
+content's weapons and items (see item_registry.py).
+
+Content files are compiled once into a validated, pickled blob stored in
+data/__cache__/ and keyed by a hash of the source files and of the
+modules that compile them (COMPILER_MODULES, including config.py, so a
+changed class or setting also recompiles). Startup only has to hash the
+sources and unpickle one blob; the JSON is parsed and validated again only
+when a designer or programmer edits a file, and a blob that no longer
+unpickles is recompiled.
+
+Consequence effects are expressed as named effect ops, e.g.:
+    "effect": {"op": "gain_experience", "args": [10]}
+See EFFECT_OPS for the available ops and their argument types; a list
+argument names the items an op hands out. Every
+consequence also needs a flag in progress.Progress.
+
+Usage:
+    python content.py      # Validate content and rebuild the cache
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from config import ENCOUNTERS
+from damage_tables import DamageTables
+from item_registry import ItemRegistry
+from progress import flag_for
+from scene_graph import SCENE_EFFECTS, story_graph, walk_graph
+from scenes import build_scene_templates
+
+CONTENT_DIR = Path(__file__).resolve().parent / 'data'
+CACHE_DIRNAME = '__cache__'
+
+# Bump when the compiled layout changes so stale caches are ignored
+CONTENT_FORMAT = 9
+
+# Modules whose code or settings shape the compiled blob; their sources are part of the cache key
+COMPILER_MODULES = ('content', 'config', 'damage_tables', 'item_registry', 'progress', 'scene_graph', 'scenes')
+MODULE_DIR = Path(__file__).resolve().parent
+
+_compiler_digest: Optional[bytes] = None
+
+SOURCE_FILES = ('classes', 'weapons', 'items', 'scenes', 'consequences')
+
+# Effect op name -> argument types (list: item names, compiled to a tuple)
+EFFECT_OPS = {
+    'gain_experience': (int,),
+    'restore_health': (int,),
+    'advance_to_scene': (str,),
+    'advance_to_skull_chamber': (),
+    'trigger_cave_in': (),
+    'check_armory_access': (),
+    'check_chiefs_house_access': (),
+    'start_alley_combat': (),
+    'start_encounter': (str,),
+    'sneak_past_creature': (list,),
+    'search_alley_items': (list,),
+    'find_chiefs_house_key': (),
+    'access_armory_contents': (list,),
+    'access_chiefs_house': (),
+}
+
+# Combat skills the game core implements
+COMBAT_SKILLS = ('basic_attack', 'defend', 'run')
+
+# Locked scenes whose keys effect ops hand out or check
+KEYED_SCENES = ('armory', 'chiefs_house')
+
+CLASS_FIELDS = ('name', 'health', 'strength', 'agility', 'intelligence',
+                'starting_weapon', 'starting_items', 'ability', 'description', 'combat_skills')
+WEAPON_FIELDS = ('damage', 'type', 'class')
+ITEM_FIELDS = ('type', 'effect', 'value', 'description')
+CHOICE_FIELDS = ('text', 'description', 'consequence')
+
+
+class ContentError(ValueError):
+    """Raised when a content file is missing or malformed."""
+
+
+def _require(record: Dict[str, Any], fields, where: str) -> None:
+    """Check that a content record defines every required field."""
+    if not isinstance(record, dict):
+        raise ContentError(f"{where}: expected an object, got {type(record).__name__}")
+    missing = [field for field in fields if field not in record]
+    if missing:
+        raise ContentError(f"{where}: missing field(s) {', '.join(missing)}")
+
+
+def _compile_effect(effect: Optional[Dict[str, Any]], where: str):
+    """Validate an effect op and return it as an (op, args) tuple."""
+    if effect is None:
+        return None
+    _require(effect, ('op',), where)
+    op = effect['op']
+    if op not in EFFECT_OPS:
+        raise ContentError(f"{where}: unknown effect op '{op}'")
+    args = tuple(effect.get('args', ()))
+    arg_types = EFFECT_OPS[op]
+    if len(args) != len(arg_types):
+        raise ContentError(f"{where}: op '{op}' takes {len(arg_types)} argument(s), got {len(args)}")
+    for arg, arg_type in zip(args, arg_types):
+        if not isinstance(arg, arg_type):
+            raise ContentError(f"{where}: op '{op}' expects {arg_type.__name__} arguments, got {arg!r}")
+        if arg_type is list and not all(isinstance(name, str) for name in arg):
+            raise ContentError(f"{where}: op '{op}' expects a list of item names, got {arg!r}")
+    return (op, tuple(tuple(arg) if isinstance(arg, list) else arg for arg in args))
+
+
+def _check_references(sources: Dict[str, Any], scene_exits: Dict[str, Dict[str, str]],
+                      scene_locks: Dict[str, Optional[str]], scene_choices: Dict[str, List[Dict[str, Any]]],
+                      consequences: Dict[str, Dict[str, Any]]) -> None:
+    """Fail on the first reference to something the content does not define."""
+    classes, weapons, items = sources['classes'], sources['weapons'], sources['items']
+    for class_key, class_data in classes.items():
+        where = f"classes.json: {class_key}"
+        if class_data['starting_weapon'] not in weapons:
+            raise ContentError(f"{where}.starting_weapon: unknown weapon '{class_data['starting_weapon']}'")
+        for item_name in class_data['starting_items']:
+            if item_name not in weapons and item_name not in items:
+                raise ContentError(f"{where}.starting_items: unknown item '{item_name}'")
+        for skill in class_data['combat_skills']:
+            if skill not in COMBAT_SKILLS:
+                raise ContentError(f"{where}.combat_skills: unknown combat skill '{skill}'")
+    for weapon_name, weapon in weapons.items():
+        if weapon['class'] not in classes:
+            raise ContentError(f"weapons.json: {weapon_name}.class: unknown class '{weapon['class']}'")
+
+    for scene_id, exits in scene_exits.items():
+        for direction, target in exits.items():
+            if target not in scene_exits:
+                raise ContentError(f"scenes.json: {scene_id}.exits.{direction}: unknown scene '{target}'")
+    for scene_id, key in scene_locks.items():
+        if key is not None and key not in items:
+            raise ContentError(f"scenes.json: {scene_id}.lock: unknown item '{key}'")
+    for scene_id in KEYED_SCENES:
+        if scene_locks.get(scene_id) is None:
+            raise ContentError(f"scenes.json: {scene_id}: must exist and be locked")
+    for scene_id, choices in scene_choices.items():
+        for index, choice in enumerate(choices, 1):
+            if choice['consequence'] not in consequences:
+                raise ContentError(f"scenes.json: {scene_id}.choices[{index}]: "
+                                   f"unknown consequence '{choice['consequence']}'")
+
+    for name, consequence in consequences.items():
+        effect = consequence['effect']
+        if not effect:
+            continue
+        op, args = effect
+        target = args[0] if op == 'advance_to_scene' else SCENE_EFFECTS.get(op)
+        if target is not None and target not in scene_exits:
+            raise ContentError(f"consequences.json: {name}.effect: unknown scene '{target}'")
+        if op == 'start_encounter' and args[0] not in ENCOUNTERS:
+            raise ContentError(f"consequences.json: {name}.effect: unknown encounter '{args[0]}'")
+        for arg in args:
+            if isinstance(arg, tuple):
+                for item_name in arg:
+                    if item_name not in weapons and item_name not in items:
+                        raise ContentError(f"consequences.json: {name}.effect: unknown item '{item_name}'")
+
+
+def _validate(sources: Dict[str, Any]) -> Dict[str, Any]:
+    """Validate raw content and return the compiled content dict."""
+    for class_key, class_data in sources['classes'].items():
+        _require(class_data, CLASS_FIELDS, f"classes.json: {class_key}")
+    for weapon_name, weapon in sources['weapons'].items():
+        _require(weapon, WEAPON_FIELDS, f"weapons.json: {weapon_name}")
+    for item_name, item in sources['items'].items():
+        _require(item, ITEM_FIELDS, f"items.json: {item_name}")
+
+    consequences = {}
+    for name, consequence in sources['consequences'].items():
+        where = f"consequences.json: {name}"
+        _require(consequence, ('text',), where)
+        try:
+            flag = int(flag_for(name))
+        except KeyError:
+            raise ContentError(f"{where}: no progress flag registered (add it to progress.Progress)") from None
+        consequences[name] = {
+            'text': consequence['text'],
+            'effect': _compile_effect(consequence.get('effect'), f"{where}.effect"),
+            'flag': flag,
+        }
+
+    scene_names = {}
+    scene_exits = {}
+    scene_locks = {}
+    scene_descriptions = {}
+    scene_choices = {}
+    for scene_id, scene in sources['scenes'].items():
+        where = f"scenes.json: {scene_id}"
+        _require(scene, ('name', 'description'), where)
+        exits = scene.get('exits', {})
+        if not isinstance(exits, dict):
+            raise ContentError(f"{where}.exits: expected an object mapping directions to scenes")
+        scene_names[scene_id] = scene['name']
+        scene_exits[scene_id] = exits
+        scene_locks[scene_id] = scene.get('lock')
+        scene_descriptions[scene_id] = scene['description']
+        choices = scene.get('choices', [])
+        for index, choice in enumerate(choices, 1):
+            _require(choice, CHOICE_FIELDS, f"{where}.choices[{index}]")
+        if choices:
+            scene_choices[scene_id] = choices
+
+    _check_references(sources, scene_exits, scene_locks, scene_choices, consequences)
+
+    # Dense integer ids, in content order
+    scene_ids = list(scene_names)
+    consequence_ids = list(consequences)
+    consequence_index = {name: number for number, name in enumerate(consequence_ids)}
+    consequence_table = [(consequences[name]['text'], consequences[name]['effect'], consequences[name]['flag'])
+                         for name in consequence_ids]
+    choice_table = [tuple(consequence_index[choice['consequence']] for choice in scene_choices.get(scene_id, ()))
+                    for scene_id in scene_ids]
+    item_registry = ItemRegistry()
+    item_registry.define_content(sources['weapons'], sources['items'])
+
+    return {
+        'classes': sources['classes'],
+        'weapons': sources['weapons'],
+        'items': sources['items'],
+        'scene_names': scene_names,
+        'scene_exits': scene_exits,
+        'scene_locks': scene_locks,
+        'scene_descriptions': scene_descriptions,
+        'scene_choices': scene_choices,
+        'consequences': consequences,
+        'scene_ids': scene_ids,
+        'scene_index': {scene_id: number for number, scene_id in enumerate(scene_ids)},
+        'consequence_ids': consequence_ids,
+        'consequence_index': consequence_index,
+        'consequence_table': consequence_table,
+        'choice_table': choice_table,
+        'damage_tables': DamageTables(sources['classes'], sources['weapons']),
+        'item_registry': item_registry,
+        'scene_templates': build_scene_templates(scene_names, scene_descriptions, scene_exits, scene_locks),
+        'walk_graph': walk_graph(scene_ids, scene_exits, scene_locks),
+        'story_graph': story_graph(scene_ids, scene_exits, scene_locks, scene_choices, consequences),
+    }
+
+
+def _read_sources(content_dir: Path) -> Dict[str, bytes]:
+    """Read the raw bytes of every content source file."""
+    raw = {}
+    for name in SOURCE_FILES:
+        path = content_dir / f"{name}.json"
+        try:
+            raw[name] = path.read_bytes()
+        except OSError as e:
+            raise ContentError(f"Cannot read content file {path}: {e}") from e
+    return raw
+
+
+def compiler_hash() -> bytes:
+    """Hash the sources of COMPILER_MODULES (once per process)."""
+    global _compiler_digest
+    if _compiler_digest is None:
+        digest = hashlib.sha256()
+        for name in COMPILER_MODULES:
+            digest.update(name.encode())
+            try:
+                digest.update((MODULE_DIR / f"{name}.py").read_bytes())
+            except OSError:
+                # Installed without sources: only CONTENT_FORMAT guards the cache
+                digest.update(b'no source')
+        _compiler_digest = digest.digest()
+    return _compiler_digest
+
+
+def content_hash(raw: Dict[str, bytes]) -> str:
+    """Hash the content sources, compiler modules and compiled format into a cache key."""
+    digest = hashlib.sha256(f"format:{CONTENT_FORMAT}".encode())
+    digest.update(compiler_hash())
+    for name in SOURCE_FILES:
+        digest.update(name.encode())
+        digest.update(raw[name])
+    return digest.hexdigest()[:16]
+
+
+def compile_content(content_dir: Path = CONTENT_DIR, raw: Optional[Dict[str, bytes]] = None) -> Dict[str, Any]:
+    """Parse and validate the content files without touching the cache."""
+    raw = raw if raw is not None else _read_sources(Path(content_dir))
+    sources = {}
+    for name in SOURCE_FILES:
+        try:
+            sources[name] = json.loads(raw[name])
+        except ValueError as e:
+            raise ContentError(f"{name}.json: invalid JSON ({e})") from e
+        if not isinstance(sources[name], dict):
+            raise ContentError(f"{name}.json: top level must be an object")
+    return _validate(sources)
+
+
+def _write_cache(cache_dir: Path, cache_path: Path, content: Dict[str, Any]) -> None:
+    """Atomically write the compiled blob and drop stale ones."""
+    try:
+        cache_dir.mkdir(exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump(content, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+        for stale in cache_dir.glob('content-*.pickle'):
+            if stale != cache_path:
+                stale.unlink()
+    except OSError as e:
+        # A read-only install still works, it just recompiles every start
+        print(f"Warning: could not write content cache: {e}")
+
+
+def load_content(content_dir: Path = CONTENT_DIR, use_cache: bool = True) -> Dict[str, Any]:
+    """Load compiled content, rebuilding the cache when the sources change."""
+    content_dir = Path(content_dir)
+    raw = _read_sources(content_dir)
+    if not use_cache:
+        return compile_content(content_dir, raw)
+
+    cache_dir = content_dir / CACHE_DIRNAME
+    cache_path = cache_dir / f"content-{content_hash(raw)}.pickle"
+    try:
+        with open(cache_path, 'rb') as f:
+            return pickle.load(f)
+    except Exception:
+        # Missing, truncated, or pickled against classes that have since changed
+        pass
+
+    content = compile_content(content_dir, raw)
+    _write_cache(cache_dir, cache_path, content)
+    return content
+
+
+def main():
+    """Validate the content files and rebuild the cache"""
+    try:
+        content = load_content()
+    except ContentError as e:
+        print(f"❌ Content error: {e}")
+        return 1
+    print(f"✅ Content compiled: {len(content['classes'])} classes, "
+          f"{len(content['weapons'])} weapons, {len(content['items'])} items, "
+          f"{len(content['scene_descriptions'])} scenes, {len(content['consequences'])} consequences")
+    for problem in content['story_graph'].validate():
+        print(f"⚠️  Scene graph: {problem}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
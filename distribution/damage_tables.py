@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Cave Game Damage Tables
+
+Attack damage depends only on the class (its basic attack skill and the
+stat it scales with), the weapon and that stat's value. The tables hold
+every (hit, critical hit) pair for stat values 0 to TABLE_STATS - 1, built
+once when content is compiled and stored in the content cache, so an
+attack in the game core, a simulated fight and a balance report all read
+the same numbers.
+
+    hit, critical_hit = content['damage_tables'].lookup('rogue', 'Daggers', 15)
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+from config import CLASS_DAMAGE_BONUS
+
+# Stat values covered by the tables; larger values are computed on demand
+TABLE_STATS = 64
+
+DamagePair = Tuple[int, int]  # (hit, critical hit)
+
+
+def attack_damage(class_key: str, weapon_damage: int, skill: Dict[str, Any],
+                  stat_value: int, critical: bool = False) -> int:
+    """Damage of one basic attack, as GameCore.perform_attack deals it"""
+    base_damage = weapon_damage * skill['damage_multiplier']
+    bonus = CLASS_DAMAGE_BONUS.get(class_key)
+    if bonus is not None:
+        base_damage += stat_value * bonus[1]
+    if critical:
+        base_damage *= 2
+    return int(base_damage)
+
+
+class DamageTables:
+    """
+    Precomputed basic attack damage for every class and weapon.
+
+    Attributes:
+        class_stat (Dict[str, Optional[str]]): Class -> stat its damage scales with
+        rows (Dict[str, Dict[str, List[DamagePair]]]): Class -> weapon -> pairs by stat value
+    """
+    def __init__(self, classes: Dict[str, Dict[str, Any]], weapons: Dict[str, Dict[str, Any]],
+                 table_stats: int = TABLE_STATS) -> None:
+        self._skills = {}
+        self._weapon_damage = {weapon: data['damage'] for weapon, data in weapons.items()}
+        self.class_stat: Dict[str, Optional[str]] = {}
+        self.rows: Dict[str, Dict[str, List[DamagePair]]] = {}
+        for class_key, class_data in classes.items():
+            skill = class_data['combat_skills'].get('basic_attack')
+            if skill is None:
+                continue
+            bonus = CLASS_DAMAGE_BONUS.get(class_key)
+            self._skills[class_key] = skill
+            self.class_stat[class_key] = bonus[0] if bonus else None
+            self.rows[class_key] = {
+                weapon: [self._compute(class_key, weapon, stat_value) for stat_value in range(table_stats)]
+                for weapon in weapons
+            }
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, DamageTables):
+            return NotImplemented
+        return self.rows == other.rows
+
+    def _compute(self, class_key: str, weapon: str, stat_value: int) -> DamagePair:
+        skill = self._skills[class_key]
+        weapon_damage = self._weapon_damage[weapon]
+        return (attack_damage(class_key, weapon_damage, skill, stat_value),
+                attack_damage(class_key, weapon_damage, skill, stat_value, critical=True))
+
+    def lookup(self, class_key: str, weapon: str, stat_value: int) -> DamagePair:
+        """Return (hit, critical hit) damage for a class, weapon and stat value"""
+        row = self.rows[class_key][weapon]
+        if 0 <= stat_value < len(row):
+            return row[stat_value]
+        return self._compute(class_key, weapon, stat_value)
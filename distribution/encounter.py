@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Cave Game Encounters
+
+An encounter is a fight against any number of enemies. Every combatant,
+the player included, acts on an initiative clock: a combatant with speed s
+acts every INITIATIVE_TICKS // s ticks, so a fast enemy can act twice
+before a slow player acts once. Turns come off a heap of
+(next tick, combatant), and the player wins ties with every enemy.
+
+Enemy stat blocks are stored as parallel lists indexed by combatant
+number, with an id -> number dict for O(1) lookup. Nothing is ever
+scanned per turn: a defeated enemy is only marked dead, and is dropped
+the next time it reaches the top of the turn heap or the target heap.
+
+    encounter = Encounter.from_roster((('corrupted_villager', 8),), ENEMY_PROFILES, PLAYER_SPEED)
+    turn = encounter.next_turn()      # PLAYER or an enemy number
+    target = encounter.front()        # enemy the player attacks next
+
+lone_enemy_turns() gives the same order for a fight against one enemy as
+counts per player turn, for the simulator and the odds solver.
+"""
+
+import heapq
+import math
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+# Ticks in one initiative round; an action takes INITIATIVE_TICKS // speed
+INITIATIVE_TICKS = 1200
+
+# Turn-heap entry of the player; sorts before every enemy number
+PLAYER = -1
+
+
+class Encounter:
+    """
+    Enemies of one fight and the order they act in.
+
+    Attributes:
+        ids (List[str]): Unique id of each enemy, e.g. 'corrupted_villager#3'
+        names (List[str]): Display name of each enemy
+        health (List[int]): Starting health of each enemy
+        damage (List[Tuple[int, int]]): Inclusive damage range of each enemy
+        speed (List[int]): Initiative speed of each enemy
+        alive (List[bool]): Whether each enemy is still fighting
+        remaining (int): Number of enemies still fighting
+    """
+    def __init__(self, player_speed: int) -> None:
+        self.player_speed = player_speed
+        self.ids: List[str] = []
+        self.names: List[str] = []
+        self.health: List[int] = []
+        self.damage: List[Tuple[int, int]] = []
+        self.speed: List[int] = []
+        self.alive: List[bool] = []
+        self.index: Dict[str, int] = {}
+        self.remaining = 0
+        self._turns: List[Tuple[int, int]] = [(self._delay(player_speed), PLAYER)]
+        self._front: List[int] = []
+
+    @classmethod
+    def from_roster(cls, roster: Iterable[Tuple[str, int]], profiles: Mapping[str, Dict[str, Any]],
+                    player_speed: int) -> 'Encounter':
+        """Build an encounter from (profile key, count) pairs"""
+        encounter = cls(player_speed)
+        for profile_key, count in roster:
+            encounter.add(profile_key, profiles[profile_key], count)
+        return encounter
+
+    @staticmethod
+    def _delay(speed: int) -> int:
+        return INITIATIVE_TICKS // max(1, speed)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Encounter):
+            return NotImplemented
+        return (self.ids == other.ids and self.alive == other.alive
+                and self._turns == other._turns and self.player_speed == other.player_speed)
+
+    def add(self, profile_key: str, profile: Dict[str, Any], count: int = 1) -> None:
+        """Add count enemies built from one profile, numbered when there are several"""
+        speed = profile.get('speed', self.player_speed)
+        delay = self._delay(speed)
+        for n in range(1, count + 1):
+            number = len(self.ids)
+            enemy_id = f"{profile_key}#{n}"
+            self.ids.append(enemy_id)
+            self.names.append(profile['name'] if count == 1 else f"{profile['name']} {n}")
+            self.health.append(profile['health'])
+            self.damage.append(tuple(profile['damage']))
+            self.speed.append(speed)
+            self.alive.append(True)
+            self.index[enemy_id] = number
+            self.remaining += 1
+            heapq.heappush(self._turns, (delay, number))
+            heapq.heappush(self._front, number)
+
+    def lookup(self, enemy_id: str) -> Dict[str, Any]:
+        """Return the stat block of one enemy by id"""
+        number = self.index[enemy_id]
+        return {'id': enemy_id, 'name': self.names[number], 'health': self.health[number],
+                'damage': self.damage[number], 'speed': self.speed[number], 'alive': self.alive[number]}
+
+    def next_turn(self) -> int:
+        """Pop the next combatant to act, PLAYER or an enemy number, and schedule its following turn"""
+        turns = self._turns
+        while True:
+            tick, number = turns[0]
+            if number == PLAYER or self.alive[number]:
+                speed = self.player_speed if number == PLAYER else self.speed[number]
+                heapq.heapreplace(turns, (tick + self._delay(speed), number))
+                return number
+            heapq.heappop(turns)
+
+    def front(self) -> Optional[int]:
+        """Return the first enemy still fighting, in the order they were added"""
+        front = self._front
+        while front and not self.alive[front[0]]:
+            heapq.heappop(front)
+        return front[0] if front else None
+
+    def defeat(self, number: int) -> None:
+        """Mark an enemy as defeated"""
+        if self.alive[number]:
+            self.alive[number] = False
+            self.remaining -= 1
+
+    def getstate(self) -> Dict[str, Any]:
+        """Return the encounter as plain lists and numbers, for saving"""
+        return {
+            'player_speed': self.player_speed,
+            'ids': list(self.ids),
+            'names': list(self.names),
+            'health': list(self.health),
+            'damage': [list(damage) for damage in self.damage],
+            'speed': list(self.speed),
+            'alive': list(self.alive),
+            'turns': [list(turn) for turn in self._turns],
+            'front': list(self._front),
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> 'Encounter':
+        """Rebuild an encounter saved with getstate(), at the same turn"""
+        encounter = cls(state['player_speed'])
+        encounter.ids = list(state['ids'])
+        encounter.names = list(state['names'])
+        encounter.health = list(state['health'])
+        encounter.damage = [tuple(damage) for damage in state['damage']]
+        encounter.speed = list(state['speed'])
+        encounter.alive = list(state['alive'])
+        encounter.index = {enemy_id: number for number, enemy_id in enumerate(encounter.ids)}
+        encounter.remaining = sum(encounter.alive)
+        encounter._turns = [tuple(turn) for turn in state['turns']]
+        encounter._front = list(state['front'])
+        return encounter
+
+    def copy(self) -> 'Encounter':
+        """Return an independent copy, sharing the stat blocks that never change"""
+        clone = object.__new__(Encounter)
+        clone.__dict__.update(self.__dict__)
+        clone.alive = self.alive.copy()
+        clone._turns = self._turns.copy()
+        clone._front = self._front.copy()
+        return clone
+
+
+def lone_enemy_turns(player_speed: int, enemy_speed: int) -> Tuple[int, Tuple[int, ...]]:
+    """Turns one enemy takes before the player's first turn, and after each player action
+
+    The order repeats every lcm(player delay, enemy delay) ticks, so the
+    second value is one cycle of it: after the player's action number k,
+    counting from 0, the enemy acts cycle[k % len(cycle)] times before the
+    player's next turn.
+    """
+    encounter = Encounter(player_speed)
+    encounter.add('enemy', {'name': 'Enemy', 'health': 1, 'damage': (0, 0), 'speed': enemy_speed})
+    player_delay = Encounter._delay(player_speed)
+    length = math.lcm(player_delay, Encounter._delay(enemy_speed)) // player_delay
+    counts: List[int] = []
+    enemy_turns = 0
+    while len(counts) <= length:
+        if encounter.next_turn() == PLAYER:
+            counts.append(enemy_turns)
+            enemy_turns = 0
+        else:
+            enemy_turns += 1
+    return counts[0], tuple(counts[1:])
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Cave Game Equipment Stats
+
+Worn armor and accessories raise the player's stats through their effect
+and value in items.json. GameCore keeps the effective stats themselves
+(player_strength, player_defense, player_max_health, ...) as the cached
+aggregate: equipping adds one item's bonus and unequipping subtracts it,
+so combat reads a plain attribute and nothing is recomputed per attack.
+Being ordinary scalars, the aggregate is captured and restored by undo
+snapshots along with everything else.
+
+Defense is a percentage of each enemy hit the armor absorbs, after any
+defend skill has reduced it.
+
+    bonus = stat_bonus(registry.get('Ring of Strength'))   # ('player_strength', 3)
+    effective_stats(base, worn_items)                      # full recompute, e.g. to verify
+"""
+
+from typing import Dict, Iterable, Optional, Tuple
+
+from item_registry import ItemDef
+
+# Item categories that can be equipped
+EQUIPMENT_CATEGORIES = ('weapon', 'armor', 'accessory')
+
+# Item effect -> GameCore attribute it raises
+EFFECT_STATS = {
+    'strength': 'player_strength',
+    'agility': 'player_agility',
+    'intelligence': 'player_intelligence',
+    'defense': 'player_defense',
+    'health': 'player_max_health',
+}
+
+# The effective stat attributes, in display order
+STAT_FIELDS = ('player_strength', 'player_agility', 'player_intelligence', 'player_defense', 'player_max_health')
+
+
+def stat_bonus(item: ItemDef) -> Optional[Tuple[str, int]]:
+    """(attribute, amount) an item adds while worn, None if it adds nothing"""
+    stat = EFFECT_STATS.get(item.effect)
+    return None if stat is None or not item.value else (stat, item.value)
+
+
+def base_stats(class_data: Dict) -> Dict[str, int]:
+    """A class's stats with nothing worn"""
+    return {
+        'player_strength': class_data['strength'],
+        'player_agility': class_data['agility'],
+        'player_intelligence': class_data['intelligence'],
+        'player_defense': 0,
+        'player_max_health': class_data['health'],
+    }
+
+
+def effective_stats(base: Dict[str, int], worn: Iterable[ItemDef]) -> Dict[str, int]:
+    """Base stats plus the bonuses of every worn item, computed from scratch"""
+    stats = dict(base)
+    for item in worn:
+        bonus = stat_bonus(item)
+        if bonus is not None:
+            stats[bonus[0]] += bonus[1]
+    return stats
+
+
+def armor_absorbs(damage: int, defense: int) -> int:
+    """Damage of one hit the armor absorbs"""
+    return damage * defense // 100
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Cave Game Event Bus
+
+Views subscribe to the kinds of game event they render; the game core
+publishes the events each action produces. Events published during one
+frame are queued and delivered together when the frame is flushed, with
+bursts coalesced so each view does the expensive work once:
+
+    MESSAGE   Every message is delivered, in order
+    SCENE     Only the last scene change is delivered; a scene description
+              replaces whatever was described before it
+    INVENTORY Delivered once, before DISPLAY: the set of item ids whose
+              count changed, or None if the inventory was replaced
+    DISPLAY   Delivered once, after everything else in the frame
+    QUIT      Delivered once, last
+
+    bus = EventBus(schedule=root.after_idle)   # flush once per Tk frame
+    bus.subscribe(MESSAGE, view.add_story_text)
+    bus.subscribe(DISPLAY, lambda _: view.update_display())
+    core = GameCore(bus=bus)
+
+Without a scheduler, the owner calls flush() itself.
+"""
+
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+# Event kinds
+MESSAGE = 'message'
+SCENE = 'scene'
+DISPLAY = 'display'
+INVENTORY = 'inventory'
+QUIT = 'quit'
+
+EVENT_KINDS = (MESSAGE, SCENE, INVENTORY, DISPLAY, QUIT)
+
+Event = Tuple[str, Any]
+Subscriber = Callable[[Any], None]
+
+
+def coalesce(events: Iterable[Event]) -> List[Event]:
+    """Reduce one frame of events to what a view needs to render"""
+    events = list(events)
+    last_scene = max((i for i, (kind, _) in enumerate(events) if kind == SCENE), default=-1)
+    frame = []
+    changed = set()
+    replaced = False
+    display = None
+    quit_event = None
+    for i, event in enumerate(events):
+        kind = event[0]
+        if kind == MESSAGE or i == last_scene:
+            frame.append(event)
+        elif kind == INVENTORY:
+            if event[1] is None:
+                replaced = True
+            else:
+                changed.add(event[1])
+        elif kind == DISPLAY:
+            display = event
+        elif kind == QUIT:
+            quit_event = event
+    if replaced or changed:
+        frame.append((INVENTORY, None if replaced else frozenset(changed)))
+    if display is not None:
+        frame.append(display)
+    if quit_event is not None:
+        frame.append(quit_event)
+    return frame
+
+
+class EventBus:
+    """
+    Publish/subscribe hub that delivers coalesced events once per frame.
+
+    Attributes:
+        schedule (Optional[Callable]): Called with flush when a frame's first
+            event is published, e.g. a Tk root's after_idle
+        pending (List[Event]): Events published since the last flush
+    """
+    def __init__(self, schedule: Optional[Callable[[Callable[[], None]], Any]] = None) -> None:
+        self.schedule = schedule
+        self.pending: List[Event] = []
+        self._subscribers: Dict[str, List[Subscriber]] = {kind: [] for kind in EVENT_KINDS}
+
+    def subscribe(self, kind: str, callback: Subscriber) -> None:
+        """Call callback with the payload of every delivered event of a kind"""
+        if kind not in self._subscribers:
+            raise ValueError(f"Unknown event kind: {kind}")
+        self._subscribers[kind].append(callback)
+
+    def unsubscribe(self, kind: str, callback: Subscriber) -> None:
+        """Stop delivering events of a kind to callback"""
+        self._subscribers[kind].remove(callback)
+
+    def publish(self, kind: str, payload: Any = None) -> None:
+        """Queue one event for the current frame"""
+        self.publish_many(((kind, payload),))
+
+    def publish_many(self, events: Iterable[Event]) -> None:
+        """Queue a burst of events for the current frame"""
+        first = not self.pending
+        self.pending.extend(events)
+        if first and self.pending and self.schedule is not None:
+            self.schedule(self.flush)
+
+    def flush(self) -> List[Event]:
+        """Deliver the coalesced frame to subscribers and return it"""
+        frame = coalesce(self.pending)
+        self.pending = []
+        for kind, payload in frame:
+            for callback in self._subscribers[kind]:
+                callback(payload)
+        return frame
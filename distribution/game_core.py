@@ -0,0 +1,1212 @@
+#!/usr/bin/env python3
+"""
+Cave Game Core - Headless Game State Machine
+
+This module holds the UI-free game rules shared by every front-end: the
+text game (game_refactored.py), the desktop GUI (gui.py) and the player
+GUI (player_gui.py). Front-ends only translate input into actions and
+render the events that come back:
+
+    core = GameCore()
+    for kind, payload in core.apply(('new_game', 'warrior')):
+        ...
+
+Actions:
+    ('new_game', class_key)   Start a new run as the given class
+    ('choose', number)        Pick a scene choice, or a combat skill in combat
+    ('move', direction)       Walk through one of the current scene's exits
+    ('back',)                 Return to the previously visited scene
+    ('travel', place)         Walk the shortest route to a scene
+    ('hint',)                 Suggest somewhere to explore next
+    ('undo', steps=1)         Rewind the last actions, restoring all state
+    ('look',)                 Describe the current scene again
+    ('inventory',)            List the items being carried
+    ('equip', item)           Wield a carried weapon or wear armor or an accessory
+    ('unequip', item)         Take off worn armor or an accessory
+    ('stats',)                Report the character's stats
+    ('odds',)                 Report the exact odds of each combat skill
+    ('save', slot=quicksave)  Save the game to a slot (savegame.py)
+    ('load', slot=quicksave)  Load the game saved in a slot
+    ('saves',)                List the saved slots, from the save index
+    ('help',)                 List the available commands
+    ('quit',)                 Leave the game
+
+Events are (kind, payload) tuples:
+    (MESSAGE, text)       A line of story text
+    (SCENE, scene_id)     The scene should be described from scratch
+    (INVENTORY, item_id)  A carried item's count changed; None if the inventory was replaced
+    (DISPLAY, None)       Player or scene state changed; refresh the view
+    (QUIT, None)          The player asked to leave
+
+Randomness comes from seeded per-subsystem streams (random_streams.py), so
+a run is reproduced by replaying its actions with its seed:
+
+    same = replay(actions, core.seed)
+
+Fights are encounters (encounter.py): any number of enemies from
+config.ENCOUNTERS acting in initiative order. The player attacks the
+first enemy still standing, whose health is combat_enemy_health.
+
+Pass a CombatLog (combat_log.py) to record every attack, defense, hit
+taken and fight outcome as compact binary records.
+
+Worn armor and accessories raise the player_* stats as they are put on
+and taken off (equipment.py), so combat reads cached effective stats.
+
+Combat odds are exact, from the dynamic programming solver in
+combat_solver.py; combat_odds() returns them for the fight in progress.
+
+Pass an EventBus (event_bus.py) to have every action's events published
+to subscribed views and coalesced into one notification per frame.
+
+Pass an Autosaver (autosave.py) to keep an autosave slot current: it is
+handed the state after every action that changes it and journals the
+changes from a background thread.
+
+Saves are files in save_dir (savegame.py) unless save_store is set to a
+profile of a SQLite SaveStore (save_store.py), as on a shared install.
+
+Handlers for actions, consequence effect ops and combat skills are
+registered with the ACTIONS, EFFECT_OPS and COMBAT_SKILLS decorators, so
+each step dispatches with one dict lookup.
+
+Usage:
+    python game_core.py   # Benchmark random play-throughs and dispatch cost
+"""
+
+import random
+import sqlite3
+import sys
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from autosave import Autosaver, recover
+from combat_log import (ACTOR_PLAYER, ATTACK, CRIT, DAMAGE, DEFEAT, DEFEND, ENCOUNTER_NUMBERS, ESCAPE,
+                        FLEE_FAIL, KILL, NO_TARGET, START, UNKNOWN_ENCOUNTER, VICTORY, CombatLog)
+from combat_solver import CombatSolver, Outcome
+from config import ENCOUNTERS, ENEMY_PROFILES, MAX_ACCESSORIES, PLAYER_SPEED, UNDO_HISTORY_DEPTH
+from content import load_content
+from encounter import PLAYER, Encounter
+from equipment import armor_absorbs, stat_bonus
+from event_bus import DISPLAY, INVENTORY, MESSAGE, QUIT, SCENE, Event, EventBus
+from inventory import InventoryStore
+from item_registry import ItemDef
+from progress import Progress
+from random_streams import RandomStreams
+from registry import HandlerRegistry
+from savegame import (QUICKSAVE, SAVE_DIR, SaveFormatError, capture_state, list_saves, save_game, slot_path,
+                      valid_slot)
+from scenes import SceneOverlay
+from snapshot import History, restore
+
+STARTING_SCENE = "cave_entrance"
+
+DIRECTIONS = tuple(sys.intern(direction) for direction in ('north', 'south', 'east', 'west'))
+DIRECTION_ALIASES = dict(zip(('n', 's', 'e', 'w'), DIRECTIONS))
+DIRECTION_ALIASES.update({direction: direction for direction in DIRECTIONS})
+
+HELP_TEXT = ("Commands: a number to pick a choice, north/south/east/west to move, "
+             "travel to <place>, back, undo [steps], hint, look, inventory, equip <item>, unequip <item>, "
+             "stats, odds, save [slot], load [slot], saves, help, quit")
+
+# Actions allowed before a class has been chosen
+PREGAME_ACTIONS = frozenset(('new_game', 'load', 'saves', 'help', 'quit'))
+
+# Actions recorded in the undo history
+UNDOABLE_ACTIONS = frozenset(('choose', 'move', 'back', 'travel', 'equip', 'unequip'))
+
+# Actions after which an autosave journals the changes, or writes a full checkpoint
+AUTOSAVE_ACTIONS = UNDOABLE_ACTIONS | {'undo'}
+CHECKPOINT_ACTIONS = frozenset(('new_game', 'load'))
+
+# Errors the save, load and saves actions report instead of raising
+SAVE_ERRORS = (OSError, sqlite3.Error)
+
+# Reply to a slot name that could not be a file name
+SLOT_NAME_HELP = "Cannot use slot '{slot}': slot names may only contain letters, digits, '_' and '-'."
+
+# Dispatch tables, filled in by the decorators on GameCore
+ACTIONS = HandlerRegistry('action')
+EFFECT_OPS = HandlerRegistry('effect op')
+COMBAT_SKILLS = HandlerRegistry('combat skill')
+
+
+def parse_command(command: str) -> Optional[Tuple]:
+    """Translate a typed command into an action, or None if unrecognised"""
+    words = command.strip().lower().split()
+    if words and words[0] in ('go', 'move', 'walk') and len(words) > 1:
+        words = words[1:]
+    if not words:
+        return None
+    if words[0] in ('travel', 'goto') and len(words) > 1:
+        place = words[2:] if words[1] == 'to' else words[1:]
+        return ('travel', ' '.join(place)) if place else None
+
+    word = words[0]
+    if word.isdigit():
+        return ('choose', int(word))
+    direction = DIRECTION_ALIASES.get(word)
+    if direction is not None:
+        return ('move', direction)
+    name = ACTIONS.aliases.get(word)
+    if name in ('equip', 'unequip'):
+        return (name, ' '.join(words[1:])) if len(words) > 1 else None
+    if name in ('save', 'load') and len(words) > 1:
+        return (name, words[1])
+    if name == 'undo' and len(words) > 1 and words[1].isdigit():
+        return ('undo', int(words[1]))
+    return (name,) if name is not None else None
+
+
+class GameCore:
+    """
+    Headless game state machine.
+
+    All state lives on the instance and every change is reported through
+    the events returned by apply(), so one content load can drive any
+    number of independent sessions.
+
+    Attributes:
+        player_character (Optional[str]): Class key, None before a game starts
+        current_scene (str): Content identifier of the current scene
+        game_state (str): "exploring" or "in_combat"
+        item_registry (ItemRegistry): Item definitions of the content, which the inventory refers to
+        inventory (InventoryStore): Carried items, indexed by category
+        progress_bits (int): Bitset of Progress flags for the consequences seen so far
+        scene_state (SceneOverlay): Unlocked doors and visited scenes this run
+        encounter (Optional[Encounter]): Enemies of the fight in progress
+        history (History): Snapshots taken before each undoable action
+        bus (Optional[EventBus]): Bus every action's events are published to
+        combat_log (Optional[CombatLog]): Binary log combat events are recorded in
+        autosave (Optional[Autosaver]): Autosave slot kept current after each action
+        save_dir (Path): Directory the save and load actions use
+        save_store (Optional[ProfileSaves]): Database profile (save_store.py) used instead of save_dir
+        streams (RandomStreams): Seeded random streams; streams.seed reproduces the run
+    """
+    def __init__(self, content: Optional[Dict[str, Any]] = None, seed: Optional[int] = None,
+                 history_depth: int = UNDO_HISTORY_DEPTH, bus: Optional[EventBus] = None,
+                 streams: Optional[RandomStreams] = None, combat_log: Optional[CombatLog] = None,
+                 autosave: Optional[Autosaver] = None) -> None:
+        self.content = content if content is not None else load_content()
+        self.classes = self.content['classes']
+        self.weapons = self.content['weapons']
+        self.items = self.content['items']
+        self.item_registry = self.content['item_registry']
+        self.scene_names = self.content['scene_names']
+        self.scene_descriptions = self.content['scene_descriptions']
+        self.scene_choices = self.content['scene_choices']
+        self.consequences = self.content['consequences']
+        self.walk_graph = self.content['walk_graph']
+        self.scene_templates = self.content['scene_templates']
+        self.scene_index = self.content['scene_index']
+        self.choice_table = self.content['choice_table']
+        self.consequence_index = self.content['consequence_index']
+        self.consequence_table = self.content['consequence_table']
+        self.damage_tables = self.content['damage_tables']
+        self._damage_stat_attrs = {class_key: stat and f"player_{stat}"
+                                   for class_key, stat in self.damage_tables.class_stat.items()}
+        self.armory_key = self.scene_templates['armory'].key
+        self.chiefs_house_key = self.scene_templates['chiefs_house'].key
+        self._scene_lookup = {}
+        for scene_id, name in self.scene_names.items():
+            for alias in (scene_id, scene_id.replace('_', ' '), name.lower()):
+                self._scene_lookup[alias] = scene_id
+        self.streams = streams if streams is not None else RandomStreams(seed)
+        self._events: List[Event] = []
+        self.history = History(history_depth)
+        self.bus = bus
+        self.combat_log = combat_log
+        self.autosave = autosave
+        self.save_dir = SAVE_DIR
+        self.save_store = None
+        # (class, weapon, damage stat, defense, enemy damage range, enemy speed) -> solver
+        self._solvers: Dict[Tuple[str, str, int, int, Tuple[int, int], int], CombatSolver] = {}
+
+        self._actions = ACTIONS.bind(self)
+        self._effect_ops = EFFECT_OPS.bind(self)
+        self._combat_skills = COMBAT_SKILLS.bind(self)
+
+        # Player state
+        self.player_character: Optional[str] = None
+        self.player_health = 100
+        self.player_strength = 0
+        self.player_agility = 0
+        self.player_intelligence = 0
+        self.player_defense = 0
+        self.player_max_health = 100
+        self.player_weapon: Optional[str] = None
+        self.player_ability: Optional[str] = None
+        self.player_level = 1
+        self.player_experience = 0
+        self.inventory = InventoryStore(self.item_registry, on_change=self._inventory_changed)
+        self.equipped_weapon: Optional[str] = None
+        self.equipped_armor: Optional[str] = None
+        self.equipped_accessories: List[str] = []
+
+        # World state
+        self.playtime = 0.0
+        self.current_scene = STARTING_SCENE
+        self.game_state = "exploring"
+        self.visited_scenes: List[str] = []
+        self.progress_bits = 0
+        self.scene_state = SceneOverlay(self.scene_templates)
+
+        # Combat state
+        self.encounter: Optional[Encounter] = None
+        self.encounter_key: Optional[str] = None
+        self.combat_enemy: Optional[str] = None
+        self.combat_enemy_health = 0
+        self.combat_turn = 0
+        self.available_combat_skills: List[str] = []
+        self.defending = False
+        self.defense_reduction = 0.0
+
+    @property
+    def game_progress(self) -> Progress:
+        """Story progress as Progress flags"""
+        return Progress(self.progress_bits)
+
+    @game_progress.setter
+    def game_progress(self, progress: int) -> None:
+        self.progress_bits = int(progress)
+
+    @property
+    def playtime(self) -> float:
+        """Seconds this run has been played, carried across saves"""
+        return self._played + time.monotonic() - self._clock_start
+
+    @playtime.setter
+    def playtime(self, seconds: float) -> None:
+        self._played = float(seconds)
+        self._clock_start = time.monotonic()
+
+    @property
+    def seed(self) -> int:
+        """Root seed of the random streams, recorded in saves and replays"""
+        return self.streams.seed
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+    def apply(self, action: Tuple) -> List[Event]:
+        """Apply one action and return the events it produced"""
+        self._events = events = []
+        name = action[0]
+        handler = self._actions.get(name)
+        if handler is None:
+            events.append((MESSAGE, f"Unknown action: {name}"))
+        elif self.player_character is None and name not in PREGAME_ACTIONS:
+            events.append((MESSAGE, "Choose a class to begin your adventure."))
+        elif name in UNDOABLE_ACTIONS:
+            self.history.push(self)
+            handler(*action[1:])
+            self.scene_state.visited.add(self.current_scene)
+            self.history.discard_if_unchanged(self)
+        else:
+            handler(*action[1:])
+        if self.autosave is not None and self.player_character is not None:
+            if name in CHECKPOINT_ACTIONS:
+                self.autosave.record(self, checkpoint=True)
+            elif name in AUTOSAVE_ACTIONS:
+                self.autosave.record(self)
+        if self.bus is not None:
+            self.bus.publish_many(events)
+        return events
+
+    def describe_scene(self) -> List[str]:
+        """Return the current scene description followed by its numbered choices"""
+        lines = [self.scene_descriptions.get(self.current_scene, "You examine your surroundings carefully.")]
+        choices = self.scene_choices.get(self.current_scene)
+        if choices:
+            lines.append("")
+            lines.append("What would you like to do?")
+            for i, choice in enumerate(choices):
+                lines.append(f"{i+1}. {choice['text']}")
+        return lines
+
+    def scene_title(self) -> str:
+        """Return the display name of the current scene"""
+        return self.scene_names.get(self.current_scene, self.current_scene.replace('_', ' ').title())
+
+    def find_scene(self, place: str) -> Optional[str]:
+        """Return the scene identifier for a typed place name, or None"""
+        place = place.strip().lower()
+        if place.startswith('the '):
+            place = place[4:]
+        return self._scene_lookup.get(place)
+
+    def max_health(self) -> int:
+        """Return the maximum health, including worn bonuses"""
+        return self.player_max_health
+
+    def stats_lines(self) -> List[str]:
+        """Return the character sheet as display lines"""
+        class_data = self.classes[self.player_character]
+        return [
+            f"Class: {class_data['name']}",
+            f"Level: {self.player_level}",
+            f"Health: {self.player_health}/{self.player_max_health}",
+            f"Experience: {self.player_experience}/100",
+            f"Strength: {self.player_strength}",
+            f"Agility: {self.player_agility}",
+            f"Intelligence: {self.player_intelligence}",
+            f"Defense: {self.player_defense}",
+            f"Ability: {self.player_ability}",
+            f"Equipped Weapon: {self.equipped_weapon}",
+            f"Equipped Armor: {self.equipped_armor or 'None'}",
+            f"Accessories: {', '.join(self.equipped_accessories) if self.equipped_accessories else 'None'}"
+        ]
+
+    def _inventory_changed(self, item_id: Optional[int]) -> None:
+        self._events.append((INVENTORY, item_id))
+
+    def inventory_lines(self) -> List[str]:
+        """Return one descriptive line per carried item"""
+        lines = []
+        for item in self.inventory.definitions():
+            if item.category == 'weapon' and item.damage:
+                lines.append(f"⚔️ {item.name} (Weapon - {item.damage} damage)")
+            elif item.description:
+                lines.append(f"📦 {item.name} - {item.description}")
+            else:
+                lines.append(f"❓ {item.name}")
+        return lines
+
+    def combat_odds(self) -> Dict[str, Outcome]:
+        """Return the exact outcome of each combat skill now, attacking after that
+
+        The solver models one enemy, so the odds are against the enemy
+        being fought; they are exact when it is the last one standing.
+        """
+        stat_attr = self._damage_stat_attrs.get(self.player_character)
+        stat_value = getattr(self, stat_attr) if stat_attr else 0
+        front = self.encounter.front()
+        damage, speed = self.encounter.damage[front], self.encounter.speed[front]
+        key = (self.player_character, self.player_weapon, stat_value, self.player_defense, damage, speed)
+        solver = self._solvers.get(key)
+        if solver is None:
+            enemy = {'health': self.combat_enemy_health, 'damage': damage, 'speed': speed}
+            solver = self._solvers[key] = CombatSolver(self.player_character, self.player_weapon,
+                                                       content=self.content, enemy=enemy,
+                                                       stat_value=stat_value, defense=self.player_defense,
+                                                       player_speed=self.encounter.player_speed)
+        odds = solver.action_odds(self.player_health, self.combat_enemy_health, self.combat_turn)
+        return {skill: odds[skill] for skill in self.available_combat_skills if skill in odds}
+
+    # ------------------------------------------------------------------
+    # Actions
+    # ------------------------------------------------------------------
+    @ACTIONS.register('new_game')
+    def new_game(self, class_key: str) -> None:
+        """Start a new run as the given class"""
+        if class_key not in self.classes:
+            self._events.append((MESSAGE, f"Unknown class: {class_key}"))
+            return
+        class_data = self.classes[class_key]
+
+        # Set initial stats
+        self.playtime = 0.0
+        self.player_character = class_key
+        self.player_health = class_data['health']
+        self.player_strength = class_data['strength']
+        self.player_agility = class_data['agility']
+        self.player_intelligence = class_data['intelligence']
+        self.player_defense = 0
+        self.player_max_health = class_data['health']
+        self.player_weapon = class_data['starting_weapon']
+        self.player_ability = class_data['ability']
+        self.player_level = 1
+        self.player_experience = 0
+
+        # Starting weapon is equipped, plus the class's starting items
+        self.inventory.replace([self.player_weapon, *class_data['starting_items']])
+        self.equipped_weapon = self.player_weapon
+        self.equipped_armor = None
+        self.equipped_accessories = []
+
+        self.current_scene = STARTING_SCENE
+        self.game_state = "exploring"
+        self.visited_scenes = [STARTING_SCENE]
+        self.progress_bits = 0
+        self.scene_state.reset()
+        self.scene_state.visited.add(STARTING_SCENE)
+        self.encounter = None
+        self.encounter_key = None
+        self.combat_enemy = None
+        self.combat_enemy_health = 0
+        self.defending = False
+        self.history.clear()
+
+        self._events.append((DISPLAY, None))
+        self._events.append((MESSAGE, f"Welcome to SHABUYA Cave Adventure! You are a {class_data['name']} standing at the entrance to mysterious caves. What will you discover within?"))
+        self._events.append((SCENE, self.current_scene))
+
+    @ACTIONS.register('choose')
+    def choose(self, number: int) -> None:
+        """Pick a numbered scene choice, or a combat skill while in combat"""
+        if self.game_state == "in_combat":
+            self.handle_combat_action(number)
+            return
+
+        choices = self.choice_table[self.scene_index[self.current_scene]]
+        if not choices:
+            self._events.append((MESSAGE, "No choices available in this scene."))
+            return
+
+        if 1 <= number <= len(choices):
+            self.apply_consequence(choices[number - 1])
+            self._events.append((DISPLAY, None))
+        else:
+            self._events.append((MESSAGE, f"Please enter a number between 1 and {len(choices)}."))
+
+    @ACTIONS.register('move')
+    def move(self, direction: str) -> None:
+        """Walk through an exit of the current scene, unlocking it if possible"""
+        if self.game_state == "in_combat":
+            self._events.append((MESSAGE, "You can't leave in the middle of combat!"))
+            return
+
+        target_id = self.scene_templates[self.current_scene].exits.get(direction)
+        if target_id is None:
+            self._events.append((MESSAGE, f"You can't go {direction} from here."))
+            return
+
+        if self.scene_state.is_locked(target_id):
+            target = self.scene_templates[target_id]
+            if target.key not in self.inventory:
+                self._events.append((MESSAGE, f"The {target.name} is locked. You need the {target.key} to enter."))
+                return
+            self.scene_state.unlock(target_id)
+            self._events.append((MESSAGE, f"You unlock the {target.name} with the {target.key}."))
+        self.advance_to_scene(target_id)
+
+    @ACTIONS.register('back', aliases=('back',))
+    def go_back_scene(self) -> None:
+        """Go back to the previous scene"""
+        if self.game_state == "in_combat":
+            self._events.append((MESSAGE, "You can't leave in the middle of combat!"))
+        elif len(self.visited_scenes) > 1:
+            self.visited_scenes.pop()  # Remove current scene
+            self.current_scene = self.visited_scenes[-1]  # Get previous scene
+            self.game_state = "exploring"
+            self._events.append((MESSAGE, f"You return to {self.current_scene.replace('_', ' ').title()}."))
+            self._events.append((DISPLAY, None))
+            self._events.append((SCENE, self.current_scene))
+        else:
+            self._events.append((MESSAGE, "You cannot go back further."))
+
+    @ACTIONS.register('travel')
+    def travel(self, place: str) -> None:
+        """Walk the shortest known route to a scene, stopping at locked doors"""
+        target = self.find_scene(place)
+        if target is None:
+            self._events.append((MESSAGE, f"You don't know of any place called '{place}'."))
+            return
+        if target == self.current_scene:
+            self._events.append((MESSAGE, "You are already there."))
+            return
+        if self.game_state == "in_combat":
+            self._events.append((MESSAGE, "You can't leave in the middle of combat!"))
+            return
+
+        route = self.walk_graph.path(self.current_scene, target)
+        if route is None:
+            self._events.append((MESSAGE, f"You can't find a way to the {self.scene_names[target]} from here."))
+            return
+        for direction, scene_id in route:
+            self.move(direction)
+            if self.current_scene != scene_id:
+                break  # Stopped by a locked door
+
+    @ACTIONS.register('hint', aliases=('hint',))
+    def hint(self) -> None:
+        """Point the player towards the nearest place they have not explored"""
+        graph = self.walk_graph
+        best = None
+        barred = None
+        for scene_id in graph.scene_ids:
+            if scene_id in self.scene_state.visited:
+                continue
+            distance = graph.distance(self.current_scene, scene_id)
+            if distance is None:
+                continue
+            missing = [key for key in graph.required_keys(scene_id) or () if key not in self.inventory]
+            if missing:
+                barred = barred or (scene_id, missing[0])
+            elif best is None or distance < best[0]:
+                best = (distance, scene_id)
+
+        if best is not None:
+            distance, scene_id = best
+            direction = graph.next_step(self.current_scene, scene_id)[0]
+            self._events.append((MESSAGE, f"Hint: you have not explored the {self.scene_names[scene_id]} yet. "
+                                          f"It is {distance} step{'s' if distance != 1 else ''} away - head {direction}."))
+        elif barred is not None:
+            scene_id, key = barred
+            self._events.append((MESSAGE, f"Hint: the {self.scene_names[scene_id]} is still locked. Find the {key}."))
+        else:
+            self._events.append((MESSAGE, "Hint: you have explored everywhere you can walk to."))
+
+    @ACTIONS.register('undo', aliases=('undo', 'rewind'))
+    def undo(self, steps: int = 1) -> None:
+        """Rewind the last steps actions, restoring everything they changed"""
+        snapshot = self.history.rewind(steps)
+        if snapshot is None:
+            self._events.append((MESSAGE, "There is nothing to undo."))
+            return
+
+        restore(self, snapshot)
+        self._events.append((MESSAGE, f"Time folds back on itself. You are in {self.scene_title()} again."))
+        self._events.append((DISPLAY, None))
+        self._events.append((SCENE, self.current_scene))
+        if self.game_state == "in_combat":
+            self.show_combat_choices()
+
+    @ACTIONS.register('look', aliases=('look', 'l'))
+    def look(self) -> None:
+        """Describe the current scene again"""
+        self._events.append((SCENE, self.current_scene))
+        if self.game_state == "in_combat":
+            self.show_combat_choices()
+
+    @ACTIONS.register('inventory', aliases=('inventory', 'inv', 'i'))
+    def report_inventory(self) -> None:
+        """Report the carried items"""
+        self._events.append((MESSAGE, "Inventory Items:\n" + "\n".join(self.inventory_lines())))
+
+    def _carried(self, name: str) -> Optional[ItemDef]:
+        """Definition of a carried item, matching its name case-insensitively"""
+        item = self.item_registry.get(name)
+        if item is not None and item.name in self.inventory:
+            return item
+        lowered = name.lower()
+        return next((item for item in self.inventory.definitions() if item.name.lower() == lowered), None)
+
+    def _wear(self, item: ItemDef, sign: int) -> None:
+        """Add (sign 1) or remove (sign -1) one worn item's bonus from the effective stats"""
+        bonus = stat_bonus(item)
+        if bonus is not None:
+            stat, amount = bonus
+            setattr(self, stat, getattr(self, stat) + sign * amount)
+            if stat == 'player_max_health' and self.player_health > self.player_max_health:
+                self.player_health = self.player_max_health
+
+    @ACTIONS.register('equip', aliases=('equip', 'wear', 'wield'))
+    def equip(self, name: str) -> None:
+        """Wield a carried weapon, or wear carried armor or an accessory"""
+        if self.game_state == "in_combat":
+            self._events.append((MESSAGE, "You can't change equipment in the middle of combat!"))
+            return
+        item = self._carried(name)
+        if item is None:
+            self._events.append((MESSAGE, f"You aren't carrying any {name}."))
+            return
+        if item.name in (self.equipped_weapon, self.equipped_armor) or item.name in self.equipped_accessories:
+            self._events.append((MESSAGE, f"The {item.name} is already equipped."))
+            return
+
+        if item.category == 'weapon':
+            self.player_weapon = self.equipped_weapon = item.name
+        elif item.category == 'armor':
+            if self.equipped_armor is not None:
+                self._wear(self.item_registry.get(self.equipped_armor), -1)
+            self.equipped_armor = item.name
+            self._wear(item, 1)
+        elif item.category == 'accessory':
+            if len(self.equipped_accessories) >= MAX_ACCESSORIES:
+                self._events.append((MESSAGE, f"You can't wear more than {MAX_ACCESSORIES} accessories. "
+                                              "Take one off first."))
+                return
+            self.equipped_accessories.append(item.name)
+            self._wear(item, 1)
+        else:
+            self._events.append((MESSAGE, f"You can't equip the {item.name}."))
+            return
+        self._events.append((MESSAGE, f"You equip the {item.name}."))
+        self._events.append((DISPLAY, None))
+
+    @ACTIONS.register('unequip', aliases=('unequip', 'remove'))
+    def unequip(self, name: str) -> None:
+        """Take off worn armor or an accessory"""
+        if self.game_state == "in_combat":
+            self._events.append((MESSAGE, "You can't change equipment in the middle of combat!"))
+            return
+        lowered = name.lower()
+        worn = [self.equipped_armor] if self.equipped_armor else []
+        worn.extend(self.equipped_accessories)
+        taken_off = next((worn_name for worn_name in worn if worn_name.lower() == lowered), None)
+        if taken_off is None:
+            if self.equipped_weapon and self.equipped_weapon.lower() == lowered:
+                self._events.append((MESSAGE, "You need a weapon; equip another one instead."))
+            else:
+                self._events.append((MESSAGE, f"You aren't wearing any {name}."))
+            return
+
+        if taken_off == self.equipped_armor:
+            self.equipped_armor = None
+        else:
+            self.equipped_accessories.remove(taken_off)
+        self._wear(self.item_registry.get(taken_off), -1)
+        self._events.append((MESSAGE, f"You take off the {taken_off}."))
+        self._events.append((DISPLAY, None))
+
+    @ACTIONS.register('stats', aliases=('stats',))
+    def report_stats(self) -> None:
+        """Report the character sheet"""
+        self._events.append((MESSAGE, "\n".join(self.stats_lines())))
+
+    @ACTIONS.register('odds', aliases=('odds',))
+    def report_odds(self) -> None:
+        """Report the odds of each combat skill in the fight in progress"""
+        if self.game_state != "in_combat":
+            self._events.append((MESSAGE, "You are not in combat!"))
+            return
+        if self.encounter.remaining > 1:
+            self._events.append((MESSAGE, f"{self.encounter.remaining} enemies stand against you; "
+                                          "the odds are only known for a single foe."))
+            return
+        skills = self.classes[self.player_character]['combat_skills']
+        lines = ["Odds if you keep attacking after this turn:"]
+        for skill_key, outcome in self.combat_odds().items():
+            lines.append(f"{skills[skill_key]['name']}: win {outcome.win:.0%}, escape {outcome.escape:.0%}, "
+                         f"defeat {outcome.defeat:.0%}, {outcome.expected_turns:.1f} turns")
+        self._events.append((MESSAGE, "\n".join(lines)))
+
+    @ACTIONS.register('save', aliases=('save',))
+    def save(self, slot: str = QUICKSAVE) -> None:
+        """Save the game to a slot"""
+        if not valid_slot(slot):
+            self._events.append((MESSAGE, SLOT_NAME_HELP.format(slot=slot)))
+            return
+        try:
+            if self.save_store is not None:
+                self.save_store.save(slot, capture_state(self))
+            else:
+                save_game(self, slot_path(slot, self.save_dir))
+        except SAVE_ERRORS as e:
+            self._events.append((MESSAGE, f"Could not save the game: {e}"))
+            return
+        self._events.append((MESSAGE, f"Game saved to slot '{slot}'."))
+
+    @ACTIONS.register('load', aliases=('load',))
+    def load(self, slot: str = QUICKSAVE) -> None:
+        """Load the game saved in a slot"""
+        if not valid_slot(slot):
+            self._events.append((MESSAGE, SLOT_NAME_HELP.format(slot=slot)))
+            return
+        if self.autosave is not None:
+            self.autosave.flush()
+        try:
+            if self.save_store is not None:
+                self.save_store.load_game(self, slot)
+            else:
+                recover(self, slot_path(slot, self.save_dir))
+        except FileNotFoundError:
+            self._events.append((MESSAGE, f"There is no game saved in slot '{slot}'."))
+            return
+        except SAVE_ERRORS + (SaveFormatError,) as e:
+            self._events.append((MESSAGE, f"Could not load the game: {e}"))
+            return
+        self._events.append((MESSAGE, f"Game loaded from slot '{slot}'. You are in {self.scene_title()}."))
+        self._events.append((DISPLAY, None))
+        self._events.append((SCENE, self.current_scene))
+        if self.game_state == "in_combat":
+            self.show_combat_choices()
+
+    @ACTIONS.register('saves', aliases=('saves', 'slots'))
+    def report_saves(self) -> None:
+        """List the saved slots, most recent first"""
+        try:
+            slots = self.save_store.list() if self.save_store is not None else list_saves(self.save_dir)
+        except SAVE_ERRORS as e:
+            self._events.append((MESSAGE, f"Could not list the saved games: {e}"))
+            return
+        if not slots:
+            self._events.append((MESSAGE, "There are no saved games."))
+            return
+        lines = ["Saved games:"]
+        for slot, summary in slots:
+            name = self.classes[summary['class']]['name'] if summary['class'] in self.classes else summary['class']
+            lines.append(f"{slot}: {name} level {summary['level']} in "
+                         f"{self.scene_names.get(summary['scene'], summary['scene'])}, "
+                         f"played {summary['playtime'] / 60:.0f} min")
+        self._events.append((MESSAGE, "\n".join(lines)))
+
+    @ACTIONS.register('help', aliases=('help', '?'))
+    def report_help(self) -> None:
+        """Report the available commands"""
+        self._events.append((MESSAGE, HELP_TEXT))
+
+    @ACTIONS.register('quit', aliases=('quit', 'exit'))
+    def quit(self) -> None:
+        """Signal that the player wants to leave"""
+        self._events.append((QUIT, None))
+
+    # ------------------------------------------------------------------
+    # Consequences and effect ops
+    # ------------------------------------------------------------------
+    def handle_consequence(self, consequence: str) -> None:
+        """Handle the consequences of player choices"""
+        number = self.consequence_index.get(consequence)
+        if number is None:
+            self._events.append((MESSAGE, f"Unknown consequence: {consequence}"))
+            return
+        self.apply_consequence(number)
+
+    def apply_consequence(self, number: int) -> None:
+        """Apply a consequence by its compiled integer id"""
+        text, effect, flag = self.consequence_table[number]
+        self._events.append((MESSAGE, text))
+        if effect:
+            op, args = effect
+            self._effect_ops[op](*args)
+
+        # Mark progress
+        self.progress_bits |= flag
+
+    @EFFECT_OPS.register('gain_experience')
+    def gain_experience(self, amount: int) -> None:
+        """Gain experience points"""
+        self.player_experience += amount
+        self._events.append((MESSAGE, f"You gain {amount} experience points!"))
+
+        if self.player_experience >= 100:
+            self.level_up()
+
+    def level_up(self) -> None:
+        """Level up the player"""
+        self.player_level += 1
+        self.player_experience = 0
+        self.player_health = self.max_health()  # Restore to max
+        self._events.append((MESSAGE, f"Level up! You are now level {self.player_level}! Your {self.player_ability} has grown stronger!"))
+
+    @EFFECT_OPS.register('restore_health')
+    def restore_health(self, amount: int) -> None:
+        """Restore health"""
+        old_health = self.player_health
+        self.player_health = min(self.max_health(), self.player_health + amount)
+        restored = self.player_health - old_health
+        self._events.append((MESSAGE, f"Your health is restored by {restored} points!"))
+
+    @EFFECT_OPS.register('advance_to_skull_chamber')
+    def advance_to_skull_chamber(self) -> None:
+        """Advance directly to the skull chamber"""
+        self.current_scene = "skull_chamber"
+        self.visited_scenes.append("skull_chamber")
+        self.game_state = "exploring"
+        self._events.append((MESSAGE, "You find yourself in a chamber filled with ancient skulls."))
+        self._events.append((DISPLAY, None))
+        self._events.append((SCENE, self.current_scene))
+
+    @EFFECT_OPS.register('advance_to_scene')
+    def advance_to_scene(self, scene_name: str) -> None:
+        """Advance to a specific scene with validation"""
+        if not scene_name:
+            self._events.append((MESSAGE, "Error: No scene name provided."))
+            return
+
+        if scene_name not in self.scene_descriptions:
+            self._events.append((MESSAGE, f"Error: Unknown scene '{scene_name}'."))
+            return
+
+        self.current_scene = scene_name
+        if scene_name not in self.visited_scenes:
+            self.visited_scenes.append(scene_name)
+        self.scene_state.visited.add(scene_name)
+        self.game_state = "exploring"
+        self._events.append((DISPLAY, None))
+        self._events.append((SCENE, self.current_scene))
+
+    @EFFECT_OPS.register('trigger_cave_in')
+    def trigger_cave_in(self) -> None:
+        """Trigger the cave-in event"""
+        self.current_scene = "cave_in"
+        if "cave_in" not in self.visited_scenes:
+            self.visited_scenes.append("cave_in")
+        self.game_state = "exploring"
+        self._events.append((DISPLAY, None))
+        self._events.append((SCENE, self.current_scene))
+
+    def _stay_in_village(self) -> None:
+        """Keep the player in the primitive village after a locked door"""
+        self.current_scene = "primitive_village"
+        self._events.append((DISPLAY, None))
+        self._events.append((SCENE, self.current_scene))
+
+    @EFFECT_OPS.register('check_armory_access')
+    def check_armory_access(self) -> None:
+        """Check if player has armory key and advance to armory scene"""
+        if self.armory_key in self.inventory:
+            self._events.append((MESSAGE, "You approach the armory building. The door is locked, but you have the armory key."))
+            self.advance_to_scene('armory')
+        else:
+            self._events.append((MESSAGE, "You approach the armory building. The door is locked with a heavy iron lock. You need to find the armory key first. Perhaps it can be found by defeating the creature in the alley?"))
+            self._stay_in_village()
+
+    @EFFECT_OPS.register('check_chiefs_house_access')
+    def check_chiefs_house_access(self) -> None:
+        """Check if player has chiefs house key and advance to chiefs house scene"""
+        if self.chiefs_house_key in self.inventory:
+            self._events.append((MESSAGE, "You approach the chief's house. The door is locked, but you have the chief's house key."))
+            self.advance_to_scene('chiefs_house')
+        else:
+            self._events.append((MESSAGE, "You approach the chief's house. The door is locked with an ornate tribal lock. You need to find the chief's house key first. Perhaps it can be found in the armory?"))
+            self._stay_in_village()
+
+    @EFFECT_OPS.register('sneak_past_creature')
+    def sneak_past_creature(self, found: Tuple[str, ...]) -> None:
+        """Successfully sneak past the creature and take the items found"""
+        self._events.append((MESSAGE, "You find a hidden alcove with some useful items: a health potion and some gold coins."))
+        self.inventory.extend(found)
+        self.gain_experience(10)
+        self._events.append((MESSAGE, "You gain 10 experience points for your stealthy approach."))
+        self._events.append((DISPLAY, None))
+        self._events.append((SCENE, self.current_scene))
+
+    @EFFECT_OPS.register('search_alley_items')
+    def search_alley_items(self, found: Tuple[str, ...]) -> None:
+        """Search for items in the alley and take the items found"""
+        self._events.append((MESSAGE, "You find some scattered coins and a rusty dagger. The dagger isn't very useful, but the coins might come in handy."))
+        self.inventory.extend(found)
+        self.gain_experience(5)
+        self._events.append((MESSAGE, "You gain 5 experience points for your thorough search."))
+        self._events.append((DISPLAY, None))
+        self._events.append((SCENE, self.current_scene))
+
+    @EFFECT_OPS.register('find_chiefs_house_key')
+    def find_chiefs_house_key(self) -> None:
+        """Find the chief's house key in the armory"""
+        self._events.append((MESSAGE, "You pick up the chief's house key. This ornate key should unlock the chief's house!"))
+        self.inventory.append(self.chiefs_house_key)
+        self.gain_experience(10)
+        self._events.append((MESSAGE, "You gain 10 experience points for finding the key."))
+        self._events.append((DISPLAY, None))
+        self._events.append((SCENE, self.current_scene))
+
+    @EFFECT_OPS.register('access_armory_contents')
+    def access_armory_contents(self, contents: Tuple[str, ...]) -> None:
+        """Access armory contents when using the key"""
+        if self.armory_key in self.inventory:
+            self._events.append((MESSAGE, "You successfully unlock the armory storage! Inside you find:"))
+            self._events.append((MESSAGE, "- A sturdy iron sword"))
+            self._events.append((MESSAGE, "- Chain mail armor"))
+            self._events.append((MESSAGE, "- A special key for the chief's house"))
+            self._events.append((MESSAGE, "- Some gold coins"))
+
+            # Add items to inventory
+            self.inventory.extend(contents)
+            self.gain_experience(20)
+            self._events.append((MESSAGE, "You gain 20 experience points for successfully accessing the armory!"))
+        else:
+            self._events.append((MESSAGE, "You don't have the armory key. You need to find it first."))
+
+        self._events.append((DISPLAY, None))
+        self._events.append((SCENE, self.current_scene))
+
+    @EFFECT_OPS.register('access_chiefs_house')
+    def access_chiefs_house(self) -> None:
+        """Access chief's house when using the key"""
+        if self.chiefs_house_key in self.inventory:
+            self._events.append((MESSAGE, "You successfully enter the chief's house! The chief welcomes you and offers:"))
+            self._events.append((MESSAGE, "- Guidance about the village's history"))
+            self._events.append((MESSAGE, "- Information about the healing pool"))
+            self._events.append((MESSAGE, "- A blessing that restores your health"))
+            self._events.append((MESSAGE, "- Knowledge about the village's current troubles"))
+
+            # Restore health and gain experience
+            self.restore_health(50)
+            self.gain_experience(25)
+            self._events.append((MESSAGE, "The chief's blessing restores your health and you gain 25 experience points!"))
+        else:
+            self._events.append((MESSAGE, "You don't have the chief's house key. You need to find it first."))
+
+        self._events.append((DISPLAY, None))
+        self._events.append((SCENE, self.current_scene))
+
+    # ------------------------------------------------------------------
+    # Combat
+    # ------------------------------------------------------------------
+    @EFFECT_OPS.register('start_alley_combat')
+    def start_alley_combat(self) -> None:
+        """Start combat with the alley creature"""
+        self.start_encounter('alley')
+
+    @EFFECT_OPS.register('start_encounter')
+    def start_encounter(self, encounter_key: str) -> None:
+        """Start a fight against the enemies of an encounter in config.ENCOUNTERS"""
+        definition = ENCOUNTERS[encounter_key]
+        self.game_state = "in_combat"
+        self.encounter_key = encounter_key
+        self.encounter = Encounter.from_roster(definition['enemies'], ENEMY_PROFILES, PLAYER_SPEED)
+        self._engage(self.encounter.front())
+        self.combat_turn = 0
+
+        # Initialize available combat skills based on class
+        self.available_combat_skills = list(self.classes[self.player_character]['combat_skills'].keys())
+
+        self._events.append((MESSAGE, definition['intro']))
+        if len(self.encounter) == 1:
+            self._events.append((MESSAGE, f"Enemy: {self.combat_enemy} (Health: {self.combat_enemy_health})"))
+        else:
+            roster = ', '.join(f"{ENEMY_PROFILES[key]['name']} x{count}" for key, count in definition['enemies'])
+            self._events.append((MESSAGE, f"Enemies: {roster}"))
+
+        if self.combat_log is not None:
+            number = ENCOUNTER_NUMBERS.get(encounter_key, UNKNOWN_ENCOUNTER)
+            self._log(START, ACTOR_PLAYER, NO_TARGET, number, len(self.encounter))
+
+        # Enemies faster than the player act before its first turn
+        self.enemy_turns("Choose your combat action:")
+        self._events.append((DISPLAY, None))
+
+    def _log(self, kind: int, actor: int, target: int, amount: int, health: int) -> None:
+        """Record a combat event if a combat log is attached"""
+        if self.combat_log is not None:
+            self.combat_log.record(kind, self.combat_turn, actor, target, amount, health)
+
+    def _engage(self, number: int) -> None:
+        """Make an encounter enemy the one the player is fighting"""
+        self.combat_enemy = self.encounter.names[number]
+        self.combat_enemy_health = self.encounter.health[number]
+
+    def show_combat_choices(self) -> None:
+        """Show combat choices based on available skills"""
+        self._events.append((MESSAGE, ""))
+        self._events.append((MESSAGE, "Combat Options:"))
+
+        for i, skill_key in enumerate(self.available_combat_skills, 1):
+            skill = self.classes[self.player_character]['combat_skills'][skill_key]
+            self._events.append((MESSAGE, f"{i}. {skill['name']} - {skill['description']}"))
+
+        self._events.append((MESSAGE, ""))
+        self._events.append((MESSAGE, "Enter your choice (1-3) in the input field above."))
+
+    def handle_combat_action(self, choice: int) -> None:
+        """Handle combat action based on player choice with validation"""
+        if self.game_state != "in_combat":
+            self._events.append((MESSAGE, "You are not in combat!"))
+            return
+
+        if not self.available_combat_skills:
+            self._events.append((MESSAGE, "No combat skills available!"))
+            return
+
+        max_skills = len(self.available_combat_skills)
+        if choice < 1 or choice > max_skills:
+            self._events.append((MESSAGE, f"Invalid choice! Please select 1-{max_skills}."))
+            return
+
+        skill_key = self.available_combat_skills[choice - 1]
+        skill = self.classes[self.player_character]['combat_skills'][skill_key]
+        self.combat_turn += 1
+
+        self._events.append((MESSAGE, f"You use {skill['name']}!"))
+
+        handler = self._combat_skills.get(skill_key)
+        if handler is not None:
+            handler(skill)
+
+        # Check if combat continues
+        if self.game_state == "in_combat":
+            self.enemy_turns("Choose your next combat action:")
+
+    @COMBAT_SKILLS.register('basic_attack')
+    def perform_attack(self, skill: Dict[str, Any]) -> None:
+        """Perform attack action"""
+        # Read damage, including class bonuses, from the precomputed tables
+        stat_attr = self._damage_stat_attrs[self.player_character]
+        stat_value = getattr(self, stat_attr) if stat_attr else 0
+        damage, critical_damage = self.damage_tables.lookup(self.player_character, self.player_weapon, stat_value)
+
+        # Check for critical hit (rogue only)
+        kind = ATTACK
+        if 'critical_chance' in skill and self.streams.combat.random() < skill['critical_chance']:
+            damage = critical_damage
+            kind = CRIT
+            self._events.append((MESSAGE, "Critical hit!"))
+
+        self.combat_enemy_health -= damage
+        if self.combat_log is not None:
+            target = self.encounter.front() if self.encounter is not None else 0
+            self._log(kind, ACTOR_PLAYER, target, damage, self.combat_enemy_health)
+
+        self._events.append((MESSAGE, f"You deal {damage} damage to the {self.combat_enemy}!"))
+
+        if self.combat_enemy_health <= 0:
+            self.defeat_enemy()
+
+    @COMBAT_SKILLS.register('defend')
+    def perform_defend(self, skill: Dict[str, Any]) -> None:
+        """Perform defend action"""
+        self._events.append((MESSAGE, f"You prepare to {skill['name'].lower()}!"))
+        # Defense will be applied during enemy turn
+        self.defending = True
+        self.defense_reduction = skill['damage_reduction']
+        self._log(DEFEND, ACTOR_PLAYER, NO_TARGET, 0, self.player_health)
+
+    @COMBAT_SKILLS.register('run')
+    def perform_run(self, skill: Dict[str, Any]) -> None:
+        """Perform run action"""
+        if self.streams.escape.random() < skill['success_chance']:
+            self._events.append((MESSAGE, f"You successfully {skill['name'].lower()}!"))
+            self._log(ESCAPE, ACTOR_PLAYER, NO_TARGET, 0, self.player_health)
+            self.end_combat_escape()
+        else:
+            self._events.append((MESSAGE, f"Your attempt to {skill['name'].lower()} fails!"))
+            self._log(FLEE_FAIL, ACTOR_PLAYER, NO_TARGET, 0, self.player_health)
+
+    def defeat_enemy(self) -> None:
+        """Handle the enemy being fought going down, engaging the next one if any"""
+        encounter = self.encounter
+        if encounter is not None:
+            defeated = encounter.front()
+            encounter.defeat(defeated)
+            self._log(KILL, ACTOR_PLAYER, defeated, 0, encounter.remaining)
+            number = encounter.front()
+            if number is not None:
+                self._events.append((MESSAGE, f"You defeat the {self.combat_enemy}! "
+                                              f"Enemies remaining: {encounter.remaining}"))
+                self._engage(number)
+                self._events.append((MESSAGE, f"You turn to the {self.combat_enemy} "
+                                              f"(Health: {self.combat_enemy_health})."))
+                return
+        self.end_combat_victory()
+
+    def enemy_turns(self, prompt: str) -> None:
+        """Let enemies act in initiative order until the player's next turn"""
+        encounter = self.encounter
+        while self.game_state == "in_combat":
+            number = encounter.next_turn()
+            if number == PLAYER:
+                # A defense lasts until the player acts again
+                self.defending = False
+                self._events.append((MESSAGE, prompt))
+                self.show_combat_choices()
+                return
+            self.enemy_turn(number)
+
+    def enemy_turn(self, number: int) -> None:
+        """Handle one enemy's turn"""
+        self._events.append((MESSAGE, f"The {self.encounter.names[number]} attacks!"))
+
+        # Calculate enemy damage
+        enemy_damage = self.streams.combat.randint(*self.encounter.damage[number])
+
+        # Apply defense if player defended
+        if self.defending:
+            enemy_damage = int(enemy_damage * (1 - self.defense_reduction))
+            self._events.append((MESSAGE, "Your defense reduces the damage!"))
+        if self.player_defense:
+            absorbed = armor_absorbs(enemy_damage, self.player_defense)
+            if absorbed:
+                enemy_damage -= absorbed
+                self._events.append((MESSAGE, f"Your armor absorbs {absorbed} damage."))
+
+        self.player_health = max(0, self.player_health - enemy_damage)
+        self._events.append((MESSAGE, f"You take {enemy_damage} damage! Health: {self.player_health}"))
+        self._log(DAMAGE, number, ACTOR_PLAYER, enemy_damage, self.player_health)
+
+        if self.player_health <= 0:
+            self.end_combat_defeat()
+
+    def end_combat_victory(self) -> None:
+        """End combat with victory"""
+        definition = ENCOUNTERS[self.encounter_key or 'alley']
+        self._events.append((MESSAGE, f"You defeat the {self.combat_enemy}!"))
+        if definition['key_for']:
+            self.inventory.append(self.scene_templates[definition['key_for']].key)
+        for line in definition['victory']:
+            self._events.append((MESSAGE, line))
+        self._log(VICTORY, ACTOR_PLAYER, NO_TARGET, definition['experience'], self.player_health)
+        self.gain_experience(definition['experience'])
+
+        self.encounter = None
+        self.game_state = "exploring"
+        self._events.append((DISPLAY, None))
+        self._events.append((SCENE, self.current_scene))
+
+    def end_combat_escape(self) -> None:
+        """End combat with escape"""
+        self._events.append((MESSAGE, "You escape from combat!"))
+        self.gain_experience(5)
+
+        self.encounter = None
+        self.game_state = "exploring"
+        self._events.append((DISPLAY, None))
+        self._events.append((SCENE, self.current_scene))
+
+    def end_combat_defeat(self) -> None:
+        """End combat with defeat"""
+        self._events.append((MESSAGE, "You are defeated! You retreat from combat."))
+        self._events.append((MESSAGE, "You lose some health and return to the village."))
+        self._log(DEFEAT, ACTOR_PLAYER, NO_TARGET, 0, self.player_health)
+
+        # Return to village with reduced health
+        self.current_scene = "primitive_village"
+        self.encounter = None
+        self.game_state = "exploring"
+        self._events.append((DISPLAY, None))
+        self._events.append((SCENE, self.current_scene))
+
+
+def replay(actions: Iterable[Tuple], seed: int, content: Optional[Dict[str, Any]] = None,
+           combat_log: Optional[CombatLog] = None) -> GameCore:
+    """Rebuild a run by applying its recorded actions to a core with its seed"""
+    core = GameCore(content, seed=seed, combat_log=combat_log)
+    for action in actions:
+        core.apply(tuple(action))
+    return core
+
+
+def benchmark(steps: int = 200000, seed: int = 1) -> float:
+    """Drive random play-throughs and return the number of steps per second"""
+    content = load_content()
+    rng = random.Random(seed)
+    core = GameCore(content, seed=seed)
+    class_keys = list(core.classes)
+    actions = [('choose', n) for n in (1, 2, 3)] + [('move', d) for d in DIRECTIONS] + [('back',)]
+
+    start = time.perf_counter()
+    for step in range(steps):
+        if step % 500 == 0:
+            core.apply(('new_game', class_keys[step // 500 % len(class_keys)]))
+        core.apply(actions[rng.randrange(len(actions))])
+    elapsed = time.perf_counter() - start
+    return steps / elapsed
+
+
+def benchmark_dispatch(steps: int = 1000000) -> Tuple[float, float]:
+    """Return the per-step cost in nanoseconds of parse + handler lookup, and of lookup alone"""
+    core = GameCore()
+    commands = ['north', 'w', 'go east', '2', 'look', 'inv', 'stats', 'back', 'help', 'dance']
+    parsed = [parse_command(command) for command in commands]
+    handlers = core._actions
+
+    start = time.perf_counter()
+    for step in range(steps):
+        action = parse_command(commands[step % 10])
+        if action is not None:
+            handlers[action[0]]
+    parse_cost = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for step in range(steps):
+        action = parsed[step % 10]
+        if action is not None:
+            handlers[action[0]]
+    lookup_cost = time.perf_counter() - start
+    return parse_cost / steps * 1e9, lookup_cost / steps * 1e9
+
+
+if __name__ == "__main__":
+    rate = benchmark()
+    print(f"🎮 GameCore: {rate:,.0f} steps/second ({rate * 60 / 1e6:.1f} million steps/minute)")
+    core = GameCore()
+    core.apply(('new_game', 'warrior'))
+    for step in range(core.history.depth):
+        core.apply(('choose', step % 3 + 1))
+    report = core.history.memory_report()
+    print(f"⏪ Undo history: {report['snapshots']} snapshots in {report['bytes']:,} bytes "
+          f"({report['bytes_without_sharing']:,} bytes without sharing)")
+    parse_ns, lookup_ns = benchmark_dispatch()
+    print(f"📮 Dispatch: {parse_ns:.0f} ns/step with command parsing, {lookup_ns:.0f} ns/step handler lookup")
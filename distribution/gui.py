@@ -8,27 +8,16 @@ import tkinter as tk
 from tkinter import ttk, messagebox, scrolledtext
 import sys
 from pathlib import Path
-import threading
-import queue
-import io
 
-# Import the actual game engine
-from game_refactored import play_game
-from game_events import start_game
-from ui import title_screen
+# Import the shared game engine
+from game_core import GameCore, parse_command, MESSAGE, SCENE, DISPLAY, QUIT
+from event_bus import coalesce
 
 class CaveGameGUI:
     def __init__(self):
         self.root = tk.Tk()
-        self.player = None
+        self.core = GameCore()
         self.game_state = "menu"
-        self.current_scene = None
-        self.scenes = None
-        self.game_thread = None
-        self.command_queue = queue.Queue()
-        self.response_queue = queue.Queue()
-        self.waiting_for_input = False
-        self.current_choices = []
         self.setup_window()
         self.create_interface()
         
@@ -175,7 +164,7 @@ class CaveGameGUI:
         action_frame.pack()
         
         actions = [("👁️ Look", "look"), ("🎒 Inventory", "inventory"), 
-                  ("📊 Stats", "stats"), ("❓ Help", "help")]
+                  ("📊 Stats", "stats"), ("↩️ Undo", "undo"), ("💡 Hint", "hint"), ("❓ Help", "help")]
         
         for text, cmd in actions:
             tk.Button(action_frame, text=text, width=15, font=("Arial", 9),
@@ -190,42 +179,33 @@ class CaveGameGUI:
         self.game_display.config(state=tk.DISABLED)
         
     def update_character_display(self):
-        """Update character stats display"""
-        if not self.player:
+        """Update character stats and inventory display"""
+        core = self.core
+        if core.player_character is None:
             return
             
         self.char_info.config(state=tk.NORMAL)
         self.char_info.delete(1.0, tk.END)
         
-        from config import STARTING_STAT_VALUE
-        
-        # Get player class based on weapon
-        if hasattr(self.player, 'weapon'):
-            if self.player.weapon.name == 'Dagger':
-                char_class = 'Rogue'
-            elif self.player.weapon.name == 'Axe':
-                char_class = 'Warrior'
-            elif self.player.weapon.name == 'Wand':
-                char_class = 'Mage'
-            else:
-                char_class = 'Unknown'
-        else:
-            char_class = 'Unknown'
-        
         stats_text = f"""
-Class: {char_class}
-Level: {getattr(self.player, 'level', 1)}
-Weapon: {self.player.weapon.name if hasattr(self.player, 'weapon') else 'None'}
+Class: {core.classes[core.player_character]['name']}
+Level: {core.player_level}
+Health: {core.player_health}/{core.max_health()}
+Weapon: {core.equipped_weapon}
+Scene: {core.scene_title()}
 
-💪 Strength: {getattr(self.player, 'strength', STARTING_STAT_VALUE)}
-🧠 Intelligence: {getattr(self.player, 'intelligence', STARTING_STAT_VALUE)}
-⚡ Agility: {getattr(self.player, 'agility', STARTING_STAT_VALUE)}
-🛡️ Vitality: {getattr(self.player, 'vitality', STARTING_STAT_VALUE)}
+💪 Strength: {core.player_strength}
+🧠 Intelligence: {core.player_intelligence}
+⚡ Agility: {core.player_agility}
         """
         
         self.char_info.insert(1.0, stats_text.strip())
         self.char_info.config(state=tk.DISABLED)
         
+        self.inventory_list.delete(0, tk.END)
+        for item in core.inventory:
+            self.inventory_list.insert(tk.END, item)
+        
     def quick_command(self, command):
         """Execute a quick command"""
         self.command_var.set(command)
@@ -266,19 +246,16 @@ Enter '1' to start or '2' to exit."""
         
         # Handle class selection
         elif self.game_state == "class_selection":
-            if command in ['1', 'rogue']:
-                return self.select_class('rogue')
-            elif command in ['2', 'warrior']:
-                return self.select_class('warrior')
-            elif command in ['3', 'mage']:
-                return self.select_class('mage')
+            class_keys = list(self.core.classes)
+            if command.isdigit() and 1 <= int(command) <= len(class_keys):
+                return self.select_class(class_keys[int(command) - 1])
+            elif command in self.core.classes:
+                return self.select_class(command)
             else:
-                return """Choose your class:
-1: Rogue (Dagger)
-2: Warrior (Axe)
-3: Mage (Wand)
+                return f"""Choose your class:
+{self.class_menu()}
 
-Enter 1, 2, or 3 to select your class."""
+Enter the number of your class (1-{len(class_keys)})."""
         
         # Handle active gameplay
         elif self.game_state == "playing":
@@ -287,405 +264,58 @@ Enter 1, 2, or 3 to select your class."""
         # Default response
         return f"❓ Unknown command in current state: '{command}'"
     
+    def class_menu(self):
+        """Return the numbered list of playable classes"""
+        return "\n".join(f"{i}: {class_data['name']} ({class_data['starting_weapon']})"
+                         for i, class_data in enumerate(self.core.classes.values(), 1))
+    
     def start_new_game(self):
         """Start a new game session"""
         self.game_state = "class_selection"
-        return """🎯 Starting new adventure...
+        return f"""🎯 Starting new adventure...
 
 Choose your class:
-1: Rogue (Stealth and agility)
-2: Warrior (Strength and combat)
-3: Mage (Magic and intelligence)
+{self.class_menu()}
 
-Enter the number of your class (1-3):"""
+Enter the number of your class (1-{len(self.core.classes)}):"""
     
-    def select_class(self, class_type):
+    def select_class(self, class_key):
         """Handle class selection and start the game"""
-        from item import dagger, axe, wand
-        from player import Player
-        from item import Inventory
-        
-        # Create player
-        self.player = Player()
-        self.player.inventory = Inventory()
-        
-        if class_type == 'rogue':
-            self.player.weapon = dagger
-            class_name = "Rogue"
-        elif class_type == 'warrior':
-            self.player.weapon = axe
-            class_name = "Warrior"
-        elif class_type == 'mage':
-            self.player.weapon = wand
-            class_name = "Mage"
-        
         self.game_state = "playing"
-        
-        # Initialize game world
-        from scenes import setup_scenes
-        from config import SCENE_NAMES
-        
-        self.scenes = setup_scenes()
-        self.current_scene = self.scenes[SCENE_NAMES['CAVE_ENTRANCE']]
-        self.game_context = {
-            'visited_village': False,
-            'visited_armory': False,
-            'visited_scenes': set(),
-            'rogue_escaped_alley': False,
-            'defeated_chief': False,
-            'alley_creature_dead': False
-        }
-        
-        self.update_character_display()
-        
-        return f"""You are a {class_name}. You start with a {self.player.weapon.name}.
-
-🗻 CAVE ENTRANCE 🗻
-You find yourself in a dark cave with only a crack in the wall visible.
-
-What do you want to do?
-1: Go through the crack
-2: Sit and cry  
-3: Look around
-4: Quit
-
-Available commands: 1, 2, 3, 4, or type commands directly."""
+        return self.render_events(self.core.apply(('new_game', class_key)))
     
     def handle_gameplay_command(self, command):
         """Handle commands during active gameplay"""
-        if not self.current_scene:
-            return "❌ Game error - no current scene loaded."
-        
-        scene_name = self.current_scene.name
-        
-        # Handle Cave Entrance
-        if scene_name == "Cave Entrance":
-            return self.handle_cave_entrance_command(command)
-        elif scene_name == "Skull Chamber":
-            return self.handle_skull_chamber_command(command)
-        elif scene_name == "Primitive Village":
-            return self.handle_village_command(command)
-        elif scene_name == "Alley":
-            return self.handle_alley_command(command)
-        elif scene_name == "Armory":
-            return self.handle_armory_command(command)
-        elif scene_name == "Cave People Chief House":
-            return self.handle_chief_house_command(command)
-        elif scene_name == "Healing Pool":
-            return self.handle_healing_pool_command(command)
-        elif scene_name == "Primitive Village Changed":
-            return self.handle_final_boss_command(command)
-        else:
-            return f"🗺️ You're in {scene_name}. Available commands: help, quit"
-    
-    def handle_cave_entrance_command(self, command):
-        """Handle Cave Entrance commands"""
-        if command in ['1', 'crack', 'go crack', 'through crack']:
-            from config import SCENE_NAMES
-            self.current_scene = self.scenes[SCENE_NAMES['SKULL_CHAMBER']]
-            return """You squeeze through the crack in the wall...
-
-🗻 SKULL CHAMBER 🗻
-A vast chamber dominated by a colossal skull. As you explore the chamber, you see a primitive creature scurrying away among the shadows near the giant skull.
-
-What do you want to do?
-1: Chase after the creature
-2: Stay and observe
-3: Quit
-
-Available commands: 1, 2, 3"""
-        
-        elif command in ['2', 'sit', 'cry']:
-            return "You feel much better and would like to go through the crack."
-        
-        elif command in ['3', 'look', 'look around']:
-            return "You look around but it's dark and you can't see anything except the crack in the wall."
-        
-        elif command in ['4', 'quit']:
-            self.root.quit()
-            return "� Thanks for playing!"
-        
-        else:
-            return """You're in a dark cave. The only thing you notice is the crack in the wall.
-
-What do you want to do?
-1: Go through the crack
-2: Sit and cry
-3: Look around
-4: Quit"""
-    
-    def handle_skull_chamber_command(self, command):
-        """Handle Skull Chamber commands"""
-        if command in ['1', 'chase', 'chase creature']:
-            from config import SCENE_NAMES
-            self.current_scene = self.scenes[SCENE_NAMES['PRIMITIVE_VILLAGE']]
-            self.game_context['visited_village'] = True
-            return """You run after the moving figure, following its fleeting shadow through the chamber. You are led straight into the primitive village.
-
-🗻 PRIMITIVE VILLAGE 🗻
-You step into the heart of the primitive village. Crude huts made of bone and hide cluster around a central fire pit, where embers glow and smoke drifts into the cavernous air. Strange symbols are painted on the rocks, and you hear the distant chatter of unseen creatures. Paths lead off in several directions: a shadowy alley, a fortified armory, and a large chief's house adorned with trophies.
-
-Where would you like to go?
-1: Enter the Alley (dangerous shadows)
-2: Approach the Armory (locked chamber)
-3: Visit the Chief's House (imposing hut)
-4: Stay by the fire pit
-5: Quit"""
-        
-        elif command in ['2', 'stay', 'observe']:
-            return """You decide not to chase after it and remain cautious.
-Suddenly, a rockfall blocks the path behind you! There is only one way forward now.
-
-You can only move forward now.
-1: Move forward
-2: Quit"""
-        
-        elif command in ['3', 'quit']:
-            self.root.quit()
-            return "👋 Thanks for playing!"
-        
-        else:
-            return """You're in a vast chamber dominated by a colossal skull. You see a primitive creature scurrying away.
-
-What do you want to do?
-1: Chase after the creature
-2: Stay and observe
-3: Quit"""
-    
-    def handle_village_command(self, command):
-        """Handle Primitive Village commands"""
-        if command in ['1', 'alley', 'enter alley']:
-            from config import SCENE_NAMES
-            self.current_scene = self.scenes[SCENE_NAMES['ALLEY']]
-            return """You step cautiously into the narrow alley...
-
-🗻 ALLEY 🗻
-A primitive ground-dwelling creature bursts from a hidden burrow!
-
-What do you do?
-1: Attack the creature
-2: Try to escape
-3: Quit"""
-        
-        elif command in ['2', 'armory', 'approach armory']:
-            from scenes import check_scene_access
-            armory_scene = self.scenes['Armory']
-            if check_scene_access(armory_scene, self.player):
-                self.current_scene = armory_scene
-                return self.enter_armory()
-            else:
-                return "The Armory is locked. You need the Armory Key to enter.\nYou're still in the village."
-        
-        elif command in ['3', 'chief', 'chief house', 'visit chief']:
-            from scenes import check_scene_access
-            chief_scene = self.scenes['Cave People Chief House']
-            if check_scene_access(chief_scene, self.player):
-                self.current_scene = chief_scene
-                return self.enter_chief_house()
-            else:
-                return "The Chief's House is locked. You need the Town Key to enter.\nYou're still in the village."
-        
-        elif command in ['4', 'fire', 'stay', 'fire pit']:
-            return """You linger by the fire pit, feeling the warmth and watching the shadows dance. The village seems to hold its breath, waiting for your next move.
-
-Where would you like to go?
-1: Enter the Alley (dangerous shadows)
-2: Approach the Armory (locked chamber)
-3: Visit the Chief's House (imposing hut)
-4: Stay by the fire pit
-5: Quit"""
-        
-        elif command in ['5', 'quit']:
-            self.root.quit()
-            return "👋 Thanks for playing!"
-        
-        else:
-            return """You're in the primitive village center by the fire pit.
-
-Where would you like to go?
-1: Enter the Alley (dangerous shadows)
-2: Approach the Armory (locked chamber)
-3: Visit the Chief's House (imposing hut)
-4: Stay by the fire pit
-5: Quit"""
+        action = parse_command(command)
+        if action is None:
+            return f"❓ Unknown command: '{command}'. Type 'help' for a list of commands."
+        return self.render_events(self.core.apply(action))
     
-    def handle_alley_command(self, command):
-        """Handle Alley commands"""
-        if self.game_context.get('alley_creature_dead', False):
-            if command in ['1', 'search']:
-                return "You search the area thoroughly, but find nothing new."
-            elif command in ['2', 'village', 'return']:
-                from config import SCENE_NAMES
-                self.current_scene = self.scenes[SCENE_NAMES['PRIMITIVE_VILLAGE']]
-                return "You return to the village."
-            elif command in ['3', 'quit']:
+    def render_events(self, events):
+        """Render one command's coalesced core events as display text"""
+        lines = []
+        refresh = False
+        for kind, payload in coalesce(events):
+            if kind == MESSAGE:
+                lines.append(payload)
+            elif kind == SCENE:
+                lines.append("")
+                lines.append(f"🗻 {self.core.scene_title().upper()} 🗻")
+                lines.extend(self.core.describe_scene())
+            elif kind == DISPLAY:
+                refresh = True
+            elif kind == QUIT:
                 self.root.quit()
-                return "👋 Thanks for playing!"
-        else:
-            if command in ['1', 'attack']:
-                return self.handle_alley_combat()
-            elif command in ['2', 'escape']:
-                return self.handle_alley_escape()
-            elif command in ['3', 'quit']:
-                self.root.quit()
-                return "👋 Thanks for playing!"
+                lines.append("👋 Thanks for playing!")
         
-        return "Invalid choice. Enter 1, 2, or 3."
-    
-    def handle_alley_combat(self):
-        """Handle combat in the alley"""
-        from ui import display_weapon_choices
-        from combat import execute_weapon_attack
-        from game_events import handle_level_up, handle_loot_collection
-        
-        # Simplified weapon selection for GUI
-        weapon_name = self.player.weapon.name
-        success, message = execute_weapon_attack(self.player, self.player.weapon, "alley_creature")
-        
-        result = f"You attack with your {weapon_name}!\n{message}"
-        
-        if success:
-            result += "\n\nThe creature lets out a final, defeated roar before collapsing in a heap.\nVictory is yours!"
-            handle_level_up(self.player)
-            self.game_context['alley_creature_dead'] = True
-            handle_loot_collection(self.player)
+        if refresh:
             self.update_character_display()
-            
-            from config import SCENE_NAMES
-            self.current_scene = self.scenes[SCENE_NAMES['PRIMITIVE_VILLAGE']]
-            result += "\n\nYou return to the village, victorious and stronger than before."
-        else:
-            result += "\n\n💀 YOU HAVE DIED 💀\nGame Over! Start a new game to try again."
-            self.game_state = "menu"
-        
-        return result
-    
-    def handle_alley_escape(self):
-        """Handle escape attempt in alley"""
-        from item import dagger
-        from game_events import handle_level_up
-        
-        if self.player.weapon == dagger:  # Rogue can escape
-            result = "Your rogue training allows you to escape successfully!"
-            self.game_context['rogue_escaped_alley'] = True
-            handle_level_up(self.player)
-            self.update_character_display()
-            
-            from config import SCENE_NAMES
-            self.current_scene = self.scenes[SCENE_NAMES['PRIMITIVE_VILLAGE']]
-            result += "\n\nYou return to the village."
-            return result
-        else:
-            result = "You fail to escape! The creature catches you.\n\n💀 YOU HAVE DIED 💀\nGame Over! Start a new game to try again."
-            self.game_state = "menu"
-            return result
-    
-    def enter_armory(self):
-        """Handle entering the armory"""
-        return """🗻 ARMORY 🗻
-You enter the ancient armory. Three enhanced weapons rest on pedestals, glowing with magical energy:
-- The Shadow Blade (Enhanced Dagger)
-- The Bone Crusher (Enhanced Axe)  
-- The Skull Scepter (Enhanced Wand)
-In the corner, you notice a key labeled 'Town Key' on a small table.
-
-What would you like to do?
-1: Take the Shadow Blade
-2: Take the Bone Crusher
-3: Take the Skull Scepter
-4: Take the Town Key
-5: Leave the armory
-6: Quit"""
-    
-    def enter_chief_house(self):
-        """Handle entering the chief house"""
-        if self.game_context.get('defeated_chief', False):
-            return """The Chief's lifeless body lies on the floor. The path to the healing pool remains open.
-
-Where would you like to go?
-1: Enter the Healing Pool
-2: Return to the village
-3: Quit"""
-        else:
-            return """🗻 CHIEF'S HOUSE 🗻
-You enter the imposing chief's house...
-The Chief challenges you to battle!
-
-Choose your action:
-1: Fight the Chief
-2: Try to escape
-3: Quit"""
-    
-    def handle_armory_command(self, command):
-        """Handle Armory scene commands"""
-        # Initialize collected weapons if needed
-        if not hasattr(self.player, 'collected_weapons'):
-            self.player.collected_weapons = []
-        
-        if command in ['1', 'shadow', 'blade', 'dagger']:
-            from item import enhanced_dagger
-            if enhanced_dagger not in self.player.collected_weapons:
-                self.player.collected_weapons.append(enhanced_dagger)
-                return "You take the Shadow Blade! Its dark energy courses through you."
-            else:
-                return "You already have the Shadow Blade."
-        
-        elif command in ['2', 'bone', 'crusher', 'axe']:
-            from item import enhanced_axe
-            if enhanced_axe not in self.player.collected_weapons:
-                self.player.collected_weapons.append(enhanced_axe)
-                return "You take the Bone Crusher! Its weight feels perfect in your hands."
-            else:
-                return "You already have the Bone Crusher."
-        
-        elif command in ['3', 'skull', 'scepter', 'wand']:
-            from item import enhanced_wand
-            if enhanced_wand not in self.player.collected_weapons:
-                self.player.collected_weapons.append(enhanced_wand)
-                return "You take the Skull Scepter! Mystical power flows through it."
-            else:
-                return "You already have the Skull Scepter."
-        
-        elif command in ['4', 'town', 'key']:
-            if not self.player.inventory.has_item("Town Key"):
-                from item import Item
-                town_key = Item("Town Key", "An ornate key that opens the Chief's House.")
-                self.player.inventory.add_item(town_key)
-                return "You take the Town Key. It feels warm to the touch."
-            else:
-                return "You already have the Town Key."
-        
-        elif command in ['5', 'leave']:
-            from config import SCENE_NAMES
-            self.current_scene = self.scenes[SCENE_NAMES['PRIMITIVE_VILLAGE']]
-            return "You return to the village."
-        
-        elif command in ['6', 'quit']:
-            self.root.quit()
-            return "👋 Thanks for playing!"
-        
-        else:
-            return "Invalid choice. Enter 1-6."
-    
-    def handle_chief_house_command(self, command):
-        """Handle Chief House commands"""
-        return "Chief House commands coming soon..."
-    
-    def handle_healing_pool_command(self, command):
-        """Handle Healing Pool commands"""
-        return "Healing Pool commands coming soon..."
-    
-    def handle_final_boss_command(self, command):
-        """Handle final boss commands"""
-        return "Final boss commands coming soon..."
+        return "\n".join(lines)
             
     def new_game(self):
         """Start a new game"""
         self.game_state = "menu"
-        self.player = None
-        self.current_scene = None
-        self.scenes = None
-        self.game_context = {}
+        self.core = GameCore(self.core.content)
         
         # Clear displays
         self.game_display.config(state=tk.NORMAL)
@@ -702,14 +332,16 @@ Choose your action:
         
     def save_game(self):
         """Save current game"""
-        if self.player:
-            messagebox.showinfo("Save Game", "Save feature coming soon!")
+        if self.core.player_character:
+            self.display_text(self.render_events(self.core.apply(('save',))))
         else:
             messagebox.showwarning("No Game", "No active game to save.")
         
     def load_game(self):
         """Load saved game"""
-        messagebox.showinfo("Load Game", "Load feature coming soon!")
+        self.display_text(self.render_events(self.core.apply(('load',))))
+        if self.core.player_character:
+            self.game_state = "playing"
         
     def run(self):
         """Start the GUI"""
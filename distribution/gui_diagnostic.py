@@ -26,10 +26,10 @@ def test_imports():
         print(f"❌ game_refactored - FAILED: {e}")
     
     try:
-        from game_events import start_game
-        print("✅ game_events - Game initialization")  
+        from game_core import GameCore
+        print("✅ game_core - Game rules and state")  
     except ImportError as e:
-        print(f"❌ game_events - FAILED: {e}")
+        print(f"❌ game_core - FAILED: {e}")
         
     try:
         from scenes import setup_scenes
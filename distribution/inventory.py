@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Cave Game Inventory Store
+
+GameCore's inventory: the carried items in the order they were picked up,
+stored as item registry ids (two bytes each), plus indexes kept up to date
+on every insert and removal:
+
+    counts      id -> number carried, for O(1) membership ('Armory Key' in store)
+    categories  category -> {name: number carried}, in pickup order
+    filed       id -> category its stack is indexed under
+
+The inventory window and the key checks read an index instead of walking
+the list and looking every name up in the content. A stack stays filed
+under the category its item had when it was picked up, even if its
+definition changes meanwhile, so removing it always finds it. Names and
+descriptions live once in the registry (see item_registry.py). An
+optional on_change callback hears the id of every stack whose count
+changed, or None when the whole inventory is replaced. The store
+behaves like the list of names it replaces for iteration, len(), indexing,
+append/extend/remove and comparison with lists.
+
+    store = InventoryStore(content['item_registry'])
+    store.extend(['Iron Sword', 'Leather Armor'])
+    store.category('armor')   # live view: 'Leather Armor'
+"""
+
+from array import array
+from typing import Callable, Dict, ItemsView, Iterable, Iterator, KeysView, Optional, Tuple
+
+from item_registry import CATEGORIES, ItemDef, ItemRegistry
+
+
+class InventoryStore:
+    """
+    Ordered multiset of registry items with per-category indexes.
+
+    Attributes:
+        registry (ItemRegistry): Registry the stored ids refer to
+        on_change (Optional[Callable[[Optional[int]], None]]): Called with each changed
+            stack's id, or None after a replacement
+    """
+    def __init__(self, registry: ItemRegistry, names: Iterable[str] = (),
+                 on_change: Optional[Callable[[Optional[int]], None]] = None) -> None:
+        self.registry = registry
+        self.on_change = on_change
+        self._ids = array('H')
+        self._counts: Dict[int, int] = {}
+        self._categories: Dict[str, Dict[str, int]] = {category: {} for category in CATEGORIES}
+        self._filed: Dict[int, str] = {}
+        self._tuple: Optional[Tuple[int, ...]] = None
+        self.extend(names)
+
+    def __repr__(self) -> str:
+        return f"InventoryStore({list(self)!r})"
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __iter__(self) -> Iterator[str]:
+        registry = self.registry
+        return (registry[item_id].name for item_id in self._ids)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.registry[item_id].name for item_id in self._ids[index]]
+        return self.registry[self._ids[index]].name
+
+    def __contains__(self, name: object) -> bool:
+        item = self.registry.get(name)
+        return item is not None and item.item_id in self._counts
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, InventoryStore):
+            if self.registry is other.registry:
+                return self._ids == other._ids
+            return list(self) == list(other)
+        if isinstance(other, (list, tuple)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def definitions(self) -> Iterator[ItemDef]:
+        """The carried items' definitions, one per copy, in pickup order"""
+        registry = self.registry
+        return (registry[item_id] for item_id in self._ids)
+
+    def _index(self, item_id: int, change: int) -> None:
+        item = self.registry[item_id]
+        count = self._counts.get(item_id, 0) + change
+        category = self._filed.get(item_id)
+        if category is None:
+            category = self._filed[item_id] = item.category
+        index = self._categories[category]
+        if count:
+            self._counts[item_id] = index[item.name] = count
+        else:
+            del self._counts[item_id]
+            del self._filed[item_id]
+            del index[item.name]
+        self._tuple = None
+        if self.on_change is not None:
+            self.on_change(item_id)
+
+    def append(self, name: str) -> None:
+        """Add one item"""
+        item_id = self.registry.id_of(name)
+        self._ids.append(item_id)
+        self._index(item_id, 1)
+
+    def extend(self, names: Iterable[str]) -> None:
+        """Add several items"""
+        for name in names:
+            self.append(name)
+
+    def remove(self, name: str) -> None:
+        """Remove the first copy of an item; ValueError if none is carried"""
+        item = self.registry.get(name)
+        if item is None or item.item_id not in self._counts:
+            raise ValueError(f"{name!r} is not in the inventory")
+        self._ids.remove(item.item_id)
+        self._index(item.item_id, -1)
+
+    def _replace(self, ids: Iterable[int]) -> None:
+        on_change, self.on_change = self.on_change, None
+        del self._ids[:]
+        self._counts.clear()
+        self._filed.clear()
+        for index in self._categories.values():
+            index.clear()
+        for item_id in ids:
+            self._ids.append(item_id)
+            self._index(item_id, 1)
+        self.on_change = on_change
+        if on_change is not None:
+            on_change(None)
+
+    def replace(self, names: Iterable[str]) -> None:
+        """Replace the whole inventory, e.g. for a new game; category views stay live"""
+        self._replace([self.registry.id_of(name) for name in names])
+
+    def replace_ids(self, ids: Tuple[int, ...]) -> None:
+        """Replace the whole inventory with registry ids, e.g. for an undo"""
+        self._replace(ids)
+        self._tuple = ids
+
+    def count(self, name: str) -> int:
+        """Number of copies of an item carried"""
+        item = self.registry.get(name)
+        return 0 if item is None else self._counts.get(item.item_id, 0)
+
+    def stacks(self) -> ItemsView[int, int]:
+        """Live view of (id, count) per distinct item, in first pickup order"""
+        return self._counts.items()
+
+    def category(self, category: str) -> KeysView[str]:
+        """Live view of the names carried in a category, in pickup order"""
+        return self._categories[category].keys()
+
+    def category_counts(self, category: str) -> Dict[str, int]:
+        """Names carried in a category with their counts"""
+        return dict(self._categories[category])
+
+    def as_tuple(self) -> Tuple[str, ...]:
+        """The names as a tuple"""
+        return tuple(self)
+
+    def id_tuple(self) -> Tuple[int, ...]:
+        """The registry ids as a tuple, cached until the next change (for snapshots)"""
+        if self._tuple is None:
+            self._tuple = tuple(self._ids)
+        return self._tuple
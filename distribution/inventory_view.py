@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Cave Game Inventory View Model
+
+Rows for the GUI's inventory window: one row per distinct item carried
+(a stack), in first pickup order, optionally limited to some categories.
+The rows follow the store through INVENTORY events (event_bus.py)
+instead of being rebuilt: apply() takes the ids whose counts changed and
+returns the first row that needs redrawing, so a view that only shows a
+window of rows redraws that window and nothing else.
+
+    rows = InventoryRows(core.inventory)
+    bus.subscribe(INVENTORY, lambda changed: view.redraw_from(rows.apply(changed)))
+    rows.window(top, 20)   # the 20 rows a scrolled view shows
+"""
+
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from inventory import InventoryStore
+from item_registry import ItemDef
+
+Row = Tuple[str, str, str, str]  # (name, category, count, details)
+
+COLUMNS = ('item', 'category', 'count', 'details')
+
+
+def row_details(item: ItemDef) -> str:
+    """Details column text of an item"""
+    if item.category == 'weapon' and item.damage:
+        return f"{item.damage} damage"
+    return item.description
+
+
+class InventoryRows:
+    """
+    Stack rows of an inventory, kept in step with its change events.
+
+    Attributes:
+        store (InventoryStore): Inventory the rows show
+        categories (Optional[FrozenSet[str]]): Categories shown, None for all
+    """
+    def __init__(self, store: InventoryStore, categories: Optional[Iterable[str]] = None) -> None:
+        self.store = store
+        self.categories = None if categories is None else frozenset(categories)
+        self._order: List[int] = []
+        self._position: Dict[int, int] = {}
+        self.reset()
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def _shown(self, item_id: int) -> bool:
+        return self.categories is None or self.store.registry[item_id].category in self.categories
+
+    def reset(self) -> None:
+        """Rebuild every row from the store"""
+        self._order = [item_id for item_id, _count in self.store.stacks() if self._shown(item_id)]
+        self._position = {item_id: index for index, item_id in enumerate(self._order)}
+
+    def apply(self, changed: Optional[FrozenSet[int]]) -> int:
+        """Follow one INVENTORY payload; return the first row index that changed
+
+        Returns len(self) when no shown row changed.
+        """
+        if changed is None:
+            self.reset()
+            return 0
+        first = len(self._order)
+        counts = self.store.stacks().mapping
+        for item_id in changed:
+            position = self._position.get(item_id)
+            if position is None:
+                if item_id in counts and self._shown(item_id):
+                    self._position[item_id] = len(self._order)
+                    first = min(first, len(self._order))
+                    self._order.append(item_id)
+            elif item_id not in counts:
+                del self._order[position]
+                del self._position[item_id]
+                for index in range(position, len(self._order)):
+                    self._position[self._order[index]] = index
+                first = min(first, position)
+            else:
+                first = min(first, position)
+        return first
+
+    def row(self, index: int) -> Row:
+        """The columns of one row"""
+        item_id = self._order[index]
+        item = self.store.registry[item_id]
+        return (item.name, item.category.title(), str(self.store.stacks().mapping[item_id]), row_details(item))
+
+    def window(self, start: int, size: int) -> List[Row]:
+        """The rows from start, at most size of them"""
+        return [self.row(index) for index in range(start, min(start + size, len(self._order)))]
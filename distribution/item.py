@@ -7,25 +7,33 @@ This module defines the item and weapon classes used throughout the game.
 Includes inventory management and weapon definitions for all character classes.
 """
 
-from typing import List, Optional, TYPE_CHECKING
+from typing import Callable, Dict, Iterator, KeysView, List, Optional, TYPE_CHECKING
+
+from item_registry import CATEGORIES, ITEMS, ItemDef
 
 if TYPE_CHECKING:
     from player import Player
 
 
-class Item:
-    """Base class for all game items."""
-    def __init__(self, name: str, description: str) -> None:
-        self.name = name
-        self.description = description
+class Item(ItemDef):
+    """Base class for all game items; definitions are immutable and shared through ITEMS."""
+    __slots__ = ()
 
 
 class Weapon(Item):
     """Weapon that scales with player attributes."""
-    def __init__(self, name: str, description: str, base_damage: int, scale_attr: str) -> None:
-        super().__init__(name, description)
-        self.base_damage = base_damage
-        self.scale_attr = scale_attr  # 'agility', 'strength', 'intelligence'
+    __slots__ = ('scale_attr',)
+
+    def __init__(self, name: str, description: str, base_damage: int, scale_attr: str, item_id: int = -1) -> None:
+        super().__init__(name, description, 'weapon', damage=base_damage, item_id=item_id)
+        object.__setattr__(self, 'scale_attr', scale_attr)  # 'agility', 'strength', 'intelligence'
+
+    def _args(self):
+        return (self.name, self.description, self.damage, self.scale_attr)
+
+    @property
+    def base_damage(self) -> int:
+        return self.damage
 
     def get_damage(self, player: 'Player') -> int:
         """Calculate weapon damage based on player stats."""
@@ -34,76 +42,136 @@ class Weapon(Item):
 
 
 class Inventory:
-    """Player inventory for managing items and keys."""
-    def __init__(self) -> None:
-        self.items: List[Item] = []
-
-    def add_item(self, item: Item) -> None:
+    """
+    Player inventory for managing items and keys.
+
+    Items are stacked by registry id: adding an item interns it in ITEMS,
+    so a stack is one id and a count however the item was built.
+    Membership, adding and removing are dict operations, and every
+    category keeps its own index of stacks, filed under the category the
+    item had when the stack was started. Messages go to an optional
+    sink (e.g. a UI's message log) instead of stdout.
+
+    Attributes:
+        sink (Optional[Callable[[str], None]]): Receives inventory messages
+    """
+    def __init__(self, sink: Optional[Callable[[str], None]] = None) -> None:
+        self.sink = sink
+        self._counts: Dict[int, int] = {}
+        self._categories: Dict[str, Dict[str, int]] = {category: {} for category in CATEGORIES}
+        self._filed: Dict[int, str] = {}
+        self._size = 0
+
+    def _emit(self, message: str) -> None:
+        if self.sink is not None:
+            self.sink(message)
+
+    def _id(self, item_name: str) -> Optional[int]:
+        item = ITEMS.get(item_name)
+        return None if item is None else item.item_id
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, item_name: str) -> bool:
+        return self._id(item_name) in self._counts
+
+    def __iter__(self) -> Iterator[ItemDef]:
+        for item_id, count in self._counts.items():
+            item = ITEMS[item_id]
+            for _ in range(count):
+                yield item
+
+    @property
+    def items(self) -> List[ItemDef]:
+        """Every carried item, one entry per copy, in the order first added."""
+        return list(self)
+
+    def add_item(self, item: ItemDef, count: int = 1) -> None:
         """Add an item to the inventory."""
-        self.items.append(item)
-        print(f"Added {item.name} to inventory.")
+        item = ITEMS.intern(item)
+        if item.item_id in self._counts:
+            self._counts[item.item_id] += count
+        else:
+            self._counts[item.item_id] = count
+            self._categories[item.category][item.name] = item.item_id
+            self._filed[item.item_id] = item.category
+        self._size += count
+        self._emit(f"Added {item.name} to inventory.")
 
     def remove_item(self, item_name: str) -> bool:
         """Remove an item from inventory by name."""
-        for item in self.items:
-            if item.name == item_name:
-                self.items.remove(item)
-                print(f"Removed {item.name} from inventory.")
-                return True
-        print(f"Item {item_name} not found.")
-        return False
+        item_id = self._id(item_name)
+        count = self._counts.get(item_id)
+        if count is None:
+            self._emit(f"Item {item_name} not found.")
+            return False
+        if count > 1:
+            self._counts[item_id] = count - 1
+        else:
+            del self._counts[item_id]
+            del self._categories[self._filed.pop(item_id)][item_name]
+        self._size -= 1
+        self._emit(f"Removed {item_name} from inventory.")
+        return True
 
     def list_items(self) -> None:
         """Display all items in inventory."""
-        for item in self.items:
-            print(f"{item.name}: {item.description}")
+        for item_id, count in self._counts.items():
+            item = ITEMS[item_id]
+            self._emit(f"{item.name}: {item.description}" if count == 1 else f"{item.name} x{count}: {item.description}")
 
     def has_item(self, item_name: str) -> bool:
         """Check if inventory contains a specific item."""
-        for item in self.items:
-            if item.name == item_name:
-                return True
-        return False
+        return item_name in self
+
+    def count(self, item_name: str) -> int:
+        """Return how many of an item are carried."""
+        return self._counts.get(self._id(item_name), 0)
+
+    def category(self, category: str) -> KeysView[str]:
+        """Return a live view of the names of carried items in a category."""
+        return self._categories[category].keys()
 
 # Example weapons
-dagger = Weapon(
+dagger = ITEMS.intern(Weapon(
     name="Dagger",
     description="A sharp blade that favors agility.",
     base_damage=5,
     scale_attr="agility"
-)
-axe = Weapon(
+))
+axe = ITEMS.intern(Weapon(
     name="Axe",
     description="A heavy axe that favors strength.",
     base_damage=8,
     scale_attr="strength"
-)
-wand = Weapon(
+))
+wand = ITEMS.intern(Weapon(
     name="Wand",
     description="A magical wand that favors intelligence.",
     base_damage=6,
     scale_attr="intelligence"
-)
+))
 
 # Enhanced weapons found in the Armory
-enhanced_dagger = Weapon(
+enhanced_dagger = ITEMS.intern(Weapon(
     name="Shadow Blade",
     description="An ancient dagger that gleams with dark energy. Greatly favors agility.",
     base_damage=12,
     scale_attr="agility"
-)
+))
 
-enhanced_axe = Weapon(
+enhanced_axe = ITEMS.intern(Weapon(
     name="Bone Crusher",
     description="A massive war axe carved from ancient bone. Greatly favors strength.",
     base_damage=18,
     scale_attr="strength"
-)
+))
 
-enhanced_wand = Weapon(
+enhanced_wand = ITEMS.intern(Weapon(
     name="Skull Scepter",
     description="A mystical scepter crowned with a miniature skull. Greatly favors intelligence.",
     base_damage=15,
     scale_attr="intelligence"
-)
+))
 
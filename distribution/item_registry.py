@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Cave Game Item Registry
+
+One interned definition per item name. Definitions are immutable ItemDefs
+numbered densely as they are registered, so an inventory stores small
+integer ids and looks the name, category and description up here instead
+of keeping an object or a string per pickup.
+
+Every compiled content carries its own registry, defined from its weapons
+and items (content['item_registry']), which GameCore and the GUI use, so
+two sessions with different content never see each other's definitions.
+The text engine (item.py) keeps the module registry ITEMS. Names nothing
+defines are interned on first use as 'misc' items, or 'key' items if the
+name ends in " Key":
+
+    registry = content['item_registry']
+    sword = registry.get('Iron Sword')           # ItemDef(#0 'Iron Sword')
+    registry.id_of('Odd Stone')                  # interned once, same id after
+    registry[registry.id_of('Odd Stone')].name   # 'Odd Stone'
+"""
+
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Tuple
+
+# Inventory categories; anything else is filed as 'misc'
+CATEGORIES = ('weapon', 'armor', 'accessory', 'consumable', 'key', 'misc')
+
+
+def default_category(name: str) -> str:
+    """Category of an item nothing gave one to"""
+    return 'key' if name.endswith(' Key') else 'misc'
+
+
+class ItemDef:
+    """
+    Immutable item definition.
+
+    Attributes:
+        item_id (int): Registry id, -1 until registered
+        name (str): Display name, unique in the registry
+        description (str): Descriptive text
+        category (str): One of CATEGORIES
+        damage (int): Weapon damage, 0 for other items
+        effect (Optional[str]): What using or wearing the item affects
+        value (int): Size of the effect
+    """
+    __slots__ = ('item_id', 'name', 'description', 'category', 'damage', 'effect', 'value')
+
+    def __init__(self, name: str, description: str = '', category: Optional[str] = None,
+                 damage: int = 0, effect: Optional[str] = None, value: int = 0, item_id: int = -1) -> None:
+        object.__setattr__(self, 'item_id', item_id)
+        object.__setattr__(self, 'name', name)
+        object.__setattr__(self, 'description', description)
+        object.__setattr__(self, 'category', category if category in CATEGORIES else default_category(name))
+        object.__setattr__(self, 'damage', damage)
+        object.__setattr__(self, 'effect', effect)
+        object.__setattr__(self, 'value', value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable; cannot set '{name}'")
+
+    def _args(self) -> Tuple:
+        """Constructor arguments other than the id"""
+        return (self.name, self.description, self.category, self.damage, self.effect, self.value)
+
+    def with_id(self, item_id: int) -> 'ItemDef':
+        """Return a copy of this definition registered under item_id"""
+        return type(self)(*self._args(), item_id=item_id)
+
+    def __reduce__(self):
+        return (type(self), self._args() + (self.item_id,))
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, ItemDef):
+            return NotImplemented
+        return type(self) is type(other) and self._args() == other._args()
+
+    def __hash__(self) -> int:
+        return hash(self.name)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(#{self.item_id} {self.name!r})"
+
+
+class ItemRegistry:
+    """
+    Interned item definitions, by dense id and by name.
+
+    define() is authoritative: content registers through it and replaces a
+    changed definition in place. intern() keeps the first definition of a
+    name, so an item built on the fly resolves to the shared one.
+    """
+    def __init__(self) -> None:
+        self._defs: List[ItemDef] = []
+        self._ids: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._defs)
+
+    def __iter__(self) -> Iterator[ItemDef]:
+        return iter(self._defs)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._ids
+
+    def __getitem__(self, item_id: int) -> ItemDef:
+        return self._defs[item_id]
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, ItemRegistry):
+            return NotImplemented
+        return self._defs == other._defs
+
+    def get(self, name: str) -> Optional[ItemDef]:
+        """Definition of a name, None if nothing defines it"""
+        item_id = self._ids.get(name)
+        return None if item_id is None else self._defs[item_id]
+
+    def _add(self, definition: ItemDef) -> ItemDef:
+        definition = definition.with_id(len(self._defs))
+        self._ids[definition.name] = definition.item_id
+        self._defs.append(definition)
+        return definition
+
+    def define(self, definition: ItemDef) -> ItemDef:
+        """Register a definition, replacing a different one of the same name"""
+        item_id = self._ids.get(definition.name)
+        if item_id is None:
+            return self._add(definition)
+        if self._defs[item_id] != definition:
+            self._defs[item_id] = definition.with_id(item_id)
+        return self._defs[item_id]
+
+    def intern(self, definition: ItemDef) -> ItemDef:
+        """Return the registered definition of a name, registering this one if it is new"""
+        item_id = self._ids.get(definition.name)
+        return self._add(definition) if item_id is None else self._defs[item_id]
+
+    def id_of(self, name: str) -> int:
+        """Id of a name, interning a placeholder definition for unknown names"""
+        item_id = self._ids.get(name)
+        if item_id is None:
+            item_id = self._add(ItemDef(name)).item_id
+        return item_id
+
+    def define_content(self, weapons: Mapping[str, Dict[str, Any]], items: Mapping[str, Dict[str, Any]]) -> None:
+        """Define the weapons and items of a content"""
+        for name, weapon in weapons.items():
+            self.define(ItemDef(name, f"{weapon['type'].title()} weapon", 'weapon', damage=weapon['damage']))
+        for name, item in items.items():
+            self.define(ItemDef(name, item['description'], item['type'], effect=item['effect'], value=item['value']))
+
+
+# The text engine's registry (item.py); GameCore uses its content's registry
+ITEMS = ItemRegistry()
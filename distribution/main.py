@@ -14,15 +14,32 @@ import traceback
 # Game configuration
 REQUIRED_FILES = [
     'game_refactored.py',
+    'game_core.py',
+    'content.py',
+    'registry.py',
+    'event_bus.py',
+    'random_streams.py',
+    'damage_tables.py',
+    'combat_solver.py',
+    'encounter.py',
+    'equipment.py',
+    'savegame.py',
+    'autosave.py',
+    'combat_log.py',
+    'progress.py',
+    'snapshot.py',
+    'scene_graph.py',
     'player.py', 
     'combat.py',
     'scenes.py',
     'item.py',
+    'item_registry.py',
+    'inventory.py',
     'ui.py',
     'config.py'
 ]
 
-OPTIONAL_FILES = ['gui.py']
+OPTIONAL_FILES = ['gui.py', 'simulator.py', 'balance.py', 'inventory_view.py', 'save_store.py']
 
 # Command line arguments
 VALID_ARGS = ['--text', '--debug', '--help', '--version']
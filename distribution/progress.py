@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Cave Game Progress Flags
+
+Story progress is a single integer bitset. Every consequence in
+consequences.json owns one Progress flag named after it, so copying,
+hashing, comparing and serializing progress are plain integer operations.
+
+The bit positions are a stable registry: they are written into save files,
+so new flags are only ever appended and existing values never change.
+"""
+
+from enum import IntFlag
+from typing import Iterable, List
+
+
+class Progress(IntFlag):
+    """Progress flags, one per consequence. Append only - never renumber."""
+    VISITED_VILLAGE = 1 << 0
+    DEFEATED_GUARDIAN = 1 << 1
+    FOUND_TREASURE = 1 << 2
+    MET_CHIEF = 1 << 3
+    LOOKED_AROUND_DARK = 1 << 4
+    SAT_AND_CRIED = 1 << 5
+    ENTERED_SKULL_CHAMBER = 1 << 6
+    GAINED_VILLAGERS_TRUST = 1 << 7
+    LEARNED_ANCIENT_SECRETS = 1 << 8
+    ENTERED_CAUTIOUSLY = 1 << 9
+    CONFRONTED_DARKNESS = 1 << 10
+    LEARNED_VILLAGE_HISTORY = 1 << 11
+    FOUND_ARTIFACTS = 1 << 12
+    HELPED_VILLAGERS = 1 << 13
+    OFFERED_SERVICES = 1 << 14
+    GAINED_MAGICAL_INSIGHT = 1 << 15
+    UNDERSTOOD_POOL_MAGIC = 1 << 16
+    RESTORED_HEALTH = 1 << 17
+    LEARNED_VILLAGE_CUSTOMS = 1 << 18
+    PROTECTED_VILLAGERS = 1 << 19
+    GAINED_SPIRITUAL_INSIGHT = 1 << 20
+    FOUND_CORRUPTION_SOURCE = 1 << 21
+    EXPLORED_ALLEY = 1 << 22
+    FOUND_ALLEY_TREASURE = 1 << 23
+    INVESTIGATED_ALLEY_SOUNDS = 1 << 24
+    EXAMINED_ARMORY = 1 << 25
+    REQUESTED_CUSTOM_EQUIPMENT = 1 << 26
+    LEARNED_WEAPON_MAINTENANCE = 1 << 27
+    NO_EXIT_VISIBLE = 1 << 28
+    TUNNEL_COLLAPSE = 1 << 29
+    ADVANCED_TO_HEALING_POOL = 1 << 30
+    ADVANCED_TO_VILLAGE = 1 << 31
+    ADVANCED_TO_CHIEFS_HOUSE = 1 << 32
+    ADVANCED_TO_VILLAGE_CHANGED = 1 << 33
+    ESCAPED_CAVE_IN = 1 << 34
+    FOLLOWED_CREATURE_TO_ALLEY = 1 << 35
+    APPROACHED_ARMORY = 1 << 36
+    APPROACHED_CHIEFS_HOUSE = 1 << 37
+    CONFRONTED_ALLEY_CREATURE = 1 << 38
+    SNEAKED_PAST_CREATURE = 1 << 39
+    SEARCHED_ALLEY_ITEMS = 1 << 40
+    SEARCHED_ARMORY_KEYS = 1 << 41
+    USED_ARMORY_KEY = 1 << 42
+    USED_CHIEFS_HOUSE_KEY = 1 << 43
+    RETURNED_TO_VILLAGE = 1 << 44
+
+
+NO_PROGRESS = Progress(0)
+
+
+def flag_for(name: str) -> Progress:
+    """Return the flag for a consequence name, or raise KeyError"""
+    return Progress[name.upper()]
+
+
+def flag_names(progress: int) -> List[str]:
+    """Return the consequence names whose flags are set, in bit order"""
+    return [flag.name.lower() for flag in Progress if progress & flag]
+
+
+def flags_from_names(names: Iterable[str]) -> Progress:
+    """Build a progress value from consequence names"""
+    progress = NO_PROGRESS
+    for name in names:
+        progress |= flag_for(name)
+    return progress
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Cave Game Handler Registry
+
+Decorator-based dispatch tables for the game core. Handlers register
+themselves under an interned name (and optional command aliases) when
+their class is defined:
+
+    ACTIONS = HandlerRegistry('action')
+
+    class GameCore:
+        @ACTIONS.register('look', aliases=('look', 'l'))
+        def look(self): ...
+
+Each instance binds the table once, so dispatching a step is a single dict
+lookup instead of a chain of string comparisons.
+"""
+
+import sys
+from typing import Any, Callable, Dict, Iterable
+
+
+class HandlerRegistry:
+    """
+    Maps interned names to handler functions.
+
+    Attributes:
+        kind (str): What the handlers dispatch on, used in error messages
+        handlers (Dict[str, Callable]): Name -> registered function
+        aliases (Dict[str, str]): Normalized command word -> handler name
+    """
+    def __init__(self, kind: str) -> None:
+        self.kind = kind
+        self.handlers: Dict[str, Callable] = {}
+        self.aliases: Dict[str, str] = {}
+
+    def register(self, name: str, aliases: Iterable[str] = ()) -> Callable:
+        """Decorator registering a handler under a name and command aliases"""
+        name = sys.intern(name)
+        if name in self.handlers:
+            raise ValueError(f"Duplicate {self.kind} handler: {name}")
+        aliases = [sys.intern(alias.lower()) for alias in aliases]
+        for alias in aliases:
+            if alias in self.aliases:
+                raise ValueError(f"Duplicate {self.kind} alias: {alias}")
+
+        def decorator(func: Callable) -> Callable:
+            self.handlers[name] = func
+            for alias in aliases:
+                self.aliases[alias] = name
+            return func
+        return decorator
+
+    def bind(self, instance: Any) -> Dict[str, Callable]:
+        """Return a name -> bound method table for one instance"""
+        return {name: func.__get__(instance, type(instance))
+                for name, func in self.handlers.items()}
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.handlers
+
+    def __iter__(self):
+        return iter(self.handlers)
@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""
+Cave Game SQLite Save Store
+
+Saves for installs where many players (profiles) each keep several slots,
+such as a shared kiosk: one SQLite database instead of a directory of
+save files. A row holds the same bytes a save file would (savegame.py, so
+old formats migrate the same way) next to the slot summary the file index
+keeps, so a load menu is one indexed query:
+
+    saves(profile, slot, data, format, class, level, scene, health,
+          in_combat, playtime, updated_at)    primary key (profile, slot)
+    index saves_by_profile (profile, updated_at)
+    index saves_by_time (updated_at)
+
+Row data is stored at zlib level 0: the random streams' state barely
+compresses, and compressing would cost most of a save.
+
+The database runs in WAL mode, so readers never wait for the writer, with
+synchronous=NORMAL: a commit is durable once the WAL is checkpointed and
+a crash never corrupts the database. Each thread gets its own connection;
+the SQL is module constants, so each connection's statement cache
+prepares every statement once. save_many() writes any number of slots in
+one transaction, and migrate_files() imports a save directory that way.
+
+    store = SaveStore('saves.db')
+    saves = store.profile('alice')
+    core.save_store = saves           # the save/load/saves actions use it
+    saves.save(QUICKSAVE, capture_state(core))
+    saves.list()                      # [(slot, summary), ...], newest first
+
+Usage:
+    python save_store.py                               # Benchmark concurrent sessions
+    python save_store.py DB import SAVE_DIR PROFILE    # Import file saves into a profile
+    python save_store.py DB list [PROFILE]             # List profiles, or a profile's slots
+"""
+
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Tuple
+
+from autosave import read_autosave
+from savegame import (SAVE_FORMAT, SAVE_SUFFIX, PathLike, SaveFormatError, State, Summary, capture_state, decode,
+                      encode, restore_state, summarize)
+
+STORE_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS saves (
+    profile TEXT NOT NULL,
+    slot TEXT NOT NULL,
+    data BLOB NOT NULL,
+    format INTEGER NOT NULL,
+    class TEXT NOT NULL,
+    level INTEGER NOT NULL,
+    scene TEXT NOT NULL,
+    health INTEGER NOT NULL,
+    in_combat INTEGER NOT NULL,
+    playtime REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (profile, slot)
+);
+CREATE INDEX IF NOT EXISTS saves_by_profile ON saves (profile, updated_at);
+CREATE INDEX IF NOT EXISTS saves_by_time ON saves (updated_at);
+"""
+
+UPSERT = """
+INSERT INTO saves (profile, slot, data, format, class, level, scene, health, in_combat, playtime, updated_at)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (profile, slot) DO UPDATE SET
+    data = excluded.data, format = excluded.format, class = excluded.class, level = excluded.level,
+    scene = excluded.scene, health = excluded.health, in_combat = excluded.in_combat,
+    playtime = excluded.playtime, updated_at = excluded.updated_at
+"""
+SELECT_DATA = "SELECT data FROM saves WHERE profile = ? AND slot = ?"
+SELECT_SLOTS = """
+SELECT slot, class, level, scene, health, in_combat, playtime, updated_at
+FROM saves WHERE profile = ? ORDER BY updated_at DESC
+"""
+SELECT_PROFILES = "SELECT DISTINCT profile FROM saves ORDER BY profile"
+DELETE = "DELETE FROM saves WHERE profile = ? AND slot = ?"
+
+# Seconds a connection waits for another writer before giving up
+BUSY_TIMEOUT = 10.0
+
+SaveRecord = Tuple[str, str, State]  # (profile, slot, state)
+
+
+def _row(profile: str, slot: str, state: State) -> Tuple:
+    summary = summarize(state)
+    return (profile, slot, encode(state, 0), SAVE_FORMAT, summary['class'], summary['level'], summary['scene'],
+            summary['health'], summary['in_combat'], summary['playtime'], summary['saved_at'])
+
+
+class SaveStore:
+    """
+    SQLite database of every profile's save slots, safe to share between threads.
+
+    Attributes:
+        path (Path): Database file
+    """
+    def __init__(self, path: PathLike) -> None:
+        self.path = Path(path)
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+        connection = self._connection()
+        with connection:
+            connection.execute("PRAGMA journal_mode = WAL")
+            connection.executescript(SCHEMA)
+            connection.execute(f"PRAGMA user_version = {STORE_VERSION}")
+
+    def _connection(self) -> sqlite3.Connection:
+        """This thread's connection, opened on first use"""
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT, check_same_thread=False)
+            connection.execute("PRAGMA synchronous = NORMAL")
+            self._local.connection = connection
+            with self._lock:
+                self._connections.append(connection)
+        return connection
+
+    def close(self) -> None:
+        """Close every thread's connection"""
+        with self._lock:
+            for connection in self._connections:
+                connection.close()
+            self._connections.clear()
+        self._local = threading.local()
+
+    def profile(self, name: str) -> 'ProfileSaves':
+        """The slots of one profile"""
+        return ProfileSaves(self, name)
+
+    def profiles(self) -> List[str]:
+        """Every profile with at least one save"""
+        return [profile for (profile,) in self._connection().execute(SELECT_PROFILES)]
+
+    def save(self, profile: str, slot: str, state: State) -> None:
+        """Write one slot, replacing what it held"""
+        connection = self._connection()
+        with connection:
+            connection.execute(UPSERT, _row(profile, slot, state))
+
+    def save_many(self, records: Iterable[SaveRecord]) -> int:
+        """Write any number of (profile, slot, state) slots in one transaction; return how many"""
+        rows = [_row(profile, slot, state) for profile, slot, state in records]
+        connection = self._connection()
+        with connection:
+            connection.executemany(UPSERT, rows)
+        return len(rows)
+
+    def load(self, profile: str, slot: str) -> State:
+        """A slot's current-format state; FileNotFoundError if the slot is empty, as for a save file"""
+        row = self._connection().execute(SELECT_DATA, (profile, slot)).fetchone()
+        if row is None:
+            raise FileNotFoundError(f"No save in slot {slot!r} of profile {profile!r}")
+        return decode(row[0])
+
+    def list(self, profile: str) -> List[Tuple[str, Summary]]:
+        """A profile's slots with their summaries, most recently saved first"""
+        return [(slot, {'class': class_key, 'level': level, 'scene': scene, 'health': health,
+                        'in_combat': bool(in_combat), 'playtime': playtime, 'saved_at': updated_at})
+                for slot, class_key, level, scene, health, in_combat, playtime, updated_at
+                in self._connection().execute(SELECT_SLOTS, (profile,))]
+
+    def delete(self, profile: str, slot: str) -> None:
+        """Remove a slot"""
+        connection = self._connection()
+        with connection:
+            connection.execute(DELETE, (profile, slot))
+
+
+class ProfileSaves:
+    """
+    One profile's view of a SaveStore, the save backend a GameCore uses.
+
+    Attributes:
+        store (SaveStore): Database the slots live in
+        name (str): Profile the slots belong to
+    """
+    def __init__(self, store: SaveStore, name: str) -> None:
+        self.store = store
+        self.name = name
+
+    def save(self, slot: str, state: State) -> None:
+        """Write a slot"""
+        self.store.save(self.name, slot, state)
+
+    def load(self, slot: str) -> State:
+        """A slot's state; FileNotFoundError if the slot is empty"""
+        return self.store.load(self.name, slot)
+
+    def list(self) -> List[Tuple[str, Summary]]:
+        """The slots with their summaries, most recently saved first"""
+        return self.store.list(self.name)
+
+    def delete(self, slot: str) -> None:
+        """Remove a slot"""
+        self.store.delete(self.name, slot)
+
+    def load_game(self, core, slot: str) -> State:
+        """Load a slot into the core; return the state loaded"""
+        state = self.load(slot)
+        restore_state(core, state)
+        return state
+
+
+def migrate_files(store: SaveStore, save_dir: PathLike, profile: str) -> Dict[str, Any]:
+    """Import every save file in a directory into a profile, in one transaction
+
+    Autosave journals are replayed onto their checkpoints first. Returns
+    the slots imported and the files that could not be read.
+    """
+    records = []
+    skipped = []
+    for path in sorted(Path(save_dir).glob(f"*{SAVE_SUFFIX}")):
+        try:
+            records.append((profile, path.stem, read_autosave(path)))
+        except (OSError, SaveFormatError) as e:
+            skipped.append((path.name, str(e)))
+    store.save_many(records)
+    return {'imported': [slot for _profile, slot, _state in records], 'skipped': skipped}
+
+
+def benchmark(sessions: int = 8, operations: int = 500, seed: int = 7) -> Dict[str, float]:
+    """Time concurrent sessions saving and loading, and a batched import; return operations per second"""
+    from game_core import GameCore
+
+    core = GameCore(seed=seed)
+    core.apply(('new_game', 'warrior'))
+    rng = core.streams.split(0).loot
+    for _ in range(60):
+        choices = core.scene_choices.get(core.current_scene, ())
+        core.apply(('choose', rng.randint(1, max(1, len(choices)))))
+    state = capture_state(core)
+
+    with tempfile.TemporaryDirectory() as directory:
+        store = SaveStore(Path(directory) / 'saves.db')
+
+        def session(number: int) -> None:
+            saves = store.profile(f"player{number}")
+            for i in range(operations // 2):
+                saves.save(f"slot{i % 5}", state)
+                saves.load(f"slot{i % 5}")
+
+        threads = [threading.Thread(target=session, args=(number,)) for number in range(sessions)]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        concurrent_s = time.perf_counter() - start
+
+        records = [(f"kiosk{i % 50}", f"slot{i}", state) for i in range(operations)]
+        start = time.perf_counter()
+        store.save_many(records)
+        batch_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for number in range(sessions):
+            store.list(f"player{number}")
+        list_ms = (time.perf_counter() - start) * 1000 / sessions
+        store.close()
+    return {
+        'sessions': sessions,
+        'concurrent_ops': sessions * (operations // 2) * 2 / concurrent_s,
+        'batched_saves': operations / batch_s,
+        'list_ms': list_ms,
+    }
+
+
+def main(argv: List[str]) -> int:
+    """Benchmark the store, import a save directory, or list profiles and slots"""
+    if len(argv) < 2:
+        report = benchmark()
+        print(f"🗄️  {report['sessions']} sessions: {report['concurrent_ops']:,.0f} saves and loads per second, "
+              f"{report['batched_saves']:,.0f} batched saves per second, "
+              f"{report['list_ms']:.2f} ms to list a profile")
+        return 0
+    if len(argv) < 3 or argv[2] not in ('import', 'list') or (argv[2] == 'import' and len(argv) != 5):
+        print(__doc__.split('Usage:')[1].rstrip())
+        return 2
+    store = SaveStore(argv[1])
+    try:
+        if argv[2] == 'import':
+            report = migrate_files(store, argv[3], argv[4])
+            print(f"🗄️  Imported {len(report['imported'])} saves into profile '{argv[4]}'")
+            for name, error in report['skipped']:
+                print(f"❌ {name}: {error}")
+            return 1 if report['skipped'] else 0
+        if len(argv) == 3:
+            for profile in store.profiles():
+                print(profile)
+            return 0
+        for slot, summary in store.list(argv[3]):
+            print(f"💾 {slot}: {summary['class']} level {summary['level']} in {summary['scene']}, "
+                  f"played {summary['playtime'] / 60:.0f} min, saved {time.ctime(summary['saved_at'])}")
+        return 0
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv))
@@ -0,0 +1,395 @@
+#!/usr/bin/env python3
+"""
+Cave Game Saves
+
+A save file is a small header followed by a compressed dump of a plain
+state dict:
+
+    header   magic b'CVSV', format version (u16), CRC-32 of the payload (u32)
+    payload  zlib(marshal(state))
+
+The state holds every piece of GameCore state an undo snapshot holds (see
+snapshot.py), by name rather than by registry id, plus the random
+streams' positions from RandomStreams.getstate(), so a loaded run
+continues exactly as the saved one would have.
+
+Every format version decodes the same way, since marshal reads any dict.
+An older save is upgraded by the MIGRATIONS registered for each version
+after it, which edit the state dict, so no old format is ever parsed
+field by field (see add_playtime below).
+
+Writes go to a temporary file that is synced and then renamed over the
+save, so a crash leaves either the old save or the new one.
+
+Each save directory keeps an index of its slots (index.cvidx, the same
+header with magic b'CVIX' over a dict of slot -> summary: class, level,
+scene, playtime, save time), rewritten atomically after every save, so a
+load menu lists any number of slots from one small read. A missing or
+unreadable index is rebuilt from the saves themselves. Slot names are
+file names, so they are limited to letters, digits, '_' and '-'.
+
+    save_game(core, path)
+    load_game(core, path)
+    list_saves(save_dir)   # [(slot, summary), ...], newest first
+
+Usage:
+    python savegame.py            # Benchmark saving and loading
+    python savegame.py SAVE...    # Describe save files
+    python savegame.py --index    # List the slots in the save index
+"""
+
+import marshal
+import os
+import re
+import struct
+import sys
+import tempfile
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from encounter import Encounter
+from random_streams import RandomStreams
+from snapshot import SCALAR_FIELDS, SEQUENCE_FIELDS
+
+MAGIC = b'CVSV'
+SAVE_FORMAT = 2
+
+HEADER = struct.Struct('<4sHI')
+
+# Fastest zlib level; saves are a few kilobytes either way
+COMPRESSION_LEVEL = 1
+
+SAVE_DIR = Path(__file__).resolve().parent / 'saves'
+SAVE_SUFFIX = '.cvsav'
+QUICKSAVE = 'quicksave'
+
+# Slot names that stay inside the save directory, on any file system
+SLOT_NAME = re.compile(r'[A-Za-z0-9_-]+')
+
+INDEX_MAGIC = b'CVIX'
+INDEX_FORMAT = 1
+INDEX_NAME = 'index.cvidx'
+
+State = Dict[str, Any]
+Summary = Dict[str, Any]
+PathLike = Union[str, Path]
+
+# Format version -> function upgrading a state dict of that version to the next
+MIGRATIONS: Dict[int, Callable[[State], Optional[State]]] = {}
+
+# Serializes index updates from the UI and the autosave thread
+_index_lock = threading.Lock()
+
+
+class SaveFormatError(ValueError):
+    """Raised when data is not a save this version can load."""
+
+
+def migration(version: int) -> Callable:
+    """Register a function upgrading version's state dicts to version + 1"""
+    def register(upgrade: Callable[[State], Optional[State]]) -> Callable[[State], Optional[State]]:
+        if version in MIGRATIONS:
+            raise ValueError(f"Save format {version} already has a migration")
+        MIGRATIONS[version] = upgrade
+        return upgrade
+    return register
+
+
+@migration(1)
+def add_playtime(state: State) -> None:
+    """Version 1 -> 2: saves record how long the run has been played"""
+    state['playtime'] = 0.0
+
+
+def valid_slot(slot: str) -> bool:
+    """Whether a slot name is letters, digits, '_' and '-' only"""
+    return SLOT_NAME.fullmatch(slot) is not None
+
+
+def slot_path(slot: str = QUICKSAVE, save_dir: PathLike = SAVE_DIR) -> Path:
+    """Path of a named save slot; ValueError for a name valid_slot() rejects"""
+    if not valid_slot(slot):
+        raise ValueError(f"Invalid save slot name: {slot!r}")
+    return Path(save_dir) / f"{slot}{SAVE_SUFFIX}"
+
+
+def capture_state(core) -> State:
+    """Return the core's state as a dict of plain values"""
+    return {
+        'scalars': {name: getattr(core, name) for name in SCALAR_FIELDS},
+        'inventory': list(core.inventory),
+        'sequences': {name: list(getattr(core, name)) for name in SEQUENCE_FIELDS[1:]},
+        'unlocked': sorted(core.scene_state.unlocked),
+        'explored': sorted(core.scene_state.visited),
+        'encounter': core.encounter.getstate() if core.encounter is not None else None,
+        'streams': core.streams.getstate(),
+        'playtime': core.playtime,
+        'saved_at': time.time(),
+    }
+
+
+def restore_state(core, state: State) -> None:
+    """Put the core into a saved state; its undo history starts afresh
+
+    The whole state is decoded before the core is touched, so a malformed
+    save raises SaveFormatError and leaves the core as it was.
+    """
+    try:
+        scalars = {name: state['scalars'][name] for name in SCALAR_FIELDS}
+        inventory = list(state['inventory'])
+        sequences = {name: list(state['sequences'][name]) for name in SEQUENCE_FIELDS[1:]}
+        unlocked = set(state['unlocked'])
+        explored = set(state['explored'])
+        encounter = Encounter.from_state(state['encounter']) if state['encounter'] is not None else None
+        streams = RandomStreams.from_state(state['streams'])
+        playtime = float(state['playtime'])
+    except KeyError as e:
+        raise SaveFormatError(f"The save has no {e.args[0]!r} field") from None
+    except (TypeError, ValueError, AttributeError, IndexError) as e:
+        raise SaveFormatError(f"The save is malformed: {e}") from None
+    if scalars['player_character'] not in core.classes or scalars['current_scene'] not in core.scene_names:
+        raise SaveFormatError("The save refers to a class or scene this game does not have")
+    if not all(isinstance(name, str) for name in inventory):
+        raise SaveFormatError("The save lists an item that is not a name")
+
+    for name, value in scalars.items():
+        setattr(core, name, value)
+    core.inventory.replace(inventory)
+    for name, value in sequences.items():
+        setattr(core, name, value)
+    core.scene_state.unlocked = unlocked
+    core.scene_state.visited = explored
+    core.encounter = encounter
+    core.streams = streams
+    core.playtime = playtime
+    core.history.clear()
+
+
+def _pack(magic: bytes, version: int, value: Any, level: int = COMPRESSION_LEVEL) -> bytes:
+    payload = zlib.compress(marshal.dumps(value), level)
+    return HEADER.pack(magic, version, zlib.crc32(payload)) + payload
+
+
+def _unpack(data: bytes, magic: bytes, newest: int, what: str) -> Tuple[int, Any]:
+    """Check a header and decode the payload after it; return (version, value)"""
+    if len(data) < HEADER.size:
+        raise SaveFormatError(f"{what} is truncated")
+    found, version, checksum = HEADER.unpack_from(data)
+    if found != magic:
+        raise SaveFormatError(f"Not a {what.lower()}")
+    if version > newest:
+        raise SaveFormatError(f"{what} format {version} is newer than this game ({newest})")
+    payload = memoryview(data)[HEADER.size:]
+    if zlib.crc32(payload) != checksum:
+        raise SaveFormatError(f"{what} is corrupt")
+    try:
+        return version, marshal.loads(zlib.decompress(payload))
+    except (zlib.error, ValueError, EOFError, TypeError) as e:
+        raise SaveFormatError(f"{what} is corrupt: {e}") from None
+
+
+def encode(state: State, level: int = COMPRESSION_LEVEL) -> bytes:
+    """Encode a state dict as save file bytes; level 0 stores the payload uncompressed"""
+    return _pack(MAGIC, SAVE_FORMAT, state, level)
+
+
+def dumps(core) -> bytes:
+    """Encode the core's state as save file bytes"""
+    return encode(capture_state(core))
+
+
+def decode(data: bytes) -> State:
+    """Decode save file bytes into a current-format state dict"""
+    version, state = _unpack(data, MAGIC, SAVE_FORMAT, "Save file")
+    return migrate(state, version)
+
+
+def migrate(state: State, version: int) -> State:
+    """Upgrade a state dict of an older format version to the current one"""
+    while version < SAVE_FORMAT:
+        upgrade = MIGRATIONS.get(version)
+        if upgrade is None:
+            raise SaveFormatError(f"No migration from save format {version}")
+        upgraded = upgrade(state)
+        state = upgraded if upgraded is not None else state
+        version += 1
+    return state
+
+
+def write_atomic(path: PathLike, data: bytes) -> None:
+    """Replace a file's contents so a crash leaves the old or the new bytes, never a mix"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def summarize(state: State) -> Summary:
+    """Index entry of a save: what a load menu shows"""
+    scalars = state['scalars']
+    return {
+        'class': scalars['player_character'],
+        'level': scalars['player_level'],
+        'scene': scalars['current_scene'],
+        'health': scalars['player_health'],
+        'in_combat': scalars['game_state'] == "in_combat",
+        'playtime': state['playtime'],
+        'saved_at': state['saved_at'],
+    }
+
+
+def index_path(save_dir: PathLike = SAVE_DIR) -> Path:
+    """Path of a save directory's slot index"""
+    return Path(save_dir) / INDEX_NAME
+
+
+def rebuild_index(save_dir: PathLike = SAVE_DIR) -> Dict[str, Summary]:
+    """Summarize every readable save in a directory and write the index afresh"""
+    save_dir = Path(save_dir)
+    index = {}
+    for path in save_dir.glob(f"*{SAVE_SUFFIX}"):
+        try:
+            index[path.stem] = summarize(decode(path.read_bytes()))
+        except (OSError, SaveFormatError):
+            continue
+    if save_dir.is_dir():
+        write_atomic(index_path(save_dir), _pack(INDEX_MAGIC, INDEX_FORMAT, index))
+    return index
+
+
+def read_index(save_dir: PathLike = SAVE_DIR) -> Dict[str, Summary]:
+    """Every slot's summary from the index, rebuilding the index if it is missing or unreadable"""
+    try:
+        return _unpack(index_path(save_dir).read_bytes(), INDEX_MAGIC, INDEX_FORMAT, "Save index")[1]
+    except (OSError, SaveFormatError):
+        with _index_lock:
+            return rebuild_index(save_dir)
+
+
+def update_index(save_dir: PathLike, slot: str, summary: Optional[Summary]) -> None:
+    """Record a slot's summary in the index, or drop the slot if summary is None"""
+    with _index_lock:
+        try:
+            index = _unpack(index_path(save_dir).read_bytes(), INDEX_MAGIC, INDEX_FORMAT, "Save index")[1]
+        except (OSError, SaveFormatError):
+            index = rebuild_index(save_dir)
+        if summary is None:
+            index.pop(slot, None)
+        else:
+            index[slot] = summary
+        write_atomic(index_path(save_dir), _pack(INDEX_MAGIC, INDEX_FORMAT, index))
+
+
+def list_saves(save_dir: PathLike = SAVE_DIR) -> List[Tuple[str, Summary]]:
+    """The slots of a save directory with their summaries, most recently saved first"""
+    return sorted(read_index(save_dir).items(), key=lambda item: item[1]['saved_at'], reverse=True)
+
+
+def write_save(path: PathLike, state: State) -> None:
+    """Write a state to a save file atomically and record it in its directory's index"""
+    path = Path(path)
+    write_atomic(path, encode(state))
+    update_index(path.parent, path.stem, summarize(state))
+
+
+def delete_save(path: PathLike) -> None:
+    """Remove a save file and its index entry"""
+    path = Path(path)
+    path.unlink(missing_ok=True)
+    update_index(path.parent, path.stem, None)
+
+
+def save_game(core, path: Optional[PathLike] = None) -> Path:
+    """Save the core's state, to the quicksave slot by default; return the path written"""
+    path = Path(path) if path is not None else slot_path()
+    write_save(path, capture_state(core))
+    return path
+
+
+def load_game(core, path: Optional[PathLike] = None) -> State:
+    """Load a save into the core, from the quicksave slot by default; return the state loaded"""
+    path = Path(path) if path is not None else slot_path()
+    state = decode(path.read_bytes())
+    restore_state(core, state)
+    return state
+
+
+def benchmark(rounds: int = 500, steps: int = 60, slots: int = 300, seed: int = 7) -> Dict[str, float]:
+    """Time saving, loading and listing slots of a mid-game core; return milliseconds per operation and bytes"""
+    from game_core import GameCore
+
+    core = GameCore(seed=seed)
+    core.apply(('new_game', 'warrior'))
+    rng = core.streams.split(0).loot
+    for _ in range(steps):
+        choices = core.scene_choices.get(core.current_scene, ())
+        core.apply(('choose', rng.randint(1, max(1, len(choices)))))
+    with tempfile.TemporaryDirectory() as save_dir:
+        path = slot_path('benchmark', save_dir)
+        start = time.perf_counter()
+        for _ in range(rounds):
+            save_game(core, path)
+        save_ms = (time.perf_counter() - start) * 1000 / rounds
+        start = time.perf_counter()
+        for _ in range(rounds):
+            load_game(core, path)
+        load_ms = (time.perf_counter() - start) * 1000 / rounds
+        size = path.stat().st_size
+
+        for number in range(slots - 1):
+            save_game(core, slot_path(f"slot{number}", save_dir))
+        start = time.perf_counter()
+        listed = list_saves(save_dir)
+        list_ms = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        for slot_file in Path(save_dir).glob(f"*{SAVE_SUFFIX}"):
+            summarize(decode(slot_file.read_bytes()))
+        scan_ms = (time.perf_counter() - start) * 1000
+        assert len(listed) == slots
+    return {'save_ms': save_ms, 'load_ms': load_ms, 'bytes': size, 'slots': slots,
+            'list_ms': list_ms, 'scan_ms': scan_ms}
+
+
+def main(argv: List[str]) -> int:
+    """Benchmark saves, list the save index, or describe the save files given on the command line"""
+    if len(argv) < 2:
+        report = benchmark()
+        print(f"💾 Save: {report['save_ms']:.2f} ms, load: {report['load_ms']:.2f} ms, "
+              f"{report['bytes']:,} bytes per save")
+        print(f"📋 Listing {report['slots']} slots: {report['list_ms']:.2f} ms from the index, "
+              f"{report['scan_ms']:.2f} ms decoding every save")
+        return 0
+    if argv[1] == '--index':
+        for slot, summary in list_saves():
+            print(f"💾 {slot}: {summary['class']} level {summary['level']} in {summary['scene']}, "
+                  f"played {summary['playtime'] / 60:.0f} min, saved {time.ctime(summary['saved_at'])}")
+        return 0
+    for path in argv[1:]:
+        try:
+            state = decode(Path(path).read_bytes())
+        except (OSError, SaveFormatError) as e:
+            print(f"❌ {path}: {e}")
+            return 1
+        scalars = state['scalars']
+        print(f"💾 {path}: {scalars['player_character']} level {scalars['player_level']} in "
+              f"{scalars['current_scene']}, {len(state['inventory'])} items, seed {state['streams']['seed']}, "
+              f"saved {time.ctime(state['saved_at'])}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv))
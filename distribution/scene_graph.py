@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Cave Game Scene Graph Analytics
+
+Precomputes reachability, all-pairs shortest paths and lock-gated regions
+for the scene graph, so queries made during play are table lookups.
+
+Two graphs are built from content when it is compiled, and are stored in
+the content cache alongside everything else:
+    walk_graph   Only the north/south/east/west exits a player can walk
+    story_graph  Exits plus the scene changes triggered by choices
+
+The walk graph drives the "travel to" command and hints; the story graph
+drives content validation (unreachable scenes, dead ends).
+"""
+
+from collections import deque
+from itertools import combinations
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+# Effect ops that move the player without naming the scene in their args
+SCENE_EFFECTS = {
+    'advance_to_skull_chamber': 'skull_chamber',
+    'trigger_cave_in': 'cave_in',
+    'check_armory_access': 'armory',
+    'check_chiefs_house_access': 'chiefs_house',
+}
+
+# Scene the player starts in; reachability and key gating are measured from here
+START_SCENE = 'cave_entrance'
+
+Step = Tuple[str, str]  # (edge label, scene id)
+
+
+class SceneGraph:
+    """
+    Directed scene graph with precomputed analytics.
+
+    Scenes are numbered densely in content order. Reachability is stored as
+    one bitmask per scene, shortest paths as distance and first-hop tables,
+    and the key set needed to reach each scene from the start.
+
+    Attributes:
+        scene_ids (List[str]): Scene identifiers, indexed by scene number
+        index (Dict[str, int]): Scene identifier -> scene number
+        edges (Dict[str, Dict[str, str]]): Scene -> edge label -> target scene
+        locks (Dict[str, str]): Locked scene -> name of the key that opens it
+        start (str): Scene the player starts in
+    """
+    def __init__(self, scene_ids: List[str], edges: Dict[str, Dict[str, str]],
+                 locks: Dict[str, str], start: str = START_SCENE) -> None:
+        self.scene_ids = list(scene_ids)
+        self.index = {scene_id: i for i, scene_id in enumerate(self.scene_ids)}
+        self.edges = {scene_id: dict(edges.get(scene_id, {})) for scene_id in self.scene_ids}
+        self.locks = dict(locks)
+        self.start = start
+
+        count = len(self.scene_ids)
+        self._adjacency = [[(label, self.index[target]) for label, target in self.edges[scene_id].items()]
+                           for scene_id in self.scene_ids]
+        self._reach = [0] * count
+        self._distance = [[-1] * count for _ in range(count)]
+        self._first_step: List[List[Optional[Tuple[str, int]]]] = [[None] * count for _ in range(count)]
+        for source in range(count):
+            self._search_from(source)
+        self._required_keys = self._compute_required_keys()
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, SceneGraph):
+            return NotImplemented
+        return (self.scene_ids, self.edges, self.locks, self.start) == \
+            (other.scene_ids, other.edges, other.locks, other.start)
+
+    def _search_from(self, source: int) -> None:
+        """Breadth-first search filling the reach, distance and first-step rows"""
+        distance = self._distance[source]
+        first_step = self._first_step[source]
+        distance[source] = 0
+        queue = deque([source])
+        while queue:
+            node = queue.popleft()
+            for label, target in self._adjacency[node]:
+                if distance[target] < 0:
+                    distance[target] = distance[node] + 1
+                    first_step[target] = (label, target) if node == source else first_step[node]
+                    queue.append(target)
+        self._reach[source] = sum(1 << node for node, d in enumerate(distance) if d >= 0)
+
+    def _reachable_with(self, keys: FrozenSet[str]) -> int:
+        """Bitmask of scenes reachable from the start holding only keys"""
+        start = self.index[self.start]
+        seen = 1 << start
+        queue = deque([start])
+        while queue:
+            node = queue.popleft()
+            for _, target in self._adjacency[node]:
+                if seen >> target & 1:
+                    continue
+                key = self.locks.get(self.scene_ids[target])
+                if key is not None and key not in keys:
+                    continue
+                seen |= 1 << target
+                queue.append(target)
+        return seen
+
+    def _compute_required_keys(self) -> Dict[str, FrozenSet[str]]:
+        """Smallest key set needed to reach each scene from the start"""
+        if self.start not in self.index:
+            return {}
+        all_keys = sorted(set(self.locks.values()))
+        required = {}
+        # Key sets are tried smallest first, so the first hit is minimal
+        for size in range(len(all_keys) + 1):
+            for keys in combinations(all_keys, size):
+                keys = frozenset(keys)
+                reach = self._reachable_with(keys)
+                for node, scene_id in enumerate(self.scene_ids):
+                    if reach >> node & 1 and scene_id not in required:
+                        required[scene_id] = keys
+        return required
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+    def reachable(self, source: str, target: str) -> bool:
+        """Return True if target can be reached from source, ignoring locks"""
+        return bool(self._reach[self.index[source]] >> self.index[target] & 1)
+
+    def distance(self, source: str, target: str) -> Optional[int]:
+        """Return the number of steps on the shortest path, or None"""
+        distance = self._distance[self.index[source]][self.index[target]]
+        return distance if distance >= 0 else None
+
+    def next_step(self, source: str, target: str) -> Optional[Step]:
+        """Return the first (label, scene) step of a shortest path, or None"""
+        step = self._first_step[self.index[source]][self.index[target]]
+        return (step[0], self.scene_ids[step[1]]) if step else None
+
+    def path(self, source: str, target: str) -> Optional[List[Step]]:
+        """Return the (label, scene) steps of a shortest path, or None"""
+        if not self.reachable(source, target):
+            return None
+        steps = []
+        while source != target:
+            step = self.next_step(source, target)
+            steps.append(step)
+            source = step[1]
+        return steps
+
+    def required_keys(self, scene_id: str) -> Optional[FrozenSet[str]]:
+        """Return the keys needed to reach scene_id from the start, or None"""
+        return self._required_keys.get(scene_id)
+
+    def regions(self) -> Dict[FrozenSet[str], List[str]]:
+        """Group scenes by the key set that gates them"""
+        regions: Dict[FrozenSet[str], List[str]] = {}
+        for scene_id in self.scene_ids:
+            keys = self._required_keys.get(scene_id)
+            if keys is not None:
+                regions.setdefault(keys, []).append(scene_id)
+        return regions
+
+    def unreachable(self) -> List[str]:
+        """Return scenes that cannot be reached from the start with every key"""
+        return [scene_id for scene_id in self.scene_ids if scene_id not in self._required_keys]
+
+    def dead_ends(self) -> List[str]:
+        """Return scenes with no way out"""
+        return [scene_id for scene_id in self.scene_ids if not self.edges[scene_id]]
+
+    def validate(self) -> List[str]:
+        """Return human-readable problems with the graph"""
+        problems = [f"scene '{scene_id}' cannot be reached from '{self.start}'"
+                    for scene_id in self.unreachable()]
+        problems.extend(f"scene '{scene_id}' is a dead end" for scene_id in self.dead_ends())
+        return problems
+
+
+def walk_graph(scene_ids: List[str], scene_exits: Dict[str, Dict[str, str]],
+               scene_locks: Dict[str, Optional[str]]) -> SceneGraph:
+    """Build the graph of walkable exits"""
+    locks = {scene_id: key for scene_id, key in scene_locks.items() if key is not None}
+    return SceneGraph(scene_ids, scene_exits, locks)
+
+
+def story_graph(scene_ids: List[str], scene_exits: Dict[str, Dict[str, str]],
+                scene_locks: Dict[str, Optional[str]], scene_choices: Dict[str, List[Dict[str, Any]]],
+                consequences: Dict[str, Dict[str, Any]]) -> SceneGraph:
+    """Build the graph of exits plus the scene changes choices trigger"""
+    edges = {scene_id: dict(scene_exits.get(scene_id, {})) for scene_id in scene_ids}
+    for scene_id, choices in scene_choices.items():
+        for choice in choices:
+            consequence = consequences.get(choice['consequence'])
+            effect = consequence and consequence['effect']
+            if not effect:
+                continue
+            op, args = effect
+            target = args[0] if op == 'advance_to_scene' else SCENE_EFFECTS.get(op)
+            if target in edges:
+                edges[scene_id][f"choice:{choice['consequence']}"] = target
+    locks = {scene_id: key for scene_id, key in scene_locks.items() if key is not None}
+    return SceneGraph(scene_ids, edges, locks)
@@ -9,10 +9,92 @@ This module handles the game world structure including:
 - World state management
 
 The scene system creates an interconnected game world with proper progression gates.
+
+Scene definitions are immutable SceneTemplates built once when content is
+compiled and shared by every run and session. What changes during a run
+(unlocked doors, visited scenes) lives in a small per-run SceneOverlay.
 """
 
-from typing import Optional, Dict
-from config import SCENE_NAMES
+from types import MappingProxyType
+from typing import Optional, Dict, Mapping
+
+
+class SceneTemplate:
+    """
+    Immutable scene definition shared by every run.
+
+    Attributes:
+        scene_id (str): Content identifier of the scene
+        name (str): Display name of the scene
+        description (str): Descriptive text for the location
+        exits (Mapping[str, str]): Read-only map of directions to scene identifiers
+        key (Optional[str]): Name of the key item that unlocks the scene, if locked
+    """
+    __slots__ = ('scene_id', 'name', 'description', 'exits', 'key')
+
+    def __init__(self, scene_id: str, name: str, description: str,
+                 exits: Optional[Dict[str, str]] = None, key: Optional[str] = None) -> None:
+        object.__setattr__(self, 'scene_id', scene_id)
+        object.__setattr__(self, 'name', name)
+        object.__setattr__(self, 'description', description)
+        object.__setattr__(self, 'exits', MappingProxyType(dict(exits or {})))
+        object.__setattr__(self, 'key', key)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"SceneTemplate is immutable; cannot set '{name}'")
+
+    def __reduce__(self):
+        return (SceneTemplate, (self.scene_id, self.name, self.description, dict(self.exits), self.key))
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, SceneTemplate):
+            return NotImplemented
+        return self.__reduce__()[1] == other.__reduce__()[1]
+
+    def __hash__(self) -> int:
+        return hash(self.scene_id)
+
+    def __repr__(self) -> str:
+        return f"SceneTemplate({self.scene_id!r})"
+
+
+class SceneOverlay:
+    """
+    Per-run scene state layered over the shared templates.
+
+    Attributes:
+        templates (Mapping[str, SceneTemplate]): Shared scene definitions
+        unlocked (set): Identifiers of locked scenes opened this run
+        visited (set): Identifiers of scenes entered this run
+    """
+    __slots__ = ('templates', 'unlocked', 'visited')
+
+    def __init__(self, templates: Mapping[str, SceneTemplate]) -> None:
+        self.templates = templates
+        self.unlocked = set()
+        self.visited = set()
+
+    def reset(self) -> None:
+        """Forget everything that happened in the previous run"""
+        self.unlocked.clear()
+        self.visited.clear()
+
+    def is_locked(self, scene_id: str) -> bool:
+        """Return True if the scene is locked and has not been opened this run"""
+        return self.templates[scene_id].key is not None and scene_id not in self.unlocked
+
+    def unlock(self, scene_id: str) -> None:
+        """Open a locked scene for the rest of the run"""
+        self.unlocked.add(scene_id)
+
+
+def build_scene_templates(scene_names: Dict[str, str], scene_descriptions: Dict[str, str],
+                          scene_exits: Dict[str, Dict[str, str]],
+                          scene_locks: Dict[str, Optional[str]]) -> Dict[str, SceneTemplate]:
+    """Build the shared scene templates, keyed by scene identifier"""
+    return {scene_id: SceneTemplate(scene_id, name, scene_descriptions[scene_id],
+                                    scene_exits[scene_id], scene_locks[scene_id])
+            for scene_id, name in scene_names.items()}
 
 
 class Scene:
@@ -25,14 +107,16 @@ class Scene:
         exits (Dict[str, str]): Available exits mapping directions to scene names
         locked (bool): Whether this scene requires a key
         key (Optional[str]): Name of the key item required for access
+        scene_id (Optional[str]): Content identifier of the scene, if any
     """
     def __init__(self, name: str, description: str, exits: Optional[Dict[str, str]] = None, 
-                 locked: bool = False, key: Optional[str] = None) -> None:
+                 locked: bool = False, key: Optional[str] = None, scene_id: Optional[str] = None) -> None:
         self.name = name
         self.description = description
         self.exits = exits or {}  # e.g., {'north': 'Engineering Bay'}
         self.locked = locked
         self.key = key  # name of key that unlocks
+        self.scene_id = scene_id
 
     def enter(self, player) -> bool:
         """Attempt to enter the scene, checking for locks and keys."""
@@ -50,91 +134,29 @@ class Scene:
         else:
             print("You can't unlock this door.")
 
-def setup_scenes():
-    """Set up all game scenes with proper exits and connections"""
-    scenes = {}
-    
-    # Cave Entrance
-    cave_entrance = Scene(
-        name=SCENE_NAMES['CAVE_ENTRANCE'], 
-        description="You find yourself in a dark cave with only a crack in the wall visible.",
-        exits={'north': SCENE_NAMES['SKULL_CHAMBER']}
-    )
-    scenes[SCENE_NAMES['CAVE_ENTRANCE']] = cave_entrance
-    
-    # Skull Chamber
-    skull_chamber = Scene(
-        name=SCENE_NAMES['SKULL_CHAMBER'], 
-        description="A vast chamber dominated by a colossal skull.",
-        exits={
-            'south': SCENE_NAMES['CAVE_ENTRANCE'],
-            'west': SCENE_NAMES['PRIMITIVE_VILLAGE']
-        }
-    )
-    scenes[SCENE_NAMES['SKULL_CHAMBER']] = skull_chamber
-    
-    # Primitive Village
-    primitive_village = Scene(
-        name=SCENE_NAMES['PRIMITIVE_VILLAGE'], 
-        description="The heart of a primitive village with bone and hide huts.",
-        exits={
-            'east': SCENE_NAMES['SKULL_CHAMBER'],
-            'north': SCENE_NAMES['ALLEY'],
-            'south': SCENE_NAMES['CHIEF_HOUSE'],
-            'west': SCENE_NAMES['ARMORY']
-        }
-    )
-    scenes[SCENE_NAMES['PRIMITIVE_VILLAGE']] = primitive_village
-    
-    # Alley
-    alley = Scene(
-        name=SCENE_NAMES['ALLEY'], 
-        description="A narrow, shadowy alley between ancient stone walls.",
-        exits={'south': SCENE_NAMES['PRIMITIVE_VILLAGE']}
-    )
-    scenes[SCENE_NAMES['ALLEY']] = alley
+def setup_scenes(content=None):
+    """Set up all game scenes with proper exits and connections.
     
-    # Armory (locked by default)
-    armory = Scene(
-        name=SCENE_NAMES['ARMORY'], 
-        description="An ancient armory containing enhanced weapons.",
-        exits={'east': SCENE_NAMES['PRIMITIVE_VILLAGE']},
-        locked=True,
-        key="Armory Key"
-    )
-    scenes[SCENE_NAMES['ARMORY']] = armory
-    
-    # Cave People Chief House (locked by default)
-    chief_house = Scene(
-        name=SCENE_NAMES['CHIEF_HOUSE'], 
-        description="The imposing dwelling of the tribal chief.",
-        exits={
-            'north': SCENE_NAMES['PRIMITIVE_VILLAGE'],
-            'south': SCENE_NAMES['HEALING_POOL']
-        },
-        locked=True,
-        key="Town Key"
-    )
-    scenes[SCENE_NAMES['CHIEF_HOUSE']] = chief_house
-    
-    # Healing Pool
-    healing_pool = Scene(
-        name=SCENE_NAMES['HEALING_POOL'], 
-        description="A sacred chamber with mystical healing waters.",
-        exits={
-            'north': SCENE_NAMES['CHIEF_HOUSE'],
-            'south': SCENE_NAMES['VILLAGE_CHANGED']
-        }
-    )
-    scenes[SCENE_NAMES['HEALING_POOL']] = healing_pool
+    Builds mutable Scene objects from the shared templates, keyed by display
+    name; exits map directions to the display names of their targets. The
+    game core uses the templates and a SceneOverlay directly instead.
+    """
+    if content is None:
+        from content import load_content
+        content = load_content()
+    templates = content['scene_templates']
+    scenes = {}
     
-    # Primitive Village Changed (post-blessing)
-    village_changed = Scene(
-        name=SCENE_NAMES['VILLAGE_CHANGED'], 
-        description="The village after the cosmic awakening.",
-        exits={'north': SCENE_NAMES['HEALING_POOL']}
-    )
-    scenes[SCENE_NAMES['VILLAGE_CHANGED']] = village_changed
+    for template in templates.values():
+        scene = Scene(
+            name=template.name,
+            description=template.description,
+            exits={direction: templates[target].name for direction, target in template.exits.items()},
+            locked=template.key is not None,
+            key=template.key,
+            scene_id=template.scene_id
+        )
+        scenes[template.name] = scene
     
     return scenes
 
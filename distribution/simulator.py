@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+Cave Game Combat Simulator
+
+Monte Carlo simulation of fights against one enemy, vectorized with NumPy so that
+millions of fights run as batched array operations. The rules are those of
+GameCore's combat skills:
+
+    basic_attack  hit or critical hit damage from the shared damage tables
+                  (damage_tables.py); critical with critical_chance
+    defend        enemy attacks until the player's next turn are multiplied
+                  by (1 - damage_reduction) and truncated to an int
+    run           escapes with success_chance
+    enemy turn    random.randint(*enemy damage range) damage
+
+Every fight starts with the class's health against an enemy profile from
+config.ENEMY_PROFILES (the alley creature by default). Turns follow
+GameCore's initiative order (encounter.lone_enemy_turns): an enemy faster
+than the player may act before its first turn and twice between two of
+its turns, a slower one skips some of them. The player picks a skill each turn
+according to a policy: a skill key, or a mapping of skill keys to weights.
+
+Random numbers come from RandomStreams (random_streams.py): each batch
+draws from its own combat, escape and policy generators, and every cell of
+simulate_matrix() uses an independent split, so any cell can be re-run
+alone from the seed and its index.
+
+NumPy is optional for the rest of the game; only this module needs it.
+
+Usage:
+    python simulator.py [fights]   # Simulate every class with each of its weapons
+"""
+
+import sys
+import time
+from typing import Any, Dict, List, Mapping, Optional, Tuple, Union
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without numpy
+    np = None
+
+from config import ENEMY_PROFILES, PLAYER_SPEED
+from content import load_content
+from encounter import lone_enemy_turns
+from random_streams import RandomStreams
+
+# Fight outcomes
+ONGOING = 0
+WON = 1
+ESCAPED = 2
+DEFEATED = 3
+
+OUTCOME_NAMES = {WON: 'won', ESCAPED: 'escaped', DEFEATED: 'defeated', ONGOING: 'unfinished'}
+
+# Enemy fought when no profile is given
+DEFAULT_ENEMY = 'ground_dwelling_creature'
+
+# Order of skills in a policy's probability vector
+SKILL_ORDER = ('basic_attack', 'defend', 'run')
+
+Policy = Union[str, Mapping[str, float]]
+
+
+def _require_numpy() -> None:
+    """Raise a helpful error when NumPy is not installed"""
+    if np is None:
+        raise ImportError("The combat simulator needs NumPy: pip install numpy")
+
+
+def parse_policy(text: str) -> Policy:
+    """Parse 'basic_attack' or 'basic_attack=0.6,defend=0.2,run=0.2'"""
+    if '=' not in text:
+        return text
+    weights = {}
+    for part in text.split(','):
+        skill, _, weight = part.partition('=')
+        weights[skill.strip()] = float(weight)
+    return weights
+
+
+def _policy_weights(policy: Policy, skills: Mapping[str, Any]):
+    """Return the policy as probabilities over SKILL_ORDER"""
+    weights = {policy: 1.0} if isinstance(policy, str) else dict(policy)
+    unknown = [skill for skill in weights if skill not in skills]
+    if unknown:
+        raise ValueError(f"Policy uses skills this class does not have: {', '.join(unknown)}")
+    probabilities = np.array([weights.get(skill, 0.0) for skill in SKILL_ORDER], dtype=float)
+    if probabilities.sum() <= 0:
+        raise ValueError("Policy must give some skill a positive weight")
+    return probabilities / probabilities.sum()
+
+
+class CombatStats:
+    """
+    Per-fight results of one batch of simulated fights.
+
+    Attributes:
+        class_key (str): Class that fought
+        weapon (str): Weapon the class attacked with
+        outcome (np.ndarray): WON, ESCAPED, DEFEATED or ONGOING per fight
+        turns (np.ndarray): Player actions taken per fight
+        damage_taken (np.ndarray): Health lost per fight
+    """
+    def __init__(self, class_key: str, weapon: str, outcome, turns, damage_taken) -> None:
+        self.class_key = class_key
+        self.weapon = weapon
+        self.outcome = outcome
+        self.turns = turns
+        self.damage_taken = damage_taken
+
+    @property
+    def fights(self) -> int:
+        return len(self.outcome)
+
+    def rate(self, outcome: int) -> float:
+        """Fraction of fights that ended with outcome"""
+        return float(np.count_nonzero(self.outcome == outcome)) / self.fights
+
+    @property
+    def win_rate(self) -> float:
+        return self.rate(WON)
+
+    def turns_to_kill(self) -> Dict[int, int]:
+        """Histogram of turns taken by the fights that were won"""
+        counts = np.bincount(self.turns[self.outcome == WON])
+        return {turns: int(count) for turns, count in enumerate(counts) if count}
+
+    def damage_distribution(self, percentiles=(5, 25, 50, 75, 95)) -> Dict[int, float]:
+        """Percentiles of health lost per fight"""
+        values = np.percentile(self.damage_taken, percentiles)
+        return {p: float(v) for p, v in zip(percentiles, values)}
+
+    def summary(self) -> Dict[str, Any]:
+        """Headline numbers for reports"""
+        won = self.outcome == WON
+        return {
+            'class': self.class_key,
+            'weapon': self.weapon,
+            'fights': self.fights,
+            'win_rate': self.win_rate,
+            'escape_rate': self.rate(ESCAPED),
+            'defeat_rate': self.rate(DEFEATED),
+            'mean_turns_to_kill': float(self.turns[won].mean()) if won.any() else None,
+            'mean_damage_taken': float(self.damage_taken.mean()),
+        }
+
+
+def simulate(class_key: str, fights: int = 100000, weapon: Optional[str] = None,
+             policy: Policy = 'basic_attack', content: Optional[Dict[str, Any]] = None,
+             seed: Optional[int] = None, max_turns: int = 200,
+             streams: Optional[RandomStreams] = None, stat_value: Optional[int] = None,
+             enemy: Optional[Dict[str, Any]] = None) -> CombatStats:
+    """Simulate fights for one class and weapon and return their results
+
+    stat_value overrides the class's damage stat; enemy is a profile like
+    those in config.ENEMY_PROFILES.
+    """
+    _require_numpy()
+    content = content if content is not None else load_content()
+    class_data = content['classes'][class_key]
+    weapon = weapon or class_data['starting_weapon']
+    skills = class_data['combat_skills']
+    probabilities = _policy_weights(policy, skills)
+    streams = streams if streams is not None else RandomStreams(seed)
+    combat_rng, escape_rng, policy_rng = (np.random.default_rng(streams.derive(name))
+                                          for name in ('combat', 'escape', 'policy'))
+
+    hit = critical_hit = 0
+    critical_chance = 0.0
+    attack = skills.get('basic_attack')
+    if attack is not None:
+        tables = content['damage_tables']
+        stat = tables.class_stat[class_key]
+        if stat_value is None:
+            stat_value = class_data[stat] if stat else 0
+        hit, critical_hit = tables.lookup(class_key, weapon, stat_value)
+        critical_chance = attack.get('critical_chance', 0.0)
+    reduction = skills['defend']['damage_reduction'] if 'defend' in skills else 0.0
+    success_chance = skills['run']['success_chance'] if 'run' in skills else 0.0
+    enemy = enemy if enemy is not None else ENEMY_PROFILES[DEFAULT_ENEMY]
+    low, high = enemy['damage']
+    opening, cycle = lone_enemy_turns(PLAYER_SPEED, enemy.get('speed', PLAYER_SPEED))
+
+    outcome = np.zeros(fights, dtype=np.int8)
+    turns = np.zeros(fights, dtype=np.int32)
+    damage_taken = np.zeros(fights, dtype=np.int32)
+    enemy_health = np.full(fights, enemy['health'], dtype=np.int32)
+    player_health = np.full(fights, class_data['health'], dtype=np.int32)
+    defending = np.zeros(fights, dtype=bool)
+
+    def enemy_attack(active):
+        """One enemy turn in every fight still going; return the fights still going after it"""
+        enemy_damage = combat_rng.integers(low, high + 1, size=active.size)
+        guarded = defending[active]
+        if guarded.any():
+            enemy_damage[guarded] = (enemy_damage[guarded] * (1 - reduction)).astype(np.int64)
+        health = player_health[active]
+        damage_taken[active] += np.minimum(health, enemy_damage).astype(np.int32)
+        player_health[active] = np.maximum(0, health - enemy_damage)
+        outcome[active[player_health[active] <= 0]] = DEFEATED
+        return active[outcome[active] == ONGOING]
+
+    # Every fight still going has taken the same number of turns, so all
+    # of them see the same number of enemy turns between two of the player's
+    active = np.arange(fights)
+    for _ in range(opening):
+        active = enemy_attack(active)
+    for turn in range(max_turns):
+        if not active.size:
+            break
+        turns[active] += 1
+        choice = policy_rng.choice(len(SKILL_ORDER), size=active.size, p=probabilities)
+
+        # Player action; a defense lasts until the player's next turn
+        attackers = active[choice == 0]
+        if attackers.size:
+            damage = np.full(attackers.size, hit, dtype=np.int32)
+            if critical_chance:
+                damage[combat_rng.random(attackers.size) < critical_chance] = critical_hit
+            enemy_health[attackers] -= damage
+            outcome[attackers[enemy_health[attackers] <= 0]] = WON
+        defending[active] = choice == 1
+        runners = active[choice == 2]
+        if runners.size:
+            outcome[runners[escape_rng.random(runners.size) < success_chance]] = ESCAPED
+        active = active[outcome[active] == ONGOING]
+
+        for _ in range(cycle[turn % len(cycle)]):
+            if not active.size:
+                break
+            active = enemy_attack(active)
+
+    return CombatStats(class_key, weapon, outcome, turns, damage_taken)
+
+
+def matrix_cells(content: Dict[str, Any]) -> List[Tuple[str, str]]:
+    """Return every (class, weapon) pair of the balance matrix, in a stable order
+
+    Any class can wield any weapon (see GameCore.equip), not only the ones
+    made for it.
+    """
+    return [(class_key, weapon) for class_key in content['classes'] for weapon in content['weapons']]
+
+
+def simulate_matrix(fights: int = 100000, policy: Policy = 'basic_attack',
+                    content: Optional[Dict[str, Any]] = None, seed: Optional[int] = None) -> List[CombatStats]:
+    """Simulate every class with every weapon"""
+    _require_numpy()
+    content = content if content is not None else load_content()
+    streams = RandomStreams(seed)
+    return [simulate(class_key, fights, weapon, policy, content, streams=streams.split(index))
+            for index, (class_key, weapon) in enumerate(matrix_cells(content))]
+
+
+def main(argv: List[str]) -> int:
+    """Print win rates, turns-to-kill and damage taken for the whole matrix"""
+    fights = int(argv[1]) if len(argv) > 1 else 1000000
+    try:
+        _require_numpy()
+    except ImportError as e:
+        print(f"❌ {e}")
+        return 1
+    start = time.perf_counter()
+    results = simulate_matrix(fights, seed=1)
+    elapsed = time.perf_counter() - start
+
+    print(f"{'Class':<8} {'Weapon':<17} {'Win':>7} {'Escape':>7} {'Defeat':>7} {'Turns':>6} {'Damage p50/p95':>15}")
+    for stats in results:
+        summary = stats.summary()
+        damage = stats.damage_distribution((50, 95))
+        turns = summary['mean_turns_to_kill']
+        print(f"{stats.class_key:<8} {stats.weapon:<17} {summary['win_rate']:>7.1%} "
+              f"{summary['escape_rate']:>7.1%} {summary['defeat_rate']:>7.1%} "
+              f"{turns if turns is not None else float('nan'):>6.2f} {damage[50]:>7.0f}/{damage[95]:<7.0f}")
+    total = fights * len(results)
+    print(f"⚔️  Simulated {total:,} fights in {elapsed:.2f}s ({total / elapsed:,.0f} fights/second)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv))
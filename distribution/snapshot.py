@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Cave Game Snapshots and Undo History
+
+A snapshot is an immutable tuple holding every piece of GameCore state a
+player action can change. Snapshots share structure: scalar values are
+referenced rather than copied, and a list that did not change since the
+previous snapshot (inventory, visited scenes, ...) reuses the previous
+snapshot's tuple. A run of history therefore costs one small tuple per
+action plus whatever actually changed. The encounter of a fight in
+progress is copied, sharing its stat blocks (see Encounter.copy).
+
+    history = History(depth=50)
+    history.push(core)           # before an action
+    snapshot = history.rewind()  # undo it
+    restore(core, snapshot)
+"""
+
+import sys
+from collections import deque
+from operator import attrgetter
+from typing import Any, Dict, Optional, Tuple
+
+# Immutable GameCore attributes, captured by reference
+SCALAR_FIELDS = (
+    'player_character', 'player_health', 'player_strength', 'player_agility',
+    'player_intelligence', 'player_defense', 'player_max_health', 'player_weapon', 'player_ability', 'player_level',
+    'player_experience', 'equipped_weapon', 'equipped_armor', 'current_scene',
+    'game_state', 'progress_bits', 'encounter_key', 'combat_enemy', 'combat_enemy_health',
+    'combat_turn', 'defending', 'defense_reduction'
+)
+
+# List attributes, captured as tuples in this order
+SEQUENCE_FIELDS = ('inventory', 'equipped_accessories', 'visited_scenes', 'available_combat_skills')
+
+_get_scalars = attrgetter(*SCALAR_FIELDS)
+
+# (scalars, inventory, accessories, visited scenes, combat skills, unlocked scenes, explored scenes, encounter)
+Snapshot = Tuple[Any, ...]
+
+
+def capture(core, previous: Optional[Snapshot] = None) -> Snapshot:
+    """Capture the core's state, sharing unchanged parts with previous"""
+    scalars = _get_scalars(core)
+    inventory = core.inventory.id_tuple()
+    accessories = tuple(core.equipped_accessories)
+    visited = tuple(core.visited_scenes)
+    skills = tuple(core.available_combat_skills)
+    unlocked = frozenset(core.scene_state.unlocked)
+    explored = frozenset(core.scene_state.visited)
+    encounter = core.encounter
+    if previous is None:
+        if encounter is not None:
+            encounter = encounter.copy()
+        return (scalars, inventory, accessories, visited, skills, unlocked, explored, encounter)
+
+    # Reuse every part that did not change
+    (old_scalars, old_inventory, old_accessories, old_visited, old_skills, old_unlocked, old_explored,
+     old_encounter) = previous
+    return (old_scalars if scalars == old_scalars else scalars,
+            old_inventory if inventory == old_inventory else inventory,
+            old_accessories if accessories == old_accessories else accessories,
+            old_visited if visited == old_visited else visited,
+            old_skills if skills == old_skills else skills,
+            old_unlocked if unlocked == old_unlocked else unlocked,
+            old_explored if explored == old_explored else explored,
+            old_encounter if encounter == old_encounter else encounter and encounter.copy())
+
+
+def restore(core, snapshot: Snapshot) -> None:
+    """Put the core back into the state recorded by snapshot"""
+    scalars, inventory, *sequences, unlocked, explored, encounter = snapshot
+    for name, value in zip(SCALAR_FIELDS, scalars):
+        setattr(core, name, value)
+    core.inventory.replace_ids(inventory)
+    for name, value in zip(SEQUENCE_FIELDS[1:], sequences):
+        setattr(core, name, list(value))
+    core.scene_state.unlocked = set(unlocked)
+    core.scene_state.visited = set(explored)
+    core.encounter = encounter.copy() if encounter is not None else None
+
+
+class History:
+    """
+    Bounded undo history of snapshots, newest last.
+
+    Attributes:
+        depth (int): Maximum number of snapshots kept; 0 disables undo
+    """
+    def __init__(self, depth: int) -> None:
+        self.depth = depth
+        self._snapshots = deque(maxlen=depth)
+
+    def __len__(self) -> int:
+        return len(self._snapshots)
+
+    def clear(self) -> None:
+        """Forget every snapshot"""
+        self._snapshots.clear()
+
+    def push(self, core) -> Optional[Snapshot]:
+        """Record the core's current state and return the snapshot"""
+        if not self.depth:
+            return None
+        previous = self._snapshots[-1] if self._snapshots else None
+        snapshot = capture(core, previous)
+        self._snapshots.append(snapshot)
+        return snapshot
+
+    def discard_if_unchanged(self, core) -> None:
+        """Drop the newest snapshot if the action after it changed nothing"""
+        if self._snapshots and capture(core, self._snapshots[-1]) == self._snapshots[-1]:
+            self._snapshots.pop()
+
+    def rewind(self, steps: int = 1) -> Optional[Snapshot]:
+        """Pop up to steps snapshots and return the oldest one popped"""
+        snapshot = None
+        for _ in range(min(steps, len(self._snapshots))):
+            snapshot = self._snapshots.pop()
+        return snapshot
+
+    def memory_report(self) -> Dict[str, int]:
+        """Report the container memory held by the history
+
+        Strings and numbers inside the snapshots are shared with the game
+        content and the live core, so only the snapshot containers count.
+        """
+        seen = set()
+        shared_bytes = 0
+        copied_bytes = 0
+        for snapshot in self._snapshots:
+            for part in (snapshot,) + snapshot:
+                size = sys.getsizeof(part)
+                copied_bytes += size
+                if id(part) not in seen:
+                    seen.add(id(part))
+                    shared_bytes += size
+        return {
+            'snapshots': len(self._snapshots),
+            'depth': self.depth,
+            'bytes': shared_bytes,
+            'bytes_without_sharing': copied_bytes
+        }
@@ -33,6 +33,20 @@ def title_screen():
         else:
             print("Invalid choice. Please enter 1 or 2.")
 
+def choose_class(classes):
+    """Display the playable classes and return the chosen class key"""
+    class_keys = list(classes)
+
+    print()
+    print("Choose your class:")
+    for i, class_key in enumerate(class_keys, 1):
+        class_data = classes[class_key]
+        print(f"{i}: {class_data['name']} ({class_data['starting_weapon']}) - {class_data['description']}")
+
+    valid_choices = [str(i) for i in range(1, len(class_keys) + 1)] + class_keys
+    choice = get_user_choice("Enter the number of your class: ", valid_choices)
+    return class_keys[int(choice) - 1] if choice.isdigit() else choice
+
 def display_weapon_choices(player, context="battle"):
     """Display weapon choices and return selected weapon."""
     from combat import get_available_weapons
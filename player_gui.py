@@ -4,14 +4,215 @@ PLAYER GUI - Linear Gameplay Experience
 =====================================
 A player-focused GUI that provides linear, progressive gameplay
 instead of the development sandbox.
+
+The game rules live in distribution/game_core.py; this window only turns
+clicks and typed choices into core actions. The core publishes events on
+an EventBus that flushes once per Tk frame, so a burst of state changes
+redraws the canvas and rewrites the scene text only once.
+
+Every action that changes the game is journaled to the autosave slot by a
+background thread (distribution/autosave.py), so the window never waits
+on the disk and "Continue" resumes a run that was closed or crashed.
 """
 
 import tkinter as tk
 from tkinter import messagebox, ttk
 import os
+import time
 from PIL import Image, ImageTk
-import random
-import json
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'distribution'))
+from game_core import GameCore, MESSAGE, SCENE, DISPLAY, INVENTORY
+from autosave import AUTOSAVE, Autosaver
+from savegame import list_saves
+from event_bus import EventBus
+from equipment import EQUIPMENT_CATEGORIES
+from inventory_view import COLUMNS, InventoryRows
+
+
+class VirtualTree:
+    """
+    ttk.Treeview over an InventoryRows model that only materializes visible rows.
+
+    The tree holds a fixed pool of `height` items; scrolling rewrites their
+    values from the model instead of inserting a tree item per row, so
+    opening and scrolling cost the same for ten rows or ten thousand.
+    """
+    def __init__(self, parent, rows, height=14):
+        self.rows = rows
+        self.height = height
+        self.top = 0
+        self.frame = tk.Frame(parent, bg='#2a2a2a')
+        self.tree = ttk.Treeview(self.frame, columns=COLUMNS, show='headings',
+                                 height=height, selectmode='browse')
+        for column, width in zip(COLUMNS, (170, 90, 60, 220)):
+            self.tree.heading(column, text=column.title())
+            self.tree.column(column, width=width, stretch=column == 'details',
+                             anchor=tk.E if column == 'count' else tk.W)
+        self.scrollbar = ttk.Scrollbar(self.frame, orient=tk.VERTICAL, command=self.scroll)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.slots = [self.tree.insert('', tk.END) for _ in range(height)]
+        self.attached = height
+        for sequence in ('<MouseWheel>', '<Button-4>', '<Button-5>'):
+            self.tree.bind(sequence, self.on_wheel)
+        
+    def scroll(self, *args):
+        """Scrollbar command: ('moveto', fraction) or ('scroll', n, 'units' | 'pages')"""
+        if args[0] == 'moveto':
+            self.scroll_to(int(float(args[1]) * len(self.rows)))
+        else:
+            step = int(args[1]) * (self.height if args[2] == 'pages' else 1)
+            self.scroll_to(self.top + step)
+            
+    def on_wheel(self, event):
+        """Scroll three rows per wheel notch"""
+        down = event.num == 5 or getattr(event, 'delta', 0) < 0
+        self.scroll_to(self.top + (3 if down else -3))
+        return 'break'
+        
+    def focused_row(self):
+        """Model index of the focused row, or None"""
+        focus = self.tree.focus()
+        if focus not in self.slots[:self.attached]:
+            return None
+        return self.top + self.slots.index(focus)
+        
+    def scroll_to(self, top):
+        """Show the rows from index top"""
+        top = max(0, min(top, len(self.rows) - self.height))
+        if top != self.top:
+            self.top = top
+            self.redraw_from(top)
+            
+    def redraw_from(self, first=0):
+        """Rewrite the visible rows at or after row index first"""
+        total = len(self.rows)
+        top = max(0, min(self.top, total - self.height))
+        if top != self.top:
+            self.top = first = top
+        start = max(first, top)
+        for offset, values in enumerate(self.rows.window(start, top + self.height - start), start - top):
+            self.tree.item(self.slots[offset], values=values)
+        # Detach pool items past the last row so no blank rows show
+        visible = min(self.height, total - top)
+        for index in range(visible, self.attached):
+            self.tree.detach(self.slots[index])
+        for index in range(self.attached, visible):
+            self.tree.move(self.slots[index], '', index)
+        self.attached = visible
+        if total > self.height:
+            self.scrollbar.set(top / total, (top + self.height) / total)
+        else:
+            self.scrollbar.set(0, 1)
+
+
+class InventoryWindow:
+    """
+    The Inventory & Stats window, built once and then hidden and shown.
+
+    The inventory and equipment lists are VirtualTrees whose rows follow
+    the core's INVENTORY events, so only rows that changed and are on
+    screen are redrawn.
+    """
+    def __init__(self, root, core):
+        self.core = core
+        self.visible = False
+        self.window = tk.Toplevel(root)
+        self.window.title("Inventory & Stats")
+        self.window.geometry("600x500")
+        self.window.configure(bg='#1a1a1a')
+        self.window.transient(root)
+        self.window.protocol("WM_DELETE_WINDOW", self.hide)
+        
+        # Title
+        title = tk.Label(self.window, text="Inventory & Character Stats", 
+                        font=('Arial', 16, 'bold'), fg='#00ff88', bg='#1a1a1a')
+        title.pack(pady=15)
+        
+        # Create notebook for tabs
+        notebook = ttk.Notebook(self.window)
+        notebook.pack(fill=tk.BOTH, expand=True, padx=15, pady=10)
+        
+        # Stats tab
+        stats_frame = tk.Frame(notebook, bg='#2a2a2a')
+        notebook.add(stats_frame, text="Stats")
+        self.stats_label = tk.Label(stats_frame, fg='#cccccc', bg='#2a2a2a', font=('Arial', 12), 
+                                    justify=tk.LEFT)
+        self.stats_label.pack(pady=20)
+        
+        # Inventory tab
+        inv_frame = tk.Frame(notebook, bg='#2a2a2a')
+        notebook.add(inv_frame, text="Inventory")
+        self.inventory_rows = InventoryRows(core.inventory)
+        self.inventory_tree = VirtualTree(inv_frame, self.inventory_rows)
+        self.inventory_tree.frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        
+        # Equipment tab
+        equip_frame = tk.Frame(notebook, bg='#2a2a2a')
+        notebook.add(equip_frame, text="Equipment")
+        self.equipped_label = tk.Label(equip_frame, fg='#cccccc', bg='#2a2a2a', font=('Arial', 10), 
+                                       justify=tk.LEFT, wraplength=500)
+        self.equipped_label.pack(pady=10)
+        self.equipment_rows = InventoryRows(core.inventory, EQUIPMENT_CATEGORIES)
+        self.equipment_tree = VirtualTree(equip_frame, self.equipment_rows, height=8)
+        self.equipment_tree.frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        self.equipment_tree.tree.bind('<Double-1>', self.toggle_equipment)
+        tk.Label(equip_frame, text="Double-click an item to equip or take it off", 
+                 fg='#888888', bg='#2a2a2a', font=('Arial', 9)).pack()
+        
+        # Close button
+        close_btn = tk.Button(self.window, text="Close", 
+                             command=self.hide,
+                             bg='#44aa44', fg='white', font=('Arial', 12, 'bold'))
+        close_btn.pack(pady=15)
+        
+    def show(self):
+        """Bring the window up to date and show it"""
+        self.visible = True
+        self.refresh()
+        self.inventory_tree.redraw_from(0)
+        self.equipment_tree.redraw_from(0)
+        self.window.deiconify()
+        self.window.lift()
+        self.window.grab_set()
+        
+    def hide(self):
+        """Hide the window, keeping it for next time"""
+        self.visible = False
+        self.window.grab_release()
+        self.window.withdraw()
+        
+    def on_inventory(self, changed):
+        """Follow an INVENTORY event; redraw the changed rows if they are on screen"""
+        first = self.inventory_rows.apply(changed)
+        first_equipment = self.equipment_rows.apply(changed)
+        if self.visible:
+            self.inventory_tree.redraw_from(first)
+            self.equipment_tree.redraw_from(first_equipment)
+            
+    def toggle_equipment(self, event=None):
+        """Equip the double-clicked item, or take it off if it is worn"""
+        index = self.equipment_tree.focused_row()
+        if index is None:
+            return
+        name = self.equipment_rows.row(index)[0]
+        core = self.core
+        worn = name == core.equipped_armor or name in core.equipped_accessories
+        core.apply(('unequip', name) if worn else ('equip', name))
+        
+    def refresh(self):
+        """Rewrite the stats and equipped items"""
+        core = self.core
+        self.stats_label.config(text="\n".join(core.stats_lines()))
+        self.equipped_label.config(text=(
+            "Current Equipment:\n\n"
+            f"Weapon: {core.equipped_weapon or 'None'}\n"
+            f"Armor: {core.equipped_armor or 'None'}\n"
+            f"Accessories: {', '.join(core.equipped_accessories) if core.equipped_accessories else 'None'}\n\n"
+            "Available Equipment:"))
+
 
 class PlayerGameGUI:
     def __init__(self):
@@ -26,303 +227,22 @@ class PlayerGameGUI:
         self.sprites_dir = "assets/sprites"
         self.backgrounds_dir = "assets/backgrounds"
         
-        # Game state
-        self.player_character = None  # Will be set after class selection
-        self.current_scene = "cave_entrance"
-        self.game_state = "exploring"
-        self.player_health = 100
-        self.player_level = 1
-        self.player_experience = 0
-        self.inventory = []
-        self.equipped_weapon = None
-        self.equipped_armor = None
-        self.equipped_accessories = []
-        self.visited_scenes = []
-        
-        # Combat state
-        self.combat_enemy = None
-        self.combat_enemy_health = 0
-        self.combat_turn = 0
-        self.available_combat_skills = []
-        
-        # Scene descriptions - centralized to prevent duplication
-        self.scene_descriptions = {
-            "cave_entrance": "You wake up in a dark cave entrance, disoriented and confused. The air is cool and damp, and you can barely see your own hands in front of your face. You have no memory of how you got here.",
-            "skull_chamber": "You enter a chamber filled with ancient skulls. The atmosphere is heavy with dark energy. The skulls seem to watch you as you move through the chamber.",
-            "cave_in": "The ground shakes violently as the tunnel begins to collapse around you! Rocks and debris fall from the ceiling, and dust fills the air. You must act quickly to escape before you're buried alive.",
-            "primitive_village": "You emerge from the cave into a primitive village nestled in a hidden valley. Crude huts made of stone and thatch dot the landscape, with smoke curling from cooking fires. The inhabitants, dressed in simple animal skins, eye you warily as you approach. Their faces show a mix of curiosity and suspicion. As you take in your surroundings, you notice a ground dwelling creature scurries into the alley between two huts, its movements quick and furtive.",
-            "chiefs_house": "You approach the chief's house. It's the largest building in the village, decorated with tribal symbols and trophies. The chief appears to be expecting visitors.",
-            "healing_pool": "You find a mystical healing pool. Its waters glow with magical energy. The air around it feels charged with ancient power.",
-            "village_changed": "The village has changed dramatically. Dark forces have taken hold. The once peaceful settlement now feels hostile and dangerous.",
-            "alley": "You find yourself in a dark, narrow alley. Shadows dance on the walls, and you can hear distant sounds echoing through the passage.",
-            "armory": "You enter a well-equipped armory. Weapons and armor line the walls, and the sound of metalworking echoes from the back."
-        }
-        
-        # Initialize consequences - will be populated in __init__
-        self.consequences = {}
-        self._initialize_consequences()
-        self.game_progress = {
-            'visited_village': False,
-            'defeated_guardian': False,
-            'found_treasure': False,
-            'met_chief': False,
-            'looked_around_dark': False,
-            'sat_and_cried': False,
-            'entered_skull_chamber': False,
-            'gained_villagers_trust': False,
-            'learned_ancient_secrets': False,
-            'entered_cautiously': False,
-            'confronted_darkness': False,
-            'learned_village_history': False,
-            'found_artifacts': False,
-            'helped_villagers': False,
-            'offered_services': False,
-            'gained_magical_insight': False,
-            'understood_pool_magic': False,
-            'restored_health': False,
-            'learned_village_customs': False,
-            'protected_villagers': False,
-            'gained_spiritual_insight': False,
-            'found_corruption_source': False,
-            'explored_alley': False,
-            'found_alley_treasure': False,
-            'investigated_alley_sounds': False,
-            'examined_armory': False,
-            'requested_custom_equipment': False,
-            'learned_weapon_maintenance': False
-        }
+        # Game rules and state; views refresh once per frame
+        self.bus = EventBus(schedule=self.root.after_idle)
+        self.bus.subscribe(MESSAGE, self.add_story_text)
+        self.bus.subscribe(SCENE, lambda scene_id: self.show_scene_description())
+        self.bus.subscribe(DISPLAY, lambda _: self.update_display())
+        self.bus.subscribe(INVENTORY, self.on_inventory_changed)
+        self.autosave = Autosaver()
+        self.core = GameCore(bus=self.bus, autosave=self.autosave)
+        self.inventory_window = None
+        self.classes = self.core.classes
+        self.item_registry = self.core.item_registry
         
         # Asset caches
         self.sprite_cache = {}
         self.background_cache = {}
         
-        # Scene progression
-        self.scene_progression = [
-            "cave_entrance",
-            "skull_chamber", 
-            "primitive_village",
-            "chiefs_house",
-            "healing_pool",
-            "village_changed",
-            "alley",
-            "armory"
-        ]
-        
-        # Class definitions
-        self.classes = {
-            'warrior': {
-                'name': 'Warrior',
-                'health': 120,
-                'strength': 15,
-                'agility': 8,
-                'intelligence': 5,
-                'starting_weapon': 'Iron Sword',
-                'ability': 'Shield Block',
-                'description': 'A mighty warrior with high health and strength. Perfect for beginners.',
-                'combat_skills': {
-                    'basic_attack': {'name': 'Heavy Strike', 'damage_multiplier': 1.2, 'description': 'A powerful melee attack'},
-                    'defend': {'name': 'Shield Block', 'damage_reduction': 0.6, 'description': 'Raise shield to reduce incoming damage'},
-                    'run': {'name': 'Tactical Retreat', 'success_chance': 0.7, 'description': 'Retreat while maintaining defensive stance'}
-                }
-            },
-            'rogue': {
-                'name': 'Rogue',
-                'health': 80,
-                'strength': 8,
-                'agility': 15,
-                'intelligence': 8,
-                'starting_weapon': 'Daggers',
-                'ability': 'Stealth',
-                'description': 'A swift rogue with high agility and critical hit chance.',
-                'combat_skills': {
-                    'basic_attack': {'name': 'Quick Strike', 'damage_multiplier': 1.0, 'critical_chance': 0.3, 'description': 'A fast attack with high critical hit chance'},
-                    'defend': {'name': 'Dodge', 'damage_reduction': 0.4, 'description': 'Dodge to avoid most incoming damage'},
-                    'run': {'name': 'Flee', 'success_chance': 0.9, 'description': 'Quickly escape from combat'}
-                }
-            },
-            'mage': {
-                'name': 'Mage',
-                'health': 70,
-                'strength': 5,
-                'agility': 6,
-                'intelligence': 18,
-                'starting_weapon': 'Magic Staff',
-                'ability': 'Fireball',
-                'description': 'A powerful mage with high intelligence and magical abilities.',
-                'combat_skills': {
-                    'basic_attack': {'name': 'Magic Bolt', 'damage_multiplier': 1.1, 'description': 'A magical projectile attack'},
-                    'defend': {'name': 'Magic Barrier', 'damage_reduction': 0.5, 'description': 'Create a magical barrier to reduce damage'},
-                    'run': {'name': 'Teleport', 'success_chance': 0.8, 'description': 'Magically teleport away from combat'}
-                }
-            }
-        }
-        
-        # Weapons
-        self.weapons = {
-            'Iron Sword': {'damage': 12, 'type': 'melee', 'class': 'warrior'},
-            'Daggers': {'damage': 8, 'type': 'melee', 'class': 'rogue'},
-            'Magic Staff': {'damage': 10, 'type': 'magic', 'class': 'mage'},
-            'Battle Axe': {'damage': 15, 'type': 'melee', 'class': 'warrior'},
-            'Poison Dagger': {'damage': 6, 'type': 'melee', 'class': 'rogue'},
-            'Lightning Bolt': {'damage': 14, 'type': 'magic', 'class': 'mage'},
-            'Ancient Blade': {'damage': 18, 'type': 'melee', 'class': 'warrior'},
-            'Shadow Dagger': {'damage': 12, 'type': 'melee', 'class': 'rogue'},
-            'Crystal Staff': {'damage': 16, 'type': 'magic', 'class': 'mage'},
-            'Steel Greatsword': {'damage': 20, 'type': 'melee', 'class': 'warrior'},
-            'Venomous Blade': {'damage': 10, 'type': 'melee', 'class': 'rogue'},
-            'Arcane Orb': {'damage': 18, 'type': 'magic', 'class': 'mage'},
-            'Thunder Hammer': {'damage': 22, 'type': 'melee', 'class': 'warrior'},
-            'Silent Death': {'damage': 14, 'type': 'melee', 'class': 'rogue'},
-            'Ethereal Wand': {'damage': 20, 'type': 'magic', 'class': 'mage'}
-        }
-        
-        # Items and equipment
-        self.items = {
-            'Health Potion': {'type': 'consumable', 'effect': 'heal', 'value': 30, 'description': 'Restores 30 health points'},
-            'Mana Potion': {'type': 'consumable', 'effect': 'mana', 'value': 25, 'description': 'Restores 25 mana points'},
-            'Leather Armor': {'type': 'armor', 'effect': 'defense', 'value': 5, 'description': 'Light armor providing basic protection'},
-            'Chain Mail': {'type': 'armor', 'effect': 'defense', 'value': 10, 'description': 'Medium armor with good protection'},
-            'Plate Armor': {'type': 'armor', 'effect': 'defense', 'value': 15, 'description': 'Heavy armor with maximum protection'},
-            'Ring of Strength': {'type': 'accessory', 'effect': 'strength', 'value': 3, 'description': 'Increases strength by 3'},
-            'Ring of Agility': {'type': 'accessory', 'effect': 'agility', 'value': 3, 'description': 'Increases agility by 3'},
-            'Ring of Intelligence': {'type': 'accessory', 'effect': 'intelligence', 'value': 3, 'description': 'Increases intelligence by 3'},
-            'Amulet of Health': {'type': 'accessory', 'effect': 'health', 'value': 20, 'description': 'Increases maximum health by 20'},
-            'Boots of Speed': {'type': 'accessory', 'effect': 'agility', 'value': 2, 'description': 'Increases agility by 2'},
-            'Crystal of Power': {'type': 'accessory', 'effect': 'intelligence', 'value': 2, 'description': 'Increases intelligence by 2'}
-        }
-        
-        # Enhanced scene choices
-        self.scene_choices = {
-            "cave_entrance": [
-                {
-                    "text": "Look around",
-                    "description": "You squint into the darkness, but your eyes haven't adjusted yet. You can barely make out the rough stone walls around you.",
-                    "consequence": "looked_around_dark"
-                },
-                {
-                    "text": "Sit and cry",
-                    "description": "You sink to the ground and let out your frustration. The tears don't help your situation, but at least you feel a bit better.",
-                    "consequence": "sat_and_cried"
-                },
-                {
-                    "text": "Go towards the light at the crack",
-                    "description": "You notice a faint light coming from a narrow crack in the wall. Squeezing through, you find yourself in a chamber filled with ancient skulls.",
-                    "consequence": "entered_skull_chamber"
-                }
-            ],
-            "skull_chamber": [
-                {
-                    "text": "Look for an exit",
-                    "description": "You search the chamber walls for any way out.",
-                    "consequence": "no_exit_visible"
-                },
-                {
-                    "text": "Examine the large glowing skull",
-                    "description": "You approach the mysterious glowing skull in the center of the chamber.",
-                    "consequence": "tunnel_collapse"
-                }
-            ],
-            "primitive_village": [
-                {
-                    "text": "Follow the creature into the alley",
-                    "description": "You decide to investigate the mysterious ground dwelling creature that scurried into the alley.",
-                    "consequence": "followed_creature_to_alley"
-                },
-                {
-                    "text": "Approach the armory",
-                    "description": "You head towards the armory building to see what weapons and equipment are available.",
-                    "consequence": "approached_armory"
-                },
-                {
-                    "text": "Approach the chief's house",
-                    "description": "You decide to find and speak with the village chief.",
-                    "consequence": "approached_chiefs_house"
-                }
-            ],
-            "chiefs_house": [
-                {
-                    "text": "Use the chief's house key",
-                    "description": "You attempt to use the chief's house key to enter the building.",
-                    "consequence": "used_chiefs_house_key"
-                },
-                {
-                    "text": "Return to the primitive village",
-                    "description": "You decide to leave the chief's house and return to the village.",
-                    "consequence": "returned_to_village"
-                }
-            ],
-            "healing_pool": [
-                {
-                    "text": "Drink from the healing waters",
-                    "description": "You carefully drink from the mystical pool to restore your health.",
-                    "consequence": "restored_health"
-                },
-                {
-                    "text": "Meditate by the pool",
-                    "description": "You sit quietly and absorb the magical energy of the healing pool.",
-                    "consequence": "gained_magical_insight"
-                },
-                {
-                    "text": "Return to the village",
-                    "description": "You decide to head back to the village to see what has changed.",
-                    "consequence": "advanced_to_village_changed"
-                }
-            ],
-            "village_changed": [
-                {
-                    "text": "Confront the dark presence",
-                    "description": "You face the corruption head-on with your abilities.",
-                    "consequence": "confronted_darkness"
-                },
-                {
-                    "text": "Help the remaining villagers",
-                    "description": "You focus on protecting and aiding the innocent villagers.",
-                    "consequence": "protected_villagers"
-                },
-                {
-                    "text": "Seek the source of corruption",
-                    "description": "You investigate to find the root cause of the village's transformation.",
-                    "consequence": "found_corruption_source"
-                }
-            ],
-            "alley": [
-                {
-                    "text": "Confront the creature",
-                    "description": "You decide to face the ground dwelling creature head-on.",
-                    "consequence": "confronted_alley_creature"
-                },
-                {
-                    "text": "Sneak past the creature",
-                    "description": "You try to quietly move past the creature without being noticed.",
-                    "consequence": "sneaked_past_creature"
-                },
-                {
-                    "text": "Search for items in the alley",
-                    "description": "You look for anything of value while avoiding the creature.",
-                    "consequence": "searched_alley_items"
-                }
-            ],
-            "armory": [
-                {
-                    "text": "Use the armory key",
-                    "description": "You attempt to use the armory key to access the armory's contents.",
-                    "consequence": "used_armory_key"
-                },
-                {
-                    "text": "Return to the primitive village",
-                    "description": "You decide to leave the armory and return to the village.",
-                    "consequence": "returned_to_village"
-                }
-            ],
-            "cave_in": [
-                {
-                    "text": "RUN",
-                    "description": "You desperately try to escape the collapsing tunnel.",
-                    "consequence": "escaped_cave_in"
-                }
-            ]
-        }
-        
         # Initialize
         self.load_assets()
         self.show_class_selection()
@@ -382,29 +302,23 @@ class PlayerGameGUI:
                                   width=15, height=2)
             select_btn.pack(pady=15)
         
+        # Resume the autosaved run, if there is one
+        if self.autosave.path.exists():
+            continue_btn = tk.Button(main_frame, text="Continue",
+                                     command=self.continue_game,
+                                     bg='#4444ff', fg='white', font=('Arial', 11, 'bold'),
+                                     width=15, height=2)
+            continue_btn.pack(pady=10)
+        
     def select_class(self, class_key):
         """Select a character class and start the game"""
-        self.player_character = class_key
-        class_data = self.classes[class_key]
-        
-        # Set initial stats
-        self.player_health = class_data['health']
-        self.player_strength = class_data['strength']
-        self.player_agility = class_data['agility']
-        self.player_intelligence = class_data['intelligence']
-        self.player_weapon = class_data['starting_weapon']
-        self.player_ability = class_data['ability']
-        
-        # Add starting weapon to inventory and equip it
-        self.inventory.append(self.player_weapon)
-        self.equipped_weapon = self.player_weapon
-        
-        # Add some starting items
-        self.inventory.extend(['Health Potion', 'Leather Armor'])
+        self.create_ui()
+        self.core.apply(('new_game', class_key))
         
-        # Start the game
+    def continue_game(self):
+        """Resume the run in the autosave slot"""
         self.create_ui()
-        self.start_new_game()
+        self.core.apply(('load', AUTOSAVE))
         
     def create_ui(self):
         """Create the player-focused user interface"""
@@ -469,6 +383,11 @@ class PlayerGameGUI:
                                      bg='#cc8844', fg='white', font=('Arial', 10, 'bold'))
         self.inventory_btn.pack(fill=tk.X, padx=8, pady=4)
         
+        self.undo_btn = tk.Button(action_frame, text="Undo", 
+                                  command=self.undo_last_action,
+                                  bg='#8844cc', fg='white', font=('Arial', 10, 'bold'))
+        self.undo_btn.pack(fill=tk.X, padx=8, pady=4)
+        
         # Character info
         char_frame = tk.LabelFrame(control_frame, text="Character", 
                                   fg='#ffcc88', bg='#2a2a2a', font=('Arial', 11, 'bold'))
@@ -547,242 +466,42 @@ class PlayerGameGUI:
         
         print(f"Assets loaded: {len(self.sprite_cache)} sprites, {len(self.background_cache)} backgrounds")
     
-    def _initialize_consequences(self):
-        """Initialize all game consequences in a centralized location"""
-        self.consequences = {
-            'looked_around_dark': {
-                'text': 'It\'s dark, you can\'t see.',
-                'effect': lambda: None
-            },
-            'sat_and_cried': {
-                'text': 'You cried, nothing happened.',
-                'effect': lambda: None
-            },
-            'entered_skull_chamber': {
-                'text': 'You entered the skull chamber.',
-                'effect': lambda: self.advance_to_skull_chamber()
-            },
-            'no_exit_visible': {
-                'text': 'No exit is visible.',
-                'effect': lambda: None
-            },
-            'tunnel_collapse': {
-                'text': 'The tunnel starts to collapse!!',
-                'effect': lambda: self.trigger_cave_in()
-            },
-            'gained_villagers_trust': {
-                'text': 'The villagers welcome you warmly.',
-                'effect': lambda: self.gain_experience(10)
-            },
-            'learned_village_customs': {
-                'text': 'You learn about the village customs.',
-                'effect': lambda: self.gain_experience(5)
-            },
-            'met_chief': {
-                'text': 'The chief greets you with respect.',
-                'effect': lambda: self.gain_experience(15)
-            },
-            'offered_services': {
-                'text': 'You offer your services to the village.',
-                'effect': lambda: self.gain_experience(10)
-            },
-            'advanced_to_healing_pool': {
-                'text': 'You make your way to the healing pool.',
-                'effect': lambda: self.advance_to_scene('healing_pool')
-            },
-            'restored_health': {
-                'text': 'The healing waters restore your health.',
-                'effect': lambda: self.restore_health(50)
-            },
-            'gained_magical_insight': {
-                'text': 'You gain magical insight from the pool.',
-                'effect': lambda: self.gain_experience(20)
-            },
-            'understood_pool_magic': {
-                'text': 'You understand the pool\'s magical properties.',
-                'effect': lambda: self.gain_experience(15)
-            },
-            'learned_ancient_secrets': {
-                'text': 'You learn ancient secrets from the chief.',
-                'effect': lambda: self.gain_experience(25)
-            },
-            'entered_cautiously': {
-                'text': 'You enter the chamber cautiously.',
-                'effect': lambda: self.gain_experience(5)
-            },
-            'confronted_darkness': {
-                'text': 'You confront the darkness head-on.',
-                'effect': lambda: self.gain_experience(10)
-            },
-            'learned_village_history': {
-                'text': 'You learn about the village\'s history.',
-                'effect': lambda: self.gain_experience(10)
-            },
-            'found_artifacts': {
-                'text': 'You discover ancient artifacts.',
-                'effect': lambda: self.gain_experience(15)
-            },
-            'helped_villagers': {
-                'text': 'You help the villagers with their tasks.',
-                'effect': lambda: self.gain_experience(10)
-            },
-            'examined_armory': {
-                'text': 'You examine the weapons and armor in detail.',
-                'effect': lambda: self.gain_experience(10)
-            },
-            'requested_custom_equipment': {
-                'text': 'You request custom equipment from the armorer.',
-                'effect': lambda: self.gain_experience(5)
-            },
-            'learned_weapon_maintenance': {
-                'text': 'You learn valuable techniques for maintaining your weapons.',
-                'effect': lambda: self.gain_experience(15)
-            },
-            'advanced_to_village': {
-                'text': 'You venture deeper into the cave system and emerge into a primitive village nestled in a hidden valley. Crude huts made of stone and thatch dot the landscape, with smoke curling from cooking fires. The inhabitants, dressed in simple animal skins, eye you warily as you approach. Their faces show a mix of curiosity and suspicion. As you take in your surroundings, you notice a ground dwelling creature scurries into the alley between two huts, its movements quick and furtive.',
-                'effect': lambda: self.advance_to_scene('primitive_village')
-            },
-            'advanced_to_chiefs_house': {
-                'text': 'You make your way to the chief\'s house, the largest building in the village.',
-                'effect': lambda: self.advance_to_scene('chiefs_house')
-            },
-            'advanced_to_village_changed': {
-                'text': 'You return to the village, but something has changed dramatically.',
-                'effect': lambda: self.advance_to_scene('village_changed')
-            },
-            'escaped_cave_in': {
-                'text': 'You manage to escape the collapsing tunnel and find yourself in a primitive village nestled in a hidden valley. Crude huts made of stone and thatch dot the landscape, with smoke curling from cooking fires. The inhabitants, dressed in simple animal skins, eye you warily as you approach. Their faces show a mix of curiosity and suspicion. As you take in your surroundings, you notice a ground dwelling creature scurries into the alley between two huts, its movements quick and furtive.',
-                'effect': lambda: self.advance_to_scene('primitive_village')
-            },
-            'followed_creature_to_alley': {
-                'text': 'You cautiously follow the creature into the dark alley. The narrow passage is filled with shadows and strange sounds. You can hear the creature moving ahead of you, its footsteps echoing off the stone walls.',
-                'effect': lambda: self.advance_to_scene('alley')
-            },
-            'approached_armory': {
-                'text': 'You approach the armory building. The door is locked with a heavy iron lock. You need a key to enter this building.',
-                'effect': lambda: self.check_armory_access()
-            },
-            'approached_chiefs_house': {
-                'text': 'You approach the chief\'s house. The door is locked with an ornate tribal lock. You need a special key to enter this building.',
-                'effect': lambda: self.check_chiefs_house_access()
-            },
-            'confronted_alley_creature': {
-                'text': 'You confront the ground dwelling creature! It\'s a small but aggressive beast with sharp claws. Combat begins!',
-                'effect': lambda: self.start_alley_combat()
-            },
-            'sneaked_past_creature': {
-                'text': 'You successfully sneak past the creature without being noticed. You find a hidden alcove with some useful items.',
-                'effect': lambda: self.sneak_past_creature()
-            },
-            'searched_alley_items': {
-                'text': 'You carefully search the alley while staying hidden. You find some scattered coins and a rusty dagger.',
-                'effect': lambda: self.search_alley_items()
-            },
-            'searched_armory_keys': {
-                'text': 'You search through the armory and find a special key hidden in a locked drawer. It appears to be for the chief\'s house.',
-                'effect': lambda: self.find_chiefs_house_key()
-            },
-            'used_armory_key': {
-                'text': 'You use the armory key to unlock the armory\'s storage. Inside you find weapons, armor, and a special key for the chief\'s house.',
-                'effect': lambda: self.access_armory_contents()
-            },
-            'used_chiefs_house_key': {
-                'text': 'You use the chief\'s house key to unlock the ornate door. The chief welcomes you inside and offers guidance.',
-                'effect': lambda: self.access_chiefs_house()
-            },
-            'returned_to_village': {
-                'text': 'You return to the primitive village. The villagers continue their daily activities around you.',
-                'effect': lambda: self.advance_to_scene('primitive_village')
-            }
-        }
-        
-    def start_new_game(self):
-        """Start a new game"""
-        self.current_scene = "cave_entrance"
-        self.game_state = "exploring"
-        self.visited_scenes = ["cave_entrance"]
-        self.game_progress = {
-            'visited_village': False,
-            'defeated_guardian': False,
-            'found_treasure': False,
-            'met_chief': False,
-            'looked_around_dark': False,
-            'sat_and_cried': False,
-            'entered_skull_chamber': False,
-            'gained_villagers_trust': False,
-            'learned_ancient_secrets': False,
-            'entered_cautiously': False,
-            'confronted_darkness': False,
-            'learned_village_history': False,
-            'found_artifacts': False,
-            'helped_villagers': False,
-            'offered_services': False,
-            'gained_magical_insight': False,
-            'understood_pool_magic': False,
-            'restored_health': False,
-            'learned_village_customs': False,
-            'protected_villagers': False,
-            'gained_spiritual_insight': False,
-            'found_corruption_source': False,
-            'explored_alley': False,
-            'found_alley_treasure': False,
-            'investigated_alley_sounds': False,
-            'examined_armory': False,
-            'requested_custom_equipment': False,
-            'learned_weapon_maintenance': False
-        }
-        
-        self.update_display()
-        class_name = self.classes[self.player_character]['name']
-        self.add_story_text_top(f"Welcome to SHABUYA Cave Adventure! You are a {class_name} standing at the entrance to mysterious caves. What will you discover within?")
-        
-        # Show initial scene description and choices automatically
-        self.show_scene_description()
-        
     def show_scene_description(self):
         """Show the current scene description and choices automatically"""
         # Clear previous text
         self.clear_story_text()
         
-        scene_desc = self.scene_descriptions.get(self.current_scene, "You examine your surroundings carefully.")
-        self.add_story_text_top(scene_desc)
+        for line in self.core.describe_scene():
+            self.add_story_text_top(line)
         
-        # If this scene has choices, show them as a numbered list
-        if self.current_scene in self.scene_choices:
-            self.add_story_text_top("")
-            self.add_story_text_top("What would you like to do?")
-            
-            choices = self.scene_choices[self.current_scene]
-            for i, choice in enumerate(choices):
-                choice_text = f"{i+1}. {choice['text']}"
-                self.add_story_text_top(choice_text)
-            
+        if self.core.current_scene in self.core.scene_choices:
             self.add_story_text_top("")
             self.add_story_text_top("Enter your choice in the box to the right.")
         
     def update_display(self):
         """Update the main display"""
+        core = self.core
         self.canvas.delete("all")
         
         # Draw background
-        bg_file = f"{self.current_scene}.png"
+        bg_file = f"{core.current_scene}.png"
         if bg_file in self.background_cache:
             bg_image = self.background_cache[bg_file]
             self.canvas.create_image(450, 250, image=bg_image)
         else:
             self.canvas.create_rectangle(0, 0, 900, 500, fill='#1a1a2e')
-            self.canvas.create_text(450, 250, text=f"{self.current_scene.upper()}", 
+            self.canvas.create_text(450, 250, text=f"{core.current_scene.upper()}", 
                                    fill='#4a4a6a', font=('Arial', 32))
         
         # Draw player sprite
-        player_sprite = f"{self.player_character}_sprite.png"
+        player_sprite = f"{core.player_character}_sprite.png"
         if player_sprite in self.sprite_cache:
             sprite_image = self.sprite_cache[player_sprite]
             x, y = 350, 420
             self.canvas.create_image(x, y, image=sprite_image)
         
         # Draw enemy if in combat
-        if self.game_state == "in_combat":
+        if core.game_state == "in_combat":
             enemy_sprites = ['cave_guardian_sprite.png', 'primitive_creature_sprite.png', 
                            'boss_divineheart_sprite.png']
             for enemy_file in enemy_sprites:
@@ -792,517 +511,34 @@ class PlayerGameGUI:
                     break
         
         # Update UI labels
-        self.health_label.config(text=f"Health: {self.player_health}")
-        self.level_label.config(text=f"Level: {self.player_level}")
-        self.exp_label.config(text=f"Experience: {self.player_experience}")
-        self.weapon_label.config(text=f"Weapon: {self.player_weapon}")
-        self.scene_label.config(text=f"Scene: {self.current_scene.replace('_', ' ').title()}")
-        self.state_label.config(text=f"State: {self.game_state.title()}")
+        self.health_label.config(text=f"Health: {core.player_health}")
+        self.level_label.config(text=f"Level: {core.player_level}")
+        self.exp_label.config(text=f"Experience: {core.player_experience}")
+        self.weapon_label.config(text=f"Weapon: {core.player_weapon}")
+        self.scene_label.config(text=f"Scene: {core.current_scene.replace('_', ' ').title()}")
+        self.state_label.config(text=f"State: {core.game_state.title()}")
+        if self.inventory_window is not None and self.inventory_window.visible:
+            self.inventory_window.refresh()
         
     def show_inventory_stats(self):
-        """Show inventory and stats window"""
-        # Create inventory window
-        inv_window = tk.Toplevel(self.root)
-        inv_window.title("Inventory & Stats")
-        inv_window.geometry("600x500")
-        inv_window.configure(bg='#1a1a1a')
-        inv_window.transient(self.root)
-        inv_window.grab_set()
-        
-        # Title
-        title = tk.Label(inv_window, text="Inventory & Character Stats", 
-                        font=('Arial', 16, 'bold'), fg='#00ff88', bg='#1a1a1a')
-        title.pack(pady=15)
-        
-        # Create notebook for tabs
-        notebook = ttk.Notebook(inv_window)
-        notebook.pack(fill=tk.BOTH, expand=True, padx=15, pady=10)
-        
-        # Stats tab
-        stats_frame = tk.Frame(notebook, bg='#2a2a2a')
-        notebook.add(stats_frame, text="Stats")
-        
-        # Character stats
-        stats_text = f"Class: {self.classes[self.player_character]['name']}\n"
-        stats_text += f"Level: {self.player_level}\n"
-        stats_text += f"Health: {self.player_health}/{self.classes[self.player_character]['health']}\n"
-        stats_text += f"Experience: {self.player_experience}/100\n"
-        stats_text += f"Strength: {self.player_strength}\n"
-        stats_text += f"Agility: {self.player_agility}\n"
-        stats_text += f"Intelligence: {self.player_intelligence}\n"
-        stats_text += f"Ability: {self.player_ability}\n"
-        stats_text += f"Equipped Weapon: {self.equipped_weapon}\n"
-        stats_text += f"Equipped Armor: {self.equipped_armor or 'None'}\n"
-        stats_text += f"Accessories: {', '.join(self.equipped_accessories) if self.equipped_accessories else 'None'}"
-        
-        stats_label = tk.Label(stats_frame, text=stats_text, 
-                              fg='#cccccc', bg='#2a2a2a', font=('Arial', 12), 
-                              justify=tk.LEFT)
-        stats_label.pack(pady=20)
-        
-        # Inventory tab
-        inv_frame = tk.Frame(notebook, bg='#2a2a2a')
-        notebook.add(inv_frame, text="Inventory")
+        """Show the inventory and stats window, building it on first use"""
+        if self.inventory_window is None:
+            self.inventory_window = InventoryWindow(self.root, self.core)
+        self.inventory_window.show()
         
-        # Inventory list
-        inv_text = "Inventory Items:\n\n"
-        for item in self.inventory:
-            if item in self.weapons:
-                item_info = f"⚔️ {item} (Weapon - {self.weapons[item]['damage']} damage)"
-            elif item in self.items:
-                item_info = f"📦 {item} - {self.items[item]['description']}"
-            else:
-                item_info = f"❓ {item}"
-            inv_text += item_info + "\n\n"
-        
-        inv_label = tk.Label(inv_frame, text=inv_text, 
-                            fg='#cccccc', bg='#2a2a2a', font=('Arial', 10), 
-                            justify=tk.LEFT, wraplength=500)
-        inv_label.pack(pady=20)
-        
-        # Equipment tab
-        equip_frame = tk.Frame(notebook, bg='#2a2a2a')
-        notebook.add(equip_frame, text="Equipment")
-        
-        # Equipment management
-        equip_text = "Current Equipment:\n\n"
-        equip_text += f"Weapon: {self.equipped_weapon or 'None'}\n"
-        equip_text += f"Armor: {self.equipped_armor or 'None'}\n"
-        equip_text += f"Accessories: {', '.join(self.equipped_accessories) if self.equipped_accessories else 'None'}\n\n"
-        equip_text += "Available Equipment:\n\n"
-        
-        for item in self.inventory:
-            if item in self.weapons:
-                equip_text += f"⚔️ {item} (Weapon)\n"
-            elif item in self.items and self.items[item]['type'] in ['armor', 'accessory']:
-                equip_text += f"🛡️ {item} ({self.items[item]['type'].title()})\n"
-        
-        equip_label = tk.Label(equip_frame, text=equip_text, 
-                              fg='#cccccc', bg='#2a2a2a', font=('Arial', 10), 
-                              justify=tk.LEFT, wraplength=500)
-        equip_label.pack(pady=20)
-        
-        # Close button
-        close_btn = tk.Button(inv_window, text="Close", 
-                             command=inv_window.destroy,
-                             bg='#44aa44', fg='white', font=('Arial', 12, 'bold'))
-        close_btn.pack(pady=15)
+    def on_inventory_changed(self, changed):
+        """Pass inventory changes to the inventory window, if it has been built"""
+        if self.inventory_window is not None:
+            self.inventory_window.on_inventory(changed)
         
     def go_back_scene(self):
         """Go back to the previous scene"""
-        if len(self.visited_scenes) > 1:
-            self.visited_scenes.pop()  # Remove current scene
-            self.current_scene = self.visited_scenes[-1]  # Get previous scene
-            self.game_state = "exploring"
-            self.add_story_text(f"You return to {self.current_scene.replace('_', ' ').title()}.")
-            self.update_display()
-            self.show_scene_description()
-        else:
-            self.add_story_text("You cannot go back further.")
+        self.core.apply(('back',))
             
-    def execute_choice(self, choice, window):
-        """Execute the chosen action"""
-        if window:
-            window.destroy()
-        
-        # Handle consequences
-        consequence = choice['consequence']
-        self.handle_consequence(consequence)
-        
-        self.update_display()
-        
-    def handle_consequence(self, consequence):
-        """Handle the consequences of player choices"""
-        if consequence in self.consequences:
-            consequence_data = self.consequences[consequence]
-            self.add_story_text(consequence_data['text'])
-            consequence_data['effect']()
-        else:
-            # Add error handling for unknown consequences
-            self.add_story_text(f"Unknown consequence: {consequence}")
-            print(f"Warning: Unknown consequence '{consequence}' encountered")
-        
-        # Mark progress
-        self.game_progress[consequence] = True
-        
-    def gain_experience(self, amount):
-        """Gain experience points"""
-        self.experience += amount
-        self.add_story_text(f"You gained {amount} experience points!")
-        
-        # Check for level up
-        if self.experience >= self.level * 100:
-            self.level_up()
-    
-    def level_up(self):
-        """Handle level up"""
-        self.level += 1
-        self.experience = 0
-        self.max_health += 10
-        self.health = self.max_health
-        self.add_story_text(f"Level up! You are now level {self.level}!")
-        self.add_story_text("Your health has been restored and increased!")
-    
-    def gain_experience(self, amount):
-        """Gain experience points"""
-        self.player_experience += amount
-        self.add_story_text(f"You gain {amount} experience points!")
-        
-        if self.player_experience >= 100:
-            self.level_up()
-            
-    def restore_health(self, amount):
-        """Restore health"""
-        old_health = self.player_health
-        self.player_health = min(self.classes[self.player_character]['health'], 
-                                self.player_health + amount)
-        restored = self.player_health - old_health
-        self.add_story_text(f"Your health is restored by {restored} points!")
-        
-    def advance_to_skull_chamber(self):
-        """Advance directly to the skull chamber"""
-        self.current_scene = "skull_chamber"
-        self.visited_scenes.append("skull_chamber")
-        self.game_state = "exploring"
-        self.add_story_text_top("You find yourself in a chamber filled with ancient skulls.")
-        self.update_display()
-        self.show_scene_description()
-        
-    def advance_to_scene(self, scene_name):
-        """Advance to a specific scene with validation"""
-        if not scene_name:
-            self.add_story_text("Error: No scene name provided.")
-            return
-            
-        if scene_name not in self.scene_descriptions:
-            self.add_story_text(f"Error: Unknown scene '{scene_name}'.")
-            print(f"Warning: Attempted to advance to unknown scene '{scene_name}'")
-            return
-            
-        self.current_scene = scene_name
-        if scene_name not in self.visited_scenes:
-            self.visited_scenes.append(scene_name)
-        self.game_state = "exploring"
-        self.update_display()
-        self.show_scene_description()
-    
-    def check_armory_access(self):
-        """Check if player has armory key and advance to armory scene"""
-        if 'Armory Key' in self.inventory:
-            self.add_story_text("You approach the armory building. The door is locked, but you have the armory key.")
-            self.advance_to_scene('armory')
-        else:
-            self.add_story_text("You approach the armory building. The door is locked with a heavy iron lock. You need to find the armory key first. Perhaps it can be found by defeating the creature in the alley?")
-            # Stay in primitive village
-            self.current_scene = "primitive_village"
-            self.update_display()
-            self.show_scene_description()
-    
-    def check_chiefs_house_access(self):
-        """Check if player has chiefs house key and advance to chiefs house scene"""
-        if 'Chief\'s House Key' in self.inventory:
-            self.add_story_text("You approach the chief's house. The door is locked, but you have the chief's house key.")
-            self.advance_to_scene('chiefs_house')
-        else:
-            self.add_story_text("You approach the chief's house. The door is locked with an ornate tribal lock. You need to find the chief's house key first. Perhaps it can be found in the armory?")
-            # Stay in primitive village
-            self.current_scene = "primitive_village"
-            self.update_display()
-            self.show_scene_description()
-    
-    def start_alley_combat(self):
-        """Start combat with the alley creature"""
-        self.game_state = "in_combat"
-        self.combat_enemy = "Ground Dwelling Creature"
-        self.combat_enemy_health = 30
-        self.combat_turn = 0
-        
-        # Initialize available combat skills based on class
-        self.available_combat_skills = list(self.classes[self.player_character]['combat_skills'].keys())
-        
-        self.add_story_text("The ground dwelling creature attacks! Combat begins!")
-        self.add_story_text(f"Enemy: {self.combat_enemy} (Health: {self.combat_enemy_health})")
-        self.add_story_text("Choose your combat action:")
-        
-        # Show combat choices
-        self.show_combat_choices()
-        
-        self.update_display()
-    
-    def show_combat_choices(self):
-        """Show combat choices based on available skills"""
-        self.add_story_text("")
-        self.add_story_text("Combat Options:")
-        
-        for i, skill_key in enumerate(self.available_combat_skills, 1):
-            skill = self.classes[self.player_character]['combat_skills'][skill_key]
-            self.add_story_text(f"{i}. {skill['name']} - {skill['description']}")
-        
-        self.add_story_text("")
-        self.add_story_text("Enter your choice (1-3) in the input field above.")
-    
-    def handle_combat_action(self, choice):
-        """Handle combat action based on player choice with validation"""
-        if self.game_state != "in_combat":
-            self.add_story_text("You are not in combat!")
-            return
-            
-        if not self.available_combat_skills:
-            self.add_story_text("No combat skills available!")
-            return
-            
-        max_skills = len(self.available_combat_skills)
-        if choice < 1 or choice > max_skills:
-            self.add_story_text(f"Invalid choice! Please select 1-{max_skills}.")
-            return
-            
-        skill_key = self.available_combat_skills[choice - 1]
-        skill = self.classes[self.player_character]['combat_skills'][skill_key]
-        
-        self.add_story_text(f"You use {skill['name']}!")
-        
-        if skill_key == 'basic_attack':
-            self.perform_attack(skill)
-        elif skill_key == 'defend':
-            self.perform_defend(skill)
-        elif skill_key == 'run':
-            self.perform_run(skill)
-        
-        # Check if combat continues
-        if self.game_state == "in_combat" and self.combat_enemy_health > 0:
-            self.enemy_turn()
-    
-    def perform_attack(self, skill):
-        """Perform attack action"""
-        # Calculate damage
-        weapon_damage = self.weapons[self.player_weapon]['damage']
-        base_damage = weapon_damage * skill['damage_multiplier']
-        
-        # Add class bonuses
-        if self.player_character == 'warrior':
-            base_damage += self.player_strength * 0.5
-        elif self.player_character == 'rogue':
-            base_damage += self.player_agility * 0.3
-        elif self.player_character == 'mage':
-            base_damage += self.player_intelligence * 0.4
-        
-        # Check for critical hit (rogue only)
-        if 'critical_chance' in skill and random.random() < skill['critical_chance']:
-            base_damage *= 2
-            self.add_story_text("Critical hit!")
-        
-        damage = int(base_damage)
-        self.combat_enemy_health -= damage
-        
-        self.add_story_text(f"You deal {damage} damage to the {self.combat_enemy}!")
-        
-        if self.combat_enemy_health <= 0:
-            self.end_combat_victory()
-    
-    def perform_defend(self, skill):
-        """Perform defend action"""
-        self.add_story_text(f"You prepare to {skill['name'].lower()}!")
-        # Defense will be applied during enemy turn
-        self.defending = True
-        self.defense_reduction = skill['damage_reduction']
-    
-    def perform_run(self, skill):
-        """Perform run action"""
-        if random.random() < skill['success_chance']:
-            self.add_story_text(f"You successfully {skill['name'].lower()}!")
-            self.end_combat_escape()
-        else:
-            self.add_story_text(f"Your attempt to {skill['name'].lower()} fails!")
-    
-    def enemy_turn(self):
-        """Handle enemy turn"""
-        if self.combat_enemy_health <= 0:
-            return
-            
-        self.add_story_text(f"The {self.combat_enemy} attacks!")
-        
-        # Calculate enemy damage
-        enemy_damage = random.randint(8, 15)
-        
-        # Apply defense if player defended
-        if hasattr(self, 'defending') and self.defending:
-            enemy_damage = int(enemy_damage * (1 - self.defense_reduction))
-            self.add_story_text(f"Your defense reduces the damage!")
-            self.defending = False
-        
-        self.player_health = max(0, self.player_health - enemy_damage)
-        self.add_story_text(f"You take {enemy_damage} damage! Health: {self.player_health}")
-        
-        if self.player_health <= 0:
-            self.end_combat_defeat()
-        else:
-            self.add_story_text("Choose your next combat action:")
-            self.show_combat_choices()
-    
-    def end_combat_victory(self):
-        """End combat with victory"""
-        self.add_story_text(f"You defeat the {self.combat_enemy}!")
-        self.add_story_text("The creature drops an armory key as it falls.")
-        self.inventory.append('Armory Key')
-        self.add_story_text("You pick up the armory key. This might be useful for accessing the armory building.")
-        self.gain_experience(15)
-        
-        self.game_state = "exploring"
-        self.update_display()
-        self.show_scene_description()
-    
-    def end_combat_escape(self):
-        """End combat with escape"""
-        self.add_story_text("You escape from combat!")
-        self.gain_experience(5)
-        
-        self.game_state = "exploring"
-        self.update_display()
-        self.show_scene_description()
-    
-    def end_combat_defeat(self):
-        """End combat with defeat"""
-        self.add_story_text("You are defeated! You retreat from combat.")
-        self.add_story_text("You lose some health and return to the village.")
-        
-        # Return to village with reduced health
-        self.current_scene = "primitive_village"
-        self.game_state = "exploring"
-        self.update_display()
-        self.show_scene_description()
-    
-    def sneak_past_creature(self):
-        """Successfully sneak past the creature"""
-        self.add_story_text("You find a hidden alcove with some useful items: a health potion and some gold coins.")
-        self.inventory.append('Health Potion')
-        self.gain_experience(10)
-        self.add_story_text("You gain 10 experience points for your stealthy approach.")
-        self.update_display()
-        self.show_scene_description()
-    
-    def search_alley_items(self):
-        """Search for items in the alley"""
-        self.add_story_text("You find some scattered coins and a rusty dagger. The dagger isn't very useful, but the coins might come in handy.")
-        self.inventory.append('Rusty Dagger')
-        self.gain_experience(5)
-        self.add_story_text("You gain 5 experience points for your thorough search.")
-        self.update_display()
-        self.show_scene_description()
-    
-    def find_chiefs_house_key(self):
-        """Find the chief's house key in the armory"""
-        self.add_story_text("You pick up the chief's house key. This ornate key should unlock the chief's house!")
-        self.inventory.append('Chief\'s House Key')
-        self.gain_experience(10)
-        self.add_story_text("You gain 10 experience points for finding the key.")
-        self.update_display()
-        self.show_scene_description()
-    
-    def access_armory_contents(self):
-        """Access armory contents when using the key"""
-        if 'Armory Key' in self.inventory:
-            self.add_story_text("You successfully unlock the armory storage! Inside you find:")
-            self.add_story_text("- A sturdy iron sword")
-            self.add_story_text("- Chain mail armor")
-            self.add_story_text("- A special key for the chief's house")
-            self.add_story_text("- Some gold coins")
-            
-            # Add items to inventory
-            self.inventory.extend(['Iron Sword', 'Chain Mail', 'Chief\'s House Key', 'Gold Coins'])
-            self.gain_experience(20)
-            self.add_story_text("You gain 20 experience points for successfully accessing the armory!")
-        else:
-            self.add_story_text("You don't have the armory key. You need to find it first.")
-            
-        self.update_display()
-        self.show_scene_description()
-    
-    def access_chiefs_house(self):
-        """Access chief's house when using the key"""
-        if 'Chief\'s House Key' in self.inventory:
-            self.add_story_text("You successfully enter the chief's house! The chief welcomes you and offers:")
-            self.add_story_text("- Guidance about the village's history")
-            self.add_story_text("- Information about the healing pool")
-            self.add_story_text("- A blessing that restores your health")
-            self.add_story_text("- Knowledge about the village's current troubles")
-            
-            # Restore health and gain experience
-            self.restore_health(50)
-            self.gain_experience(25)
-            self.add_story_text("The chief's blessing restores your health and you gain 25 experience points!")
-        else:
-            self.add_story_text("You don't have the chief's house key. You need to find it first.")
-            
-        self.update_display()
-        self.show_scene_description()
-        
-    def trigger_cave_in(self):
-        """Trigger the cave-in event"""
-        self.current_scene = "cave_in"
-        if "cave_in" not in self.visited_scenes:
-            self.visited_scenes.append("cave_in")
-        self.game_state = "exploring"
-        self.update_display()
-        self.show_scene_description()
-        
-    def advance_scene(self):
-        """Advance to the next scene in progression"""
-        current_index = self.scene_progression.index(self.current_scene)
-        if current_index < len(self.scene_progression) - 1:
-            # Add current scene to visited list if not already there
-            if self.current_scene not in self.visited_scenes:
-                self.visited_scenes.append(self.current_scene)
-            
-            self.current_scene = self.scene_progression[current_index + 1]
-            self.visited_scenes.append(self.current_scene)
-            self.game_state = "exploring"
-            self.add_story_text(f"You advance to {self.current_scene.replace('_', ' ').title()}.")
-            self.update_display()
-            # Show new scene description and choices automatically
-            self.show_scene_description()
-        else:
-            self.add_story_text("You have reached the end of your journey... for now.")
-            
-    def start_combat(self):
-        """Start a combat encounter"""
-        self.game_state = "in_combat"
-        self.add_story_text("A hostile creature appears! Combat begins!")
-        self.update_display()
-        
-        # Calculate combat effectiveness based on class and weapon
-        weapon_damage = self.weapons[self.player_weapon]['damage']
-        class_bonus = 0
-        
-        if self.player_character == 'warrior':
-            class_bonus = self.player_strength * 0.5
-        elif self.player_character == 'rogue':
-            class_bonus = self.player_agility * 0.3
-        elif self.player_character == 'mage':
-            class_bonus = self.player_intelligence * 0.4
-            
-        total_damage = weapon_damage + class_bonus
-        
-        # Combat resolution
-        if random.random() < 0.7:  # 70% chance to win
-            self.add_story_text(f"You defeat the enemy using your {self.player_weapon}! You gain experience.")
-            self.player_experience += 10
-            if self.player_experience >= 100:
-                self.level_up()
-        else:
-            damage_taken = max(10, random.randint(15, 25))
-            self.player_health = max(0, self.player_health - damage_taken)
-            self.add_story_text(f"You are wounded in combat! You take {damage_taken} damage.")
+    def undo_last_action(self):
+        """Rewind the last action, restoring health, inventory and progress"""
+        self.core.apply(('undo',))
             
-        self.game_state = "exploring"
-        self.update_display()
-        
-    def level_up(self):
-        """Level up the player"""
-        self.player_level += 1
-        self.player_experience = 0
-        self.player_health = self.classes[self.player_character]['health']  # Restore to max
-        self.add_story_text(f"Level up! You are now level {self.player_level}! Your {self.player_ability} has grown stronger!")
-        
     def add_story_text(self, text):
         """Add text to the story display"""
         self.story_text.insert(tk.END, f"{text}\n\n")
@@ -1317,48 +553,46 @@ class PlayerGameGUI:
         """Clear the story text display"""
         self.story_text.delete(1.0, tk.END)
         
-    def show_scene_description(self):
-        """Show the current scene description and choices automatically"""
-        # Clear previous text
-        self.clear_story_text()
-        
-        scene_descriptions = {
-            "cave_entrance": "You wake up in a dark cave entrance, disoriented and confused. The air is cool and damp, and you can barely see your own hands in front of your face. You have no memory of how you got here.",
-            "skull_chamber": "You enter a chamber filled with ancient skulls. The atmosphere is heavy with dark energy. The skulls seem to watch you as you move through the chamber.",
-            "cave_in": "The ground shakes violently as the tunnel begins to collapse around you! Rocks and debris fall from the ceiling, and dust fills the air. You must act quickly to escape before you're buried alive.",
-            "primitive_village": "You emerge from the cave into a primitive village nestled in a hidden valley. Crude huts made of stone and thatch dot the landscape, with smoke curling from cooking fires. The inhabitants, dressed in simple animal skins, eye you warily as you approach. Their faces show a mix of curiosity and suspicion. As you take in your surroundings, you notice a ground dwelling creature scurries into the alley between two huts, its movements quick and furtive.",
-            "chiefs_house": "You approach the chief's house. It's the largest building in the village, decorated with tribal symbols and trophies. The chief appears to be expecting visitors.",
-            "healing_pool": "You find a mystical healing pool. Its waters glow with magical energy. The air around it feels charged with ancient power.",
-            "village_changed": "The village has changed dramatically. Dark forces have taken hold. The once peaceful settlement now feels hostile and dangerous.",
-            "alley": "You find yourself in a dark, narrow alley. Shadows dance on the walls, and you can hear distant sounds echoing through the passage.",
-            "armory": "You enter a well-equipped armory. Weapons and armor line the walls, and the sound of metalworking echoes from the back."
-        }
-        
-        scene_desc = scene_descriptions.get(self.current_scene, "You examine your surroundings carefully.")
-        self.add_story_text_top(scene_desc)
-        
-        # If this scene has choices, show them immediately
-        if self.current_scene in self.scene_choices:
-            self.add_story_text_top("")
-            self.add_story_text_top("What would you like to do?")
-            
-            choices = self.scene_choices[self.current_scene]
-            for i, choice in enumerate(choices):
-                choice_text = f"{i+1}. {choice['text']}"
-                self.add_story_text_top(choice_text)
-            
-            self.add_story_text_top("")
-            self.add_story_text_top("Enter your choice in the box to the right.")
-        
     def save_game(self):
-        """Save the current game state"""
-        # Placeholder for save functionality
-        self.add_story_text("Game saved! (Save functionality to be implemented)")
+        """Save the current game to the quicksave slot"""
+        self.core.apply(('save',))
         
     def load_game(self):
-        """Load a saved game"""
-        # Placeholder for load functionality
-        self.add_story_text("Game loaded! (Load functionality to be implemented)")
+        """Pick a saved slot to load; the list comes from the save index in one read"""
+        slots = list_saves(self.core.save_dir)
+        if not slots:
+            self.add_story_text("There are no saved games.")
+            return
+        window = tk.Toplevel(self.root)
+        window.title("Load Game")
+        window.geometry("640x400")
+        window.configure(bg='#1a1a1a')
+        window.transient(self.root)
+        
+        columns = ('class', 'level', 'scene', 'played', 'saved')
+        tree = ttk.Treeview(window, columns=columns, height=14)
+        tree.heading('#0', text='Slot')
+        for column in columns:
+            tree.heading(column, text=column.title())
+            tree.column(column, width=90)
+        for slot, summary in slots:
+            tree.insert('', tk.END, iid=slot, text=slot, values=(
+                self.classes.get(summary['class'], {}).get('name', summary['class']),
+                summary['level'],
+                self.core.scene_names.get(summary['scene'], summary['scene']),
+                f"{summary['playtime'] / 60:.0f} min",
+                time.strftime('%Y-%m-%d %H:%M', time.localtime(summary['saved_at']))))
+        tree.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        
+        def load_selected(event=None):
+            selection = tree.selection()
+            if not selection:
+                return
+            window.destroy()
+            self.core.apply(('load', selection[0]))
+        tree.bind('<Double-1>', load_selected)
+        tk.Button(window, text="Load", command=load_selected,
+                  bg='#44aa44', fg='white', font=('Arial', 12, 'bold')).pack(pady=10)
         
     def handle_choice_input(self, event):
         """Handle user input for choice selection with improved error handling"""
@@ -1369,23 +603,7 @@ class PlayerGameGUI:
                 return
                 
             choice_number = int(choice_text)
-            
-            # Check if player is in combat
-            if self.game_state == "in_combat":
-                self.handle_combat_action(choice_number)
-            else:
-                # Normal scene choice handling with validation
-                if self.current_scene not in self.scene_choices:
-                    self.add_story_text("No choices available in this scene.")
-                    return
-                    
-                choices = self.scene_choices[self.current_scene]
-                max_choices = len(choices)
-                
-                if 1 <= choice_number <= max_choices:
-                    self.execute_choice(choices[choice_number - 1], None)
-                else:
-                    self.add_story_text(f"Please enter a number between 1 and {max_choices}.")
+            self.core.apply(('choose', choice_number))
                     
         except ValueError:
             self.add_story_text("Please enter a valid number.")
@@ -1398,7 +616,10 @@ class PlayerGameGUI:
     def run(self):
         """Start the GUI"""
         print("Player GUI ready!")
-        self.root.mainloop()
+        try:
+            self.root.mainloop()
+        finally:
+            self.autosave.close()
 
 if __name__ == "__main__":
     print("SHABUYA Cave Adventure - Player Mode")
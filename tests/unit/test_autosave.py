@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Autosave Test - Verify journaled autosaves recover the latest state, survive torn writes and compact
+"""
+
+import sys
+from pathlib import Path
+
+DISTRIBUTION_DIR = Path(__file__).resolve().parents[2] / 'distribution'
+sys.path.insert(0, str(DISTRIBUTION_DIR))
+
+from autosave import Autosaver, diff_state, journal_path, merge_delta, read_autosave, recover
+from game_core import GameCore
+from savegame import capture_state, list_saves, save_game
+from snapshot import capture
+
+ACTIONS = [('new_game', 'rogue'), ('travel', 'primitive village'), ('choose', 1), ('choose', 1),
+           ('choose', 2), ('choose', 1), ('choose', 1), ('undo',), ('choose', 1), ('inventory',)]
+
+
+def play(path, compact_every=50):
+    """Play ACTIONS with an autosave and leave it as a crash would; return the core and its capture after each action"""
+    autosave = Autosaver(path, compact_every=compact_every, sync=False)
+    core = GameCore(seed=21, autosave=autosave)
+    captures = []
+    for action in ACTIONS:
+        core.apply(action)
+        captures.append(capture(core))
+    autosave.flush()
+    assert autosave.error is None
+    return core, captures
+
+
+def test_recovery_continues_identically(tmp_path):
+    """Checkpoint plus journal restore the last state, which then plays on the same"""
+    path = tmp_path / 'autosave.cvsav'
+    core, _ = play(path)
+    recovered = GameCore(seed=999)
+    recover(recovered, path)
+    assert capture(recovered) == capture(core)
+    for action in [('choose', 1), ('choose', 1), ('choose', 1)]:
+        assert recovered.apply(action) == core.apply(action)
+
+
+def test_journal_holds_only_changes(tmp_path):
+    """Story steps are journaled as small deltas, far smaller than a checkpoint"""
+    path = tmp_path / 'autosave.cvsav'
+    play(path)
+    journal_size = journal_path(path).stat().st_size
+    assert journal_size < path.stat().st_size * 2
+    state = read_autosave(path)
+    assert state['scalars']['player_character'] == 'rogue'
+
+
+def test_torn_write_loses_one_action(tmp_path):
+    """A journal cut off mid-record recovers the state before the lost action"""
+    path = tmp_path / 'autosave.cvsav'
+    _core, captures = play(path)
+    journal = journal_path(path)
+    journal.write_bytes(journal.read_bytes()[:-3])
+    recovered = GameCore(seed=999)
+    recover(recovered, path)
+    assert capture(recovered) == captures[-3]  # 'inventory' changes nothing, so the last record is the choice before
+
+
+def test_compaction_and_stale_journals(tmp_path):
+    """Compacting keeps the journal short; a journal of another checkpoint is ignored"""
+    path = tmp_path / 'autosave.cvsav'
+    core, _ = play(path, compact_every=2)
+    recovered = GameCore(seed=999)
+    recover(recovered, path)
+    assert capture(recovered) == capture(core)
+
+    core.apply(('choose', 1))
+    save_game(core, path)  # a checkpoint the journal was not written for
+    stale = GameCore(seed=999)
+    recover(stale, path)
+    assert capture(stale) == capture(core)
+
+
+def test_close_compacts_into_the_index(tmp_path):
+    """Closing writes a checkpoint, so the save index shows the latest state"""
+    path = tmp_path / 'autosave.cvsav'
+    autosave = Autosaver(path, sync=False)
+    core = GameCore(seed=4, autosave=autosave)
+    core.apply(('new_game', 'mage'))
+    core.apply(('travel', 'primitive village'))
+    autosave.close()
+    assert autosave.records == 0
+    [(slot, summary)] = list_saves(tmp_path)
+    assert slot == 'autosave' and summary['scene'] == core.current_scene
+
+
+def test_writer_survives_errors(tmp_path, monkeypatch):
+    """Any error the writer hits is kept in error, and it carries on from a checkpoint"""
+    path = tmp_path / 'autosave.cvsav'
+    autosave = Autosaver(path, sync=False)
+    core = GameCore(seed=3, autosave=autosave)
+    core.apply(('new_game', 'warrior'))
+
+    def broken(state):
+        raise ValueError("cannot diff")
+    monkeypatch.setattr(autosave, '_append', broken)
+    core.apply(('travel', 'primitive village'))
+    autosave.flush()
+    assert isinstance(autosave.error, ValueError)
+
+    monkeypatch.undo()
+    core.apply(('choose', 1))
+    autosave.flush()
+    assert autosave.error is None
+    recovered = GameCore(seed=999)
+    recover(recovered, path)
+    assert capture(recovered) == capture(core)
+
+    autosave.close()
+    core.apply(('choose', 1))   # the writer has stopped: nothing is queued and flush returns
+    autosave.flush()
+
+
+def test_deltas_round_trip():
+    """merge_delta(old, diff_state(old, new)) rebuilds new"""
+    core = GameCore(seed=5)
+    core.apply(('new_game', 'warrior'))
+    old = capture_state(core)
+    core.apply(('travel', 'primitive village'))
+    core.apply(('choose', 1))
+    new = capture_state(core)
+    delta = diff_state(old, new)
+    assert set(delta['scalars']) < set(new['scalars'])
+    merge_delta(old, delta)
+    assert old == new
+
+
+if __name__ == "__main__":
+    test_deltas_round_trip()
+    print("✅ Autosave tests passed")
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Balance Report Test - Verify the parallel class/weapon matrix
+"""
+
+import csv
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+DISTRIBUTION_DIR = Path(__file__).resolve().parents[2] / 'distribution'
+sys.path.insert(0, str(DISTRIBUTION_DIR))
+
+pytest.importorskip('numpy')
+
+from balance import balance_report, flag_outliers, write_csv, write_json
+from config import ENEMY_PROFILES
+from content import load_content
+
+
+def test_pool_matches_serial_run():
+    """Every cell draws its own stream, so workers do not change the numbers"""
+    serial = balance_report(fights=2000, workers=1)
+    pooled = balance_report(fights=2000, workers=2)
+    assert serial == pooled
+    content = load_content()
+    assert len(serial) == len(content['classes']) * len(content['weapons']) * len(ENEMY_PROFILES)
+    assert {(row['class'], row['weapon']) for row in serial} == {
+        (class_key, weapon) for class_key in content['classes'] for weapon in content['weapons']}
+    warrior = next(row for row in serial if row['class'] == 'warrior' and row['weapon'] == 'Iron Sword'
+                   and row['enemy'] == 'ground_dwelling_creature')
+    assert warrior['expected_dps'] == 21.0   # int(12 * 1.2 + 15 * 0.5)
+    assert warrior['win_rate'] == 1.0 and warrior['turns_variance'] == 0.0
+
+
+def test_outliers_and_files(tmp_path):
+    """Cells far from their group are flagged and written to CSV and JSON"""
+    rows = [{'enemy': 'e', 'expected_dps': dps, 'win_rate': 0.5, 'mean_turns': 2.0,
+             'outliers': []} for dps in (10, 10, 11, 9, 10, 10, 10, 40)]
+    flag_outliers(rows, threshold=2.0)
+    assert rows[-1]['outliers'] == ['expected_dps_high']
+    assert all(not row['outliers'] for row in rows[:-1])
+
+    report = balance_report(fights=500, workers=1)
+    write_csv(report, tmp_path / 'report.csv')
+    write_json(report, tmp_path / 'report.json', {'fights': 500})
+    with open(tmp_path / 'report.csv', newline='') as f:
+        assert len(list(csv.DictReader(f))) == len(report)
+    assert json.loads((tmp_path / 'report.json').read_text())['settings'] == {'fights': 500}
+
+
+if __name__ == "__main__":
+    import tempfile
+    test_pool_matches_serial_run()
+    with tempfile.TemporaryDirectory() as tmp:
+        test_outliers_and_files(Path(tmp))
+    print("✅ Balance report tests passed")
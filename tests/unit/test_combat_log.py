@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Combat Log Test - Verify the binary record format, streaming reader and GameCore recording
+"""
+
+import io
+import sys
+from pathlib import Path
+
+import pytest
+
+DISTRIBUTION_DIR = Path(__file__).resolve().parents[2] / 'distribution'
+sys.path.insert(0, str(DISTRIBUTION_DIR))
+
+import combat_log
+from combat_log import (ACTOR_PLAYER, ATTACK, CRIT, DAMAGE, DEFEND, ENCOUNTER_KEYS, HEADER, KILL, NO_TARGET,
+                        RECORD, START, UNKNOWN_ENCOUNTER, VICTORY, CombatLog, LogFormatError, LogReader, summarize)
+from config import ENCOUNTERS
+from game_core import GameCore, replay
+
+ACTIONS = [('new_game', 'rogue'), ('travel', 'primitive village'), ('choose', 1), ('choose', 1),
+           ('choose', 2), ('choose', 1), ('choose', 1), ('choose', 1), ('choose', 1)]
+
+
+def test_round_trip_and_streaming(tmp_path, monkeypatch):
+    """Records come back exactly, across chunk boundaries, with the seed"""
+    monkeypatch.setattr(combat_log, 'CHUNK_RECORDS', 7)
+    path = tmp_path / 'fight.cvlg'
+    log = CombatLog(2 ** 63 + 5, open(path, 'wb'))
+    expected = [(ATTACK, turn, ACTOR_PLAYER, turn % 3, turn, 100 - turn) for turn in range(100)]
+    for record in expected:
+        log.record(*record)
+    log.record(DAMAGE, 70000, 0, ACTOR_PLAYER, 40000, -40000)   # clamped to the field widths
+    log.close()
+
+    assert path.stat().st_size == HEADER.size + 101 * RECORD.size
+    with open(path, 'rb') as f:
+        reader = LogReader(f)
+        events = list(reader)
+    assert reader.seed == 2 ** 63 + 5
+    assert [tuple(event) for event in events[:-1]] == expected
+    assert tuple(events[-1]) == (DAMAGE, 70000 & 0xFFFF, 0, ACTOR_PLAYER, 32767, -32768)
+    assert events[0].name == 'attack'
+
+    with pytest.raises(LogFormatError):
+        LogReader(io.BytesIO(b'nope' + bytes(HEADER.size)))
+    with pytest.raises(LogFormatError):
+        list(LogReader(io.BytesIO(path.read_bytes()[:-1])).records())
+
+
+def test_core_records_fights():
+    """A GameCore with a log records the alley fight, and a replay records the same bytes"""
+    core = GameCore(seed=12, combat_log=CombatLog(12))
+    for action in ACTIONS:
+        core.apply(action)
+    data = core.combat_log.getvalue()
+    events = list(LogReader(io.BytesIO(data)))
+
+    assert events[0].kind == START and ENCOUNTER_KEYS[events[0].amount] == 'alley' and events[0].health == 1
+    kinds = [event.kind for event in events]
+    victory = kinds.index(VICTORY)
+    assert kinds[victory - 1] == KILL and events[victory].amount == 15
+    first_fight = events[1:victory]
+    assert [event.turn for event in first_fight] == sorted(event.turn for event in first_fight)
+    attacks = [event for event in events if event.kind in (ATTACK, CRIT)]
+    assert attacks and all(event.actor == ACTOR_PLAYER and event.target == 0 for event in attacks)
+    assert events[kinds.index(DEFEND)][2:4] == (ACTOR_PLAYER, NO_TARGET)
+    assert events[victory - 1][2:4] == (ACTOR_PLAYER, 0)
+    damage = [event for event in events if event.kind == DAMAGE]
+    assert all(event.actor == 0 and event.target == ACTOR_PLAYER and event.amount >= 0 for event in damage)
+
+    summary = summarize(LogReader(io.BytesIO(data)).records())
+    assert summary['fights'] == kinds.count(START) and summary['events'] == len(events)
+    assert summary['damage_dealt'] == sum(event.amount for event in attacks)
+
+    again = replay(ACTIONS, 12, combat_log=CombatLog(12))
+    assert again.combat_log.getvalue() == data
+
+
+def test_unknown_encounters(monkeypatch):
+    """Encounters missing from the numbered keys start, and are logged as UNKNOWN_ENCOUNTER"""
+    monkeypatch.setitem(ENCOUNTERS, 'test_only', dict(ENCOUNTERS['alley']))
+    for combat_log in (None, CombatLog(3)):
+        core = GameCore(seed=3, combat_log=combat_log)
+        core.apply(('new_game', 'warrior'))
+        core.start_encounter('test_only')
+        assert core.game_state == 'in_combat'
+    assert next(iter(LogReader(io.BytesIO(combat_log.getvalue())))).amount == UNKNOWN_ENCOUNTER
+
+
+if __name__ == "__main__":
+    test_core_records_fights()
+    print("✅ Combat log tests passed")
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Combat Solver Test - Verify exact combat odds against hand counts, the simulator and GameCore
+"""
+
+import sys
+from fractions import Fraction
+from pathlib import Path
+
+import pytest
+
+DISTRIBUTION_DIR = Path(__file__).resolve().parents[2] / 'distribution'
+sys.path.insert(0, str(DISTRIBUTION_DIR))
+
+from combat_solver import CombatSolver
+from config import ENEMY_PROFILES
+from content import load_content
+from game_core import GameCore
+
+POLICY = {'basic_attack': 0.5, 'defend': 0.3, 'run': 0.2}
+
+
+def test_exact_numbers():
+    """Small fights match outcomes counted by hand"""
+    content = load_content()
+
+    # Daggers hit for 12 or crit for 25 (30%) against 30 health: two turns
+    # if either of the first two attacks crits, otherwise three
+    rogue = CombatSolver('rogue', content=content, exact=True)
+    assert rogue.solve(80) == (1, 0, 0, Fraction(249, 100))
+
+    # Running with one health point left: escape or fall on the first turn
+    success = Fraction(str(content['classes']['mage']['combat_skills']['run']['success_chance']))
+    runner = CombatSolver('mage', policy='run', content=content, exact=True)
+    assert runner.solve(1) == (0, success, 1 - success, 1)
+
+    # A fight that is already over takes no turns
+    assert rogue.solve(80, 0).win == 1
+    assert rogue.solve(0, 30).defeat == 1
+
+
+def test_outcomes_are_distributions():
+    """Every state's outcomes sum to one, at every turn against slow and fast enemies"""
+    for enemy_key in ('ground_dwelling_creature', 'corrupted_villager', 'shadow_wraith'):
+        solver = CombatSolver('mage', policy=POLICY, enemy=ENEMY_PROFILES[enemy_key])
+        for player_health in (1, 9, 30, 60):
+            for enemy_health in (1, 15, 30):
+                for turn in range(5):
+                    outcome = solver.solve(player_health, enemy_health, turn)
+                    assert abs(outcome.win + outcome.escape + outcome.defeat - 1) < 1e-9
+                    assert outcome.expected_turns >= 1
+
+    # The wraith acts before the mage's first turn, and twice after its fifth
+    wraith = CombatSolver('mage', policy=POLICY, enemy=ENEMY_PROFILES['shadow_wraith'])
+    assert wraith.solve(60).defeat > wraith.solve(60, turn=0).defeat
+    assert wraith.solve(60, turn=4).defeat > wraith.solve(60, turn=3).defeat
+
+    odds = solver.action_odds(60)
+    assert set(odds) == {'basic_attack', 'defend', 'run'}
+    assert odds['run'].escape > odds['basic_attack'].escape
+
+    with pytest.raises(ValueError):
+        CombatSolver('mage', policy={'fireball': 1})
+
+
+def test_matches_simulator():
+    """Exact odds agree with a large Monte Carlo sample"""
+    pytest.importorskip('numpy')
+    from simulator import DEFEATED, ESCAPED, WON, simulate
+
+    for class_key, enemy_key in (('rogue', 'ground_dwelling_creature'), ('mage', 'ground_dwelling_creature'),
+                                 ('mage', 'corrupted_villager'), ('mage', 'shadow_wraith')):
+        enemy = ENEMY_PROFILES[enemy_key]
+        outcome = CombatSolver(class_key, policy=POLICY, enemy=enemy).solve(
+            load_content()['classes'][class_key]['health'])
+        stats = simulate(class_key, 200000, policy=POLICY, seed=11, enemy=enemy)
+        assert abs(stats.rate(WON) - outcome.win) < 0.005
+        assert abs(stats.rate(ESCAPED) - outcome.escape) < 0.005
+        assert abs(stats.rate(DEFEATED) - outcome.defeat) < 0.002
+        assert abs(float(stats.turns.mean()) - outcome.expected_turns) < 0.02
+
+
+def test_core_reports_odds():
+    """GameCore reports odds for the fight in progress only"""
+    core = GameCore(seed=5)
+    core.apply(('new_game', 'rogue'))
+    assert core.apply(('odds',))[0][1] == "You are not in combat!"
+
+    core.start_alley_combat()
+    core.player_health = 1
+    odds = core.combat_odds()
+    assert list(odds) == core.available_combat_skills
+    assert odds['run'].defeat > 0
+    assert odds['basic_attack'].win == CombatSolver('rogue').action_odds(1, 30)['basic_attack'].win
+    report = core.apply(('odds',))[0][1]
+    assert report.count('\n') == len(odds)
+
+
+if __name__ == "__main__":
+    test_exact_numbers()
+    test_outcomes_are_distributions()
+    test_matches_simulator()
+    test_core_reports_odds()
+    print("✅ Combat solver tests passed")
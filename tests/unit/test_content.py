@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Content System Test - Verify declarative content loading and caching
+"""
+
+import json
+import shutil
+import sys
+from pathlib import Path
+
+DISTRIBUTION_DIR = Path(__file__).resolve().parents[2] / 'distribution'
+sys.path.insert(0, str(DISTRIBUTION_DIR))
+
+import content
+from content import ContentError, compile_content, load_content
+
+
+def _copy_content(tmp_path):
+    """Copy the shipped content files into a scratch directory"""
+    content_dir = tmp_path / 'data'
+    content_dir.mkdir()
+    for name in content.SOURCE_FILES:
+        shutil.copy(content.CONTENT_DIR / f"{name}.json", content_dir)
+    return content_dir
+
+
+def test_shipped_content_compiles():
+    """The shipped content files validate and expose every section"""
+    compiled = compile_content()
+    assert set(compiled['classes']) == {'warrior', 'rogue', 'mage'}
+    assert len(compiled['weapons']) == 15
+    assert compiled['consequences']['gained_villagers_trust']['effect'] == ('gain_experience', (10,))
+    assert compiled['consequences']['sat_and_cried']['effect'] is None
+    assert compiled['consequences']['searched_alley_items']['effect'] == ('search_alley_items', (('Rusty Dagger',),))
+    assert set(compiled['scene_choices']) <= set(compiled['scene_descriptions'])
+
+
+def test_cache_is_keyed_by_content_hash(tmp_path):
+    """Editing a content file produces a new cache blob"""
+    content_dir = _copy_content(tmp_path)
+    first = load_content(content_dir)
+    blobs = list((content_dir / content.CACHE_DIRNAME).glob('content-*.pickle'))
+    assert len(blobs) == 1
+    assert load_content(content_dir) == first
+
+    scenes_path = content_dir / 'scenes.json'
+    scenes = json.loads(scenes_path.read_text())
+    scenes['cave_entrance']['description'] = "A brand new description."
+    scenes_path.write_text(json.dumps(scenes))
+
+    second = load_content(content_dir)
+    assert second['scene_descriptions']['cave_entrance'] == "A brand new description."
+    new_blobs = list((content_dir / content.CACHE_DIRNAME).glob('content-*.pickle'))
+    assert len(new_blobs) == 1 and new_blobs != blobs
+
+
+def test_cache_follows_compiler_modules(tmp_path, monkeypatch):
+    """A changed compiler module or an unloadable blob recompiles instead of serving stale content"""
+    content_dir = _copy_content(tmp_path)
+    load_content(content_dir)
+    old_key = content.content_hash(content._read_sources(content_dir))
+    monkeypatch.setattr(content, '_compiler_digest', b'edited config.py')
+    assert content.content_hash(content._read_sources(content_dir)) != old_key
+
+    blob = content_dir / content.CACHE_DIRNAME / f"content-{content.content_hash(content._read_sources(content_dir))}.pickle"
+    blob.write_bytes(b'\x80\x04cno_such_module\nGone\n.')  # unpickling raises ImportError
+    assert load_content(content_dir)['classes'].keys() == {'warrior', 'rogue', 'mage'}
+
+
+def test_unknown_effect_op_is_rejected(tmp_path):
+    """Consequences naming an unknown effect op fail to compile"""
+    content_dir = _copy_content(tmp_path)
+    path = content_dir / 'consequences.json'
+    consequences = json.loads(path.read_text())
+    consequences['sat_and_cried']['effect'] = {'op': 'summon_dragon'}
+    path.write_text(json.dumps(consequences))
+    try:
+        compile_content(content_dir)
+    except ContentError as e:
+        assert 'summon_dragon' in str(e)
+    else:
+        raise AssertionError("unknown effect op was accepted")
+
+
+def test_effect_argument_types_are_checked(tmp_path):
+    """Effect op arguments must match the op signature"""
+    content_dir = _copy_content(tmp_path)
+    path = content_dir / 'consequences.json'
+    consequences = json.loads(path.read_text())
+    consequences['met_chief']['effect'] = {'op': 'gain_experience', 'args': ['lots']}
+    path.write_text(json.dumps(consequences))
+    try:
+        compile_content(content_dir)
+    except ContentError as e:
+        assert 'gain_experience' in str(e)
+    else:
+        raise AssertionError("bad effect argument was accepted")
+
+
+def test_consequence_needs_progress_flag(tmp_path):
+    """Consequences without a registered progress flag fail to compile"""
+    content_dir = _copy_content(tmp_path)
+    path = content_dir / 'consequences.json'
+    consequences = json.loads(path.read_text())
+    consequences['danced_with_skulls'] = {'text': "You dance."}
+    path.write_text(json.dumps(consequences))
+    try:
+        compile_content(content_dir)
+    except ContentError as e:
+        assert 'danced_with_skulls' in str(e)
+    else:
+        raise AssertionError("consequence without a progress flag was accepted")
+
+
+def test_dangling_references_are_rejected(tmp_path):
+    """Choices, locks, effects and starting items must name things the content defines"""
+    edits = (
+        ('scenes.json', lambda d: d['village_changed']['choices'][1].update(consequence='saved_everyone'),
+         'saved_everyone'),
+        ('scenes.json', lambda d: d['armory'].update(lock='Skeleton Key'), 'Skeleton Key'),
+        ('consequences.json', lambda d: d['returned_to_village'].update(
+            effect={'op': 'advance_to_scene', 'args': ['moon']}), 'moon'),
+        ('classes.json', lambda d: d['mage']['combat_skills'].update(fireball={}), 'fireball'),
+        ('classes.json', lambda d: d['rogue']['starting_items'].append('Lucky Charm'), 'Lucky Charm'),
+        ('consequences.json', lambda d: d['searched_alley_items'].update(
+            effect={'op': 'search_alley_items', 'args': [['Silver Spoon']]}), 'Silver Spoon'),
+    )
+    for filename, edit, expected in edits:
+        scratch = tmp_path / expected.replace(' ', '_')
+        scratch.mkdir()
+        content_dir = _copy_content(scratch)
+        path = content_dir / filename
+        data = json.loads(path.read_text())
+        edit(data)
+        path.write_text(json.dumps(data))
+        try:
+            compile_content(content_dir)
+        except ContentError as e:
+            assert expected in str(e)
+        else:
+            raise AssertionError(f"dangling reference to {expected} was accepted")
+
+
+def test_dense_integer_ids():
+    """Scenes and consequences are numbered densely and choices use the numbers"""
+    compiled = compile_content()
+    assert compiled['scene_ids'][compiled['scene_index']['armory']] == 'armory'
+    assert sorted(compiled['consequence_index'].values()) == list(range(len(compiled['consequence_ids'])))
+    village = compiled['choice_table'][compiled['scene_index']['village_changed']]
+    names = [compiled['consequence_ids'][number] for number in village]
+    assert names == [choice['consequence'] for choice in compiled['scene_choices']['village_changed']]
+    text, effect, flag = compiled['consequence_table'][village[1]]
+    assert flag == compiled['consequences']['protected_villagers']['flag']
+
+
+if __name__ == "__main__":
+    import tempfile
+    test_shipped_content_compiles()
+    test_dense_integer_ids()
+    for test in (test_cache_is_keyed_by_content_hash, test_unknown_effect_op_is_rejected,
+                 test_effect_argument_types_are_checked, test_consequence_needs_progress_flag,
+                 test_dangling_references_are_rejected):
+        with tempfile.TemporaryDirectory() as tmp:
+            test(Path(tmp))
+    print("✅ Content system tests passed")
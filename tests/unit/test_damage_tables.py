@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Damage Tables Test - Verify precomputed attack damage matches the combat rules
+"""
+
+import sys
+from pathlib import Path
+
+DISTRIBUTION_DIR = Path(__file__).resolve().parents[2] / 'distribution'
+sys.path.insert(0, str(DISTRIBUTION_DIR))
+
+from content import load_content
+from damage_tables import TABLE_STATS, DamageTables
+from game_core import GameCore
+
+STAT_FACTORS = {'warrior': ('strength', 0.5), 'rogue': ('agility', 0.3), 'mage': ('intelligence', 0.4)}
+
+
+def _expected(content, class_key, weapon, stat_value, critical):
+    """The attack formula written out longhand"""
+    skill = content['classes'][class_key]['combat_skills']['basic_attack']
+    base_damage = content['weapons'][weapon]['damage'] * skill['damage_multiplier']
+    base_damage += stat_value * STAT_FACTORS[class_key][1]
+    if critical:
+        base_damage *= 2
+    return int(base_damage)
+
+
+def test_tables_cover_every_class_and_weapon():
+    """Every class/weapon/stat entry equals the formula, inside and past the table"""
+    content = load_content()
+    tables = content['damage_tables']
+    for class_key in content['classes']:
+        assert tables.class_stat[class_key] == STAT_FACTORS[class_key][0]
+        for weapon in content['weapons']:
+            for stat_value in (0, 5, 18, TABLE_STATS - 1, TABLE_STATS + 10):
+                assert tables.lookup(class_key, weapon, stat_value) == (
+                    _expected(content, class_key, weapon, stat_value, False),
+                    _expected(content, class_key, weapon, stat_value, True))
+    assert tables == DamageTables(content['classes'], content['weapons'])
+
+
+def test_core_attacks_read_the_tables():
+    """perform_attack deals the table damage, doubled on a critical hit"""
+    content = load_content()
+    for class_key, class_data in content['classes'].items():
+        for critical in (False, True):
+            core = GameCore(content, history_depth=0)
+            core.apply(('new_game', class_key))
+            core.combat_enemy_health = 1000
+            core.streams.combat = type('Roll', (), {'random': staticmethod(lambda: 0.0 if critical else 1.0)})()
+            skill = class_data['combat_skills']['basic_attack']
+            core.perform_attack(skill)
+            critical = critical and 'critical_chance' in skill
+            stat_value = class_data[STAT_FACTORS[class_key][0]]
+            expected = _expected(content, class_key, class_data['starting_weapon'], stat_value, critical)
+            assert 1000 - core.combat_enemy_health == expected
+
+
+if __name__ == "__main__":
+    test_tables_cover_every_class_and_weapon()
+    test_core_attacks_read_the_tables()
+    print("✅ Damage tables tests passed")
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Encounter Test - Verify initiative order, lazy removal and multi-enemy fights in GameCore
+"""
+
+import sys
+from pathlib import Path
+
+DISTRIBUTION_DIR = Path(__file__).resolve().parents[2] / 'distribution'
+sys.path.insert(0, str(DISTRIBUTION_DIR))
+
+from config import ENCOUNTERS, ENEMY_PROFILES, PLAYER_SPEED
+from encounter import INITIATIVE_TICKS, PLAYER, Encounter, lone_enemy_turns
+from game_core import GameCore
+from snapshot import capture
+
+PROFILES = {
+    'fast': {'name': 'Fast', 'health': 5, 'damage': (1, 1), 'speed': 20},
+    'slow': {'name': 'Slow', 'health': 5, 'damage': (1, 1), 'speed': 5},
+}
+
+
+def test_initiative_order():
+    """Speed sets how often a combatant acts; the player wins ties"""
+    encounter = Encounter.from_roster((('fast', 1), ('slow', 1)), PROFILES, player_speed=10)
+    order = [encounter.next_turn() for _ in range(7)]
+    # fast acts at 60, 120, 180, 240; player at 120, 240; slow at 240
+    assert order == [0, PLAYER, 0, 0, PLAYER, 0, 1]
+
+    same = Encounter.from_roster((('ground_dwelling_creature', 1),), ENEMY_PROFILES, PLAYER_SPEED)
+    assert [same.next_turn() for _ in range(4)] == [PLAYER, 0, PLAYER, 0]
+    assert INITIATIVE_TICKS % PLAYER_SPEED == 0
+
+
+def test_lone_enemy_turns():
+    """One enemy's turns per player turn repeat over the cycle of both delays"""
+    assert lone_enemy_turns(10, 10) == (0, (1,))
+    assert lone_enemy_turns(10, 20) == (1, (2,))
+    assert lone_enemy_turns(10, 5) == (0, (0, 1))
+    # wraith at 100, 200, ..., 600 ties the player's fifth turn and waits for it
+    assert lone_enemy_turns(10, 12) == (1, (1, 1, 1, 1, 2))
+
+
+def test_lookup_defeat_and_swarms():
+    """Stat blocks are found by id and defeated enemies drop out of both queues"""
+    encounter = Encounter.from_roster((('slow', 50000), ('fast', 1)), PROFILES, player_speed=10)
+    assert len(encounter) == encounter.remaining == 50001
+    assert encounter.lookup('fast#1')['speed'] == 20
+    assert encounter.lookup('slow#7')['name'] == 'Slow 7'
+
+    assert encounter.front() == 0
+    encounter.defeat(0)
+    encounter.defeat(0)
+    assert encounter.remaining == 50000 and encounter.front() == 1
+    encounter.defeat(encounter.index['fast#1'])
+    turns = [encounter.next_turn() for _ in range(4)]
+    assert turns[0] == PLAYER and 0 not in turns and encounter.index['fast#1'] not in turns
+
+    copy = encounter.copy()
+    assert copy == encounter
+    copy.defeat(1)
+    assert encounter.alive[1] and copy != encounter
+
+
+def test_core_finale_swarm():
+    """The village finale fights every enemy of its roster in turn"""
+    definition = ENCOUNTERS['village_finale']
+    core = GameCore(seed=4)
+    core.apply(('new_game', 'warrior'))
+    core.player_health = 10000
+    core.start_encounter('village_finale')
+    core.history.clear()
+    core.history.push(core)
+    start = capture(core)
+    assert core.encounter.remaining == sum(count for _, count in definition['enemies'])
+    assert core.combat_enemy == 'Corrupted Villager 1'
+
+    core.apply(('choose', 1))
+    assert core.combat_enemy == 'Corrupted Villager 2'
+    core.apply(('undo',))
+    assert capture(core) == start and core.encounter.remaining == 7
+
+    while core.game_state == 'in_combat':
+        events = core.apply(('choose', 1))
+    assert core.encounter is None
+    assert core.player_health < 10000
+    assert f"You defeat the {ENEMY_PROFILES['shadow_wraith']['name']}!" in [payload for _, payload in events]
+
+
+if __name__ == "__main__":
+    test_initiative_order()
+    test_lookup_defeat_and_swarms()
+    test_core_finale_swarm()
+    print("✅ Encounter tests passed")
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Equipment Test - Verify worn items fold into cached effective stats used by combat
+"""
+
+import sys
+from pathlib import Path
+
+DISTRIBUTION_DIR = Path(__file__).resolve().parents[2] / 'distribution'
+sys.path.insert(0, str(DISTRIBUTION_DIR))
+
+from combat_solver import CombatSolver
+from equipment import STAT_FIELDS, armor_absorbs, base_stats, effective_stats
+from game_core import GameCore, parse_command
+
+
+def worn_stats(core):
+    worn = [core.item_registry.get(name) for name in [core.equipped_armor, *core.equipped_accessories] if name]
+    return effective_stats(base_stats(core.classes[core.player_character]), worn)
+
+
+def test_equipping_updates_the_aggregate():
+    """Each equip and unequip adjusts the cached stats to what a full recompute gives"""
+    core = GameCore(seed=5)
+    core.apply(('new_game', 'warrior'))
+    core.inventory.extend(['Chain Mail', 'Ring of Strength', 'Amulet of Health', 'Boots of Speed', 'Crystal of Power'])
+
+    for action in [parse_command('equip leather armor'), ('equip', 'Ring of Strength'),
+                   ('equip', 'amulet of health'), ('equip', 'Chain Mail'), ('equip', 'Boots of Speed'),
+                   ('equip', 'Crystal of Power'), ('unequip', 'Ring of Strength'), ('equip', 'Crystal of Power')]:
+        core.apply(action)
+        assert {field: getattr(core, field) for field in STAT_FIELDS} == worn_stats(core)
+
+    assert core.equipped_armor == 'Chain Mail' and core.player_defense == 10
+    assert core.equipped_accessories == ['Amulet of Health', 'Boots of Speed', 'Crystal of Power']
+    assert core.player_max_health == 140 and core.player_agility == 10 and core.player_strength == 15
+    assert core.apply(('equip', 'Ring of Strength'))[0][1].startswith("You can't wear more than 3")
+
+    core.player_health = 135
+    core.apply(('unequip', 'Amulet of Health'))
+    assert core.player_max_health == 120 and core.player_health == 120
+    core.apply(('undo',))
+    assert core.player_max_health == 140 and core.player_health == 135
+    assert core.apply(('unequip', 'Iron Sword'))[0][1] == "You need a weapon; equip another one instead."
+
+
+def test_combat_reads_the_cached_stats():
+    """Strength from a ring raises damage, plate armor lowers every hit, and the odds know about both"""
+    core = GameCore(seed=9)
+    core.apply(('new_game', 'warrior'))
+    core.inventory.extend(['Plate Armor', 'Ring of Strength'])
+    core.apply(('equip', 'Plate Armor'))
+    core.apply(('equip', 'Ring of Strength'))
+    core.apply(('travel', 'primitive village'))
+    for action in [('choose', 1), ('choose', 1)]:
+        core.apply(action)
+    assert core.game_state == "in_combat"
+
+    expected, _ = core.damage_tables.lookup('warrior', 'Iron Sword', 18)
+    events = core.apply(('choose', 1))
+    assert (('message', f"You deal {expected} damage to the {core.combat_enemy}!")) in events
+    assert any(text.startswith("Your armor absorbs") for kind, text in events if kind == 'message')
+    assert core.apply(('equip', 'Leather Armor'))[0][1] == "You can't change equipment in the middle of combat!"
+
+    assert armor_absorbs(15, 10) == 1 and armor_absorbs(8, 15) == 1
+    plain = CombatSolver('warrior', stat_value=18).solve(100)
+    armored = CombatSolver('warrior', stat_value=18, defense=15).solve(100)
+    assert armored.win >= plain.win and armored.defeat <= plain.defeat
+
+
+if __name__ == "__main__":
+    test_equipping_updates_the_aggregate()
+    test_combat_reads_the_cached_stats()
+    print("✅ Equipment tests passed")
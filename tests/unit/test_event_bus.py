@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Event Bus Test - Verify subscription, per-frame delivery and coalescing
+"""
+
+import sys
+from pathlib import Path
+
+DISTRIBUTION_DIR = Path(__file__).resolve().parents[2] / 'distribution'
+sys.path.insert(0, str(DISTRIBUTION_DIR))
+
+from event_bus import DISPLAY, INVENTORY, MESSAGE, QUIT, SCENE, EventBus, coalesce
+from game_core import GameCore
+
+
+def test_coalesce_keeps_messages_and_last_scene():
+    """Messages survive in order; scene and display bursts collapse to one"""
+    events = [(MESSAGE, 'a'), (DISPLAY, None), (SCENE, 'alley'), (MESSAGE, 'b'),
+              (DISPLAY, None), (SCENE, 'armory'), (MESSAGE, 'c'), (DISPLAY, None)]
+    assert coalesce(events) == [(MESSAGE, 'a'), (MESSAGE, 'b'), (SCENE, 'armory'),
+                                (MESSAGE, 'c'), (DISPLAY, None)]
+    assert coalesce([(QUIT, None), (MESSAGE, 'bye')]) == [(MESSAGE, 'bye'), (QUIT, None)]
+
+
+def test_coalesce_merges_inventory_changes():
+    """Inventory changes merge into one set; a replacement in the frame wins"""
+    events = [(INVENTORY, 3), (DISPLAY, None), (INVENTORY, 5), (INVENTORY, 3)]
+    assert coalesce(events) == [(INVENTORY, frozenset({3, 5})), (DISPLAY, None)]
+    assert coalesce([(INVENTORY, 3), (INVENTORY, None), (INVENTORY, 4)]) == [(INVENTORY, None)]
+
+
+def test_bus_flushes_once_per_frame():
+    """Subscribers hear nothing until the scheduled flush runs"""
+    scheduled = []
+    bus = EventBus(schedule=scheduled.append)
+    redraws = []
+    messages = []
+    bus.subscribe(MESSAGE, messages.append)
+    bus.subscribe(DISPLAY, redraws.append)
+
+    bus.publish(MESSAGE, 'one')
+    bus.publish(DISPLAY)
+    bus.publish_many([(MESSAGE, 'two'), (DISPLAY, None)])
+    assert len(scheduled) == 1 and not messages
+
+    scheduled.pop()()
+    assert messages == ['one', 'two']
+    assert redraws == [None]
+    assert bus.pending == []
+
+
+def test_core_publishes_to_bus():
+    """A core action that changes state many times refreshes the view once"""
+    bus = EventBus()
+    core = GameCore(bus=bus)
+    redraws = []
+    scenes = []
+    bus.subscribe(DISPLAY, redraws.append)
+    bus.subscribe(SCENE, scenes.append)
+
+    events = core.apply(('new_game', 'warrior'))
+    core.apply(('travel', 'alley'))
+    assert sum(kind == DISPLAY for kind, _ in events) >= 1
+    bus.flush()
+    assert redraws == [None]
+    assert scenes == ['alley']
+
+
+if __name__ == "__main__":
+    test_coalesce_keeps_messages_and_last_scene()
+    test_coalesce_merges_inventory_changes()
+    test_bus_flushes_once_per_frame()
+    test_core_publishes_to_bus()
+    print("✅ Event bus tests passed")
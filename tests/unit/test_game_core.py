@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Game Core Test - Verify the headless game state machine
+"""
+
+import sys
+from pathlib import Path
+
+DISTRIBUTION_DIR = Path(__file__).resolve().parents[2] / 'distribution'
+sys.path.insert(0, str(DISTRIBUTION_DIR))
+
+import content
+from game_core import GameCore, parse_command, ACTIONS, EFFECT_OPS, MESSAGE, SCENE, DISPLAY, QUIT
+from progress import NO_PROGRESS, Progress
+from registry import HandlerRegistry
+
+
+def _new_core(class_key='warrior', seed=1):
+    """Start a fresh game with a seeded RNG"""
+    core = GameCore(seed=seed)
+    core.apply(('new_game', class_key))
+    return core
+
+
+def test_new_game_sets_up_class():
+    """Starting a game applies the class stats and describes the first scene"""
+    core = GameCore()
+    events = core.apply(('new_game', 'rogue'))
+    assert (SCENE, 'cave_entrance') in events
+    assert core.player_character == 'rogue'
+    assert core.player_health == core.classes['rogue']['health']
+    assert core.inventory == ['Daggers', 'Health Potion', 'Leather Armor']
+    assert core.game_progress == NO_PROGRESS
+
+
+def test_actions_require_a_game():
+    """Gameplay actions are refused until a class has been chosen"""
+    core = GameCore()
+    assert core.apply(('choose', 1)) == [(MESSAGE, "Choose a class to begin your adventure.")]
+    assert core.apply(('quit',)) == [(QUIT, None)]
+
+
+def test_choice_applies_consequence():
+    """Choices run their consequence effect and record progress"""
+    core = _new_core()
+    events = core.apply(('choose', 3))
+    assert core.current_scene == 'skull_chamber'
+    assert core.game_progress == Progress.ENTERED_SKULL_CHAMBER
+    assert (DISPLAY, None) in events
+
+    events = core.apply(('choose', 9))
+    assert events == [(MESSAGE, "Please enter a number between 1 and 2.")]
+
+
+def test_movement_respects_locks():
+    """Exits lead between scenes and locked scenes need their key"""
+    core = _new_core()
+    core.apply(('move', 'north'))
+    core.apply(('move', 'west'))
+    assert core.current_scene == 'primitive_village'
+
+    events = core.apply(('move', 'west'))
+    assert core.current_scene == 'primitive_village'
+    assert 'Armory Key' in events[0][1]
+
+    core.inventory.append('Armory Key')
+    core.apply(('move', 'west'))
+    assert core.current_scene == 'armory'
+    assert core.apply(('move', 'north')) == [(MESSAGE, "You can't go north from here.")]
+
+
+def test_alley_combat_resolves():
+    """Fighting the alley creature always ends in victory, escape or defeat"""
+    for seed in range(20):
+        core = _new_core('mage', seed)
+        core.apply(('move', 'north'))
+        core.apply(('move', 'west'))
+        core.apply(('choose', 1))
+        core.apply(('choose', 1))
+        assert core.game_state == 'in_combat'
+        for _ in range(50):
+            if core.game_state != 'in_combat':
+                break
+            core.apply(('choose', 1))
+        assert core.game_state == 'exploring'
+
+
+def test_parse_command():
+    """Typed commands normalize to core actions"""
+    assert parse_command(" 2 ") == ('choose', 2)
+    assert parse_command("go North") == ('move', 'north')
+    assert parse_command("w") == ('move', 'west')
+    assert parse_command("inv") == ('inventory',)
+    assert parse_command("dance") is None
+    assert parse_command("") is None
+
+
+
+def test_registries_cover_content_ops():
+    """Every effect op content may name has a registered handler"""
+    assert set(EFFECT_OPS) == set(content.EFFECT_OPS)
+    assert ACTIONS.aliases['inv'] == 'inventory'
+
+
+def test_registry_rejects_duplicates():
+    """Registering the same name twice is an error"""
+    registry = HandlerRegistry('test')
+    registry.register('jump', aliases=('j',))(lambda self: None)
+    for name, aliases in (('jump', ()), ('hop', ('j',))):
+        try:
+            registry.register(name, aliases=aliases)(lambda self: None)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError(f"duplicate registration of {name} was accepted")
+
+
+if __name__ == "__main__":
+    test_new_game_sets_up_class()
+    test_actions_require_a_game()
+    test_choice_applies_consequence()
+    test_movement_respects_locks()
+    test_alley_combat_resolves()
+    test_parse_command()
+    test_registries_cover_content_ops()
+    test_registry_rejects_duplicates()
+    print("✅ Game core tests passed")
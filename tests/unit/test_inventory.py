@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Inventory Store Test - Verify the category indexes behind GameCore's inventory
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+DISTRIBUTION_DIR = Path(__file__).resolve().parents[2] / 'distribution'
+sys.path.insert(0, str(DISTRIBUTION_DIR))
+
+from content import load_content
+from game_core import GameCore
+from inventory import InventoryStore
+
+
+def test_indexes_follow_every_change():
+    """Counts and category views update on insert, removal and replacement"""
+    registry = load_content()['item_registry']
+    store = InventoryStore(registry, ['Iron Sword', 'Health Potion'])
+    weapons, keys = store.category('weapon'), store.category('key')
+    store.extend(['Armory Key', 'Health Potion', 'Gold Coins'])
+
+    assert store == ['Iron Sword', 'Health Potion', 'Armory Key', 'Health Potion', 'Gold Coins']
+    assert 'Armory Key' in store and store.count('Health Potion') == 2
+    assert list(weapons) == ['Iron Sword'] and list(keys) == ['Armory Key']
+    assert store.category_counts('consumable') == {'Health Potion': 2}
+    assert list(store.category('misc')) == ['Gold Coins']
+
+    store.remove('Health Potion')
+    assert store.count('Health Potion') == 1 and store[1] == 'Armory Key'
+    store.remove('Armory Key')
+    assert 'Armory Key' not in store and not keys
+    with pytest.raises(ValueError):
+        store.remove('Armory Key')
+
+    store.replace(('Chain Mail',))
+    assert store.as_tuple() == ('Chain Mail',) and not weapons
+    assert store.id_tuple() == (registry.get('Chain Mail').item_id,)
+    assert list(store.category('armor')) == ['Chain Mail']
+
+
+def test_core_inventory_survives_undo():
+    """Undo restores the inventory and its indexes"""
+    core = GameCore(seed=3)
+    core.apply(('new_game', 'warrior'))
+    found = core.inventory.category('misc')
+    core.apply(('move', 'north'))
+    core.apply(('move', 'west'))
+    core.apply(('choose', 1))          # follow the creature into the alley
+    core.apply(('choose', 3))          # search the alley
+    assert list(found) == ['Rusty Dagger']
+
+    core.apply(('undo',))
+    assert 'Rusty Dagger' not in core.inventory and not found
+    assert list(core.inventory.category('weapon')) == ['Iron Sword']
+
+
+if __name__ == "__main__":
+    test_indexes_follow_every_change()
+    test_core_inventory_survives_undo()
+    print("✅ Inventory store tests passed")
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Inventory View Test - Verify the stack rows follow inventory change events
+"""
+
+import sys
+from pathlib import Path
+
+DISTRIBUTION_DIR = Path(__file__).resolve().parents[2] / 'distribution'
+sys.path.insert(0, str(DISTRIBUTION_DIR))
+
+from event_bus import INVENTORY, EventBus
+from game_core import GameCore
+from inventory_view import InventoryRows
+
+
+def test_rows_follow_changes():
+    """Each payload moves only the rows it touches and reports the first one"""
+    core = GameCore(seed=2)
+    core.apply(('new_game', 'warrior'))
+    rows = InventoryRows(core.inventory)
+    armor = InventoryRows(core.inventory, ('armor',))
+    assert [row[0] for row in rows.window(0, 10)] == ['Iron Sword', 'Health Potion', 'Leather Armor']
+    assert rows.row(0) == ('Iron Sword', 'Weapon', '1', '12 damage') and len(armor) == 1
+
+    changed = []
+    core.inventory.on_change = changed.append
+    core.inventory.append('Health Potion')
+    assert rows.apply(frozenset(changed)) == 1 and rows.row(1)[2] == '2'
+    assert armor.apply(frozenset(changed)) == len(armor)
+
+    changed.clear()
+    core.inventory.remove('Iron Sword')
+    core.inventory.extend(['Gold Coins'] * 3)
+    assert rows.apply(frozenset(changed)) == 0
+    assert [row[0] for row in rows.window(0, 10)] == ['Health Potion', 'Leather Armor', 'Gold Coins']
+    assert rows.window(2, 10) == [('Gold Coins', 'Misc', '3', 'A handful of old village coins')]
+
+    core.inventory.replace(['Chain Mail'])
+    assert changed[-1] is None and rows.apply(None) == 0 and armor.apply(None) == 0
+    assert len(rows) == 1 and armor.row(0)[0] == 'Chain Mail'
+
+
+def test_thousands_of_stacks_page_cheaply():
+    """A window of a huge inventory reads only the rows it shows"""
+    core = GameCore(seed=2)
+    core.apply(('new_game', 'mage'))
+    core.inventory.extend(f"Trinket {number}" for number in range(5000))
+    rows = InventoryRows(core.inventory)
+    assert len(rows) == 5003
+    assert [row[0] for row in rows.window(4990, 20)][-1] == 'Trinket 4999'
+    assert len(rows.window(4990, 20)) == 13
+
+
+def test_core_publishes_coalesced_inventory_events():
+    """A frame delivers one INVENTORY event: the changed ids, or None after a replacement"""
+    bus = EventBus()
+    delivered = []
+    bus.subscribe(INVENTORY, delivered.append)
+    core = GameCore(seed=4, bus=bus)
+    core.apply(('new_game', 'rogue'))
+    bus.flush()
+    assert delivered == [None]
+
+    core.apply(('move', 'north'))
+    core.apply(('move', 'west'))
+    core.apply(('choose', 1))
+    core.apply(('choose', 3))          # search the alley
+    bus.flush()
+    assert delivered[-1] == frozenset({core.item_registry.id_of('Rusty Dagger')})
+
+
+if __name__ == "__main__":
+    test_rows_follow_changes()
+    test_thousands_of_stacks_page_cheaply()
+    test_core_publishes_coalesced_inventory_events()
+    print("✅ Inventory view tests passed")
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Item Test - Verify the stacked, indexed inventory
+"""
+
+import sys
+from pathlib import Path
+
+DISTRIBUTION_DIR = Path(__file__).resolve().parents[2] / 'distribution'
+sys.path.insert(0, str(DISTRIBUTION_DIR))
+
+from item import Inventory, Item, dagger
+from scenes import check_scene_access, setup_scenes
+
+
+def test_stacks_and_categories():
+    """Copies stack by name and every category indexes its stacks"""
+    inventory = Inventory()
+    potion = Item("Health Potion", "Restores health", 'consumable')
+    inventory.add_item(potion)
+    inventory.add_item(potion, count=2)
+    inventory.add_item(dagger)
+    inventory.add_item(Item("Armory Key", "Opens the armory"))
+
+    assert len(inventory) == 5 and inventory.count("Health Potion") == 3
+    assert "Armory Key" in inventory and inventory.has_item("Dagger")
+    keys = inventory.category('key')
+    assert set(keys) == {"Armory Key"}
+    assert set(inventory.category('weapon')) == {"Dagger"}
+    assert [item.name for item in inventory.items].count("Health Potion") == 3
+
+    assert inventory.remove_item("Health Potion")
+    assert inventory.count("Health Potion") == 2 and len(inventory) == 4
+    assert inventory.remove_item("Armory Key")
+    assert not inventory.has_item("Armory Key") and not keys   # views are live
+    assert not inventory.remove_item("Armory Key")
+
+
+def test_messages_go_to_the_sink(capsys):
+    """Inventory messages reach the sink and never stdout"""
+    messages = []
+    inventory = Inventory(sink=messages.append)
+    inventory.add_item(dagger)
+    inventory.remove_item("Wand")
+    inventory.list_items()
+    assert messages == ["Added Dagger to inventory.", "Item Wand not found.",
+                        f"Dagger: {dagger.description}"]
+
+    silent = Inventory()
+    silent.add_item(dagger)
+    silent.list_items()
+    assert capsys.readouterr().out == ""
+
+
+def test_scene_access_uses_the_index():
+    """Locked scenes check the inventory by name"""
+    armory = setup_scenes()['Armory']
+    player = type('Player', (), {})()
+    player.inventory = Inventory()
+    assert not check_scene_access(armory, player)
+    player.inventory.add_item(Item(armory.key, "Opens the armory"))
+    assert check_scene_access(armory, player)
+
+
+if __name__ == "__main__":
+    test_stacks_and_categories()
+    test_scene_access_uses_the_index()
+    print("✅ Item tests passed")
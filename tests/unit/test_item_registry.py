@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Item Registry Test - Verify the interned, immutable item definitions of each content
+"""
+
+import json
+import pickle
+import sys
+from pathlib import Path
+
+import pytest
+
+DISTRIBUTION_DIR = Path(__file__).resolve().parents[2] / 'distribution'
+sys.path.insert(0, str(DISTRIBUTION_DIR))
+
+import content
+from content import compile_content
+from game_core import GameCore
+from inventory import InventoryStore
+from item import Inventory, Item, Weapon, dagger
+from item_registry import ITEMS, ItemDef, ItemRegistry
+
+
+def test_definitions_are_interned_and_immutable():
+    """A name has one definition and one id; definitions cannot be changed"""
+    registry = ItemRegistry()
+    key = registry.intern(ItemDef("Town Key", "Opens the town gate"))
+    assert key.category == 'key' and key.item_id == 0
+    assert registry.intern(ItemDef("Town Key", "Built again on the fly")) is key
+    assert registry.id_of("Town Key") == 0 and registry.id_of("Gold Coins") == 1
+    assert registry[1].category == 'misc' and len(registry) == 2
+
+    with pytest.raises(AttributeError):
+        key.description = "changed"
+    with pytest.raises(AttributeError):
+        dagger.damage = 99
+    assert pickle.loads(pickle.dumps(dagger)) == dagger
+
+    edited = registry.define(ItemDef("Town Key", "Opens the new gate"))
+    assert edited.item_id == 0 and registry.get("Town Key") is edited
+
+
+def test_each_content_has_its_own_registry():
+    """Cores with different content keep separate definitions; the text engine keeps ITEMS"""
+    core = GameCore(seed=1)
+    core.apply(('new_game', 'warrior'))
+    sword = core.item_registry.get('Iron Sword')
+    assert sword.damage == 12 and core.inventory.id_tuple()[0] == sword.item_id
+
+    raw = content._read_sources(content.CONTENT_DIR)
+    items = json.loads(raw['items'])
+    items['Health Potion']['description'] = "Tastes of cave mud"
+    raw['items'] = json.dumps(items).encode()
+    other = GameCore(content=compile_content(raw=raw), seed=1)
+    assert other.item_registry is not core.item_registry
+    assert other.item_registry.get('Health Potion').description == "Tastes of cave mud"
+    assert core.item_registry.get('Health Potion').description != "Tastes of cave mud"
+    assert 'Iron Sword' not in ITEMS
+
+    inventory = Inventory()
+    inventory.add_item(Item('Dagger', 'A copy built by hand'))
+    assert next(iter(inventory)) is dagger
+    assert isinstance(dagger, Weapon) and ITEMS.get('Dagger') is dagger
+
+
+def test_redefined_items_stay_removable():
+    """A carried item redefined in another category is filed where it was picked up until it leaves"""
+    registry = ItemRegistry()
+    store = InventoryStore(registry, ['Odd Stone'])
+    registry.define(ItemDef('Odd Stone', "It glows", 'consumable'))
+    assert list(store.category('misc')) == ['Odd Stone']
+    store.remove('Odd Stone')
+    assert len(store) == 0 and not store.category('misc')
+    store.append('Odd Stone')
+    assert list(store.category('consumable')) == ['Odd Stone']
+
+    inventory = Inventory()
+    inventory.add_item(Item('Shifting Stone'))
+    ITEMS.define(ItemDef('Shifting Stone', "It hums", 'consumable'))
+    assert inventory.remove_item('Shifting Stone') and not inventory.category('misc')
+
+if __name__ == "__main__":
+    test_definitions_are_interned_and_immutable()
+    test_each_content_has_its_own_registry()
+    test_redefined_items_stay_removable()
+    print("✅ Item registry tests passed")
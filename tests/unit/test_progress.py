@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Progress Flags Test - Verify the bitset progress registry
+"""
+
+import sys
+from pathlib import Path
+
+DISTRIBUTION_DIR = Path(__file__).resolve().parents[2] / 'distribution'
+sys.path.insert(0, str(DISTRIBUTION_DIR))
+
+from content import compile_content
+from progress import Progress, NO_PROGRESS, flag_for, flag_names, flags_from_names
+
+
+def test_flags_are_stable_single_bits():
+    """Each flag is one distinct bit and the saved positions never move"""
+    values = [int(flag) for flag in Progress]
+    assert len(set(values)) == len(values)
+    assert all(value & (value - 1) == 0 for value in values)
+    assert Progress.VISITED_VILLAGE == 1
+    assert Progress.LEARNED_WEAPON_MAINTENANCE == 1 << 27
+
+
+def test_every_consequence_has_a_flag():
+    """Compiled consequences carry the bit of their progress flag"""
+    consequences = compile_content()['consequences']
+    for name, consequence in consequences.items():
+        assert consequence['flag'] == flag_for(name)
+
+
+def test_names_round_trip():
+    """Progress converts to and from consequence names"""
+    progress = flags_from_names(['sat_and_cried', 'used_armory_key'])
+    assert progress == Progress.SAT_AND_CRIED | Progress.USED_ARMORY_KEY
+    assert flag_names(progress) == ['sat_and_cried', 'used_armory_key']
+    assert flag_names(NO_PROGRESS) == []
+
+
+if __name__ == "__main__":
+    test_flags_are_stable_single_bits()
+    test_every_consequence_has_a_flag()
+    test_names_round_trip()
+    print("✅ Progress flag tests passed")
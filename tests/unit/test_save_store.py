@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Save Store Test - Verify the SQLite save store keeps profiles apart, lists slots, imports files and takes concurrent sessions
+"""
+
+import sqlite3
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+DISTRIBUTION_DIR = Path(__file__).resolve().parents[2] / 'distribution'
+sys.path.insert(0, str(DISTRIBUTION_DIR))
+
+from game_core import GameCore
+from save_store import SaveStore, migrate_files
+from savegame import capture_state, save_game, slot_path
+from snapshot import capture
+
+
+def started(class_key, seed=5):
+    core = GameCore(seed=seed)
+    core.apply(('new_game', class_key))
+    return core
+
+
+def test_profiles_keep_their_own_slots(tmp_path):
+    """Slots are per profile, listed newest first, and survive reopening"""
+    store = SaveStore(tmp_path / 'saves.db')
+    warrior, mage = started('warrior'), started('mage')
+    store.save('alice', 'quicksave', capture_state(warrior))
+    mage.apply(('move', 'north'))
+    store.save('bob', 'quicksave', capture_state(mage))
+    store.save('bob', 'later', capture_state(mage))
+    store.close()
+
+    store = SaveStore(tmp_path / 'saves.db')
+    assert store.profiles() == ['alice', 'bob']
+    assert [slot for slot, _summary in store.list('bob')] == ['later', 'quicksave']
+    assert store.list('bob')[0][1]['scene'] == mage.current_scene
+    assert store.load('alice', 'quicksave')['scalars']['player_character'] == 'warrior'
+    with pytest.raises(FileNotFoundError):
+        store.load('alice', 'later')
+    store.delete('bob', 'later')
+    assert [slot for slot, _summary in store.list('bob')] == ['quicksave']
+    assert store._connection().execute("PRAGMA journal_mode").fetchone()[0] == 'wal'
+    store.close()
+
+
+def test_game_actions_use_the_profile(tmp_path):
+    """With save_store set, save, load and saves go to the database"""
+    store = SaveStore(tmp_path / 'saves.db')
+    core = started('rogue', seed=9)
+    core.save_store = store.profile('carol')
+    core.apply(('travel', 'primitive village'))
+    assert core.apply(('save', 'village')) == [('message', "Game saved to slot 'village'.")]
+
+    fresh = GameCore(seed=1)
+    fresh.save_store = store.profile('carol')
+    assert fresh.apply(('load', 'missing'))[0][1] == "There is no game saved in slot 'missing'."
+    fresh.apply(('load', 'village'))
+    assert capture(fresh) == capture(core)
+    assert 'village: Rogue level 1' in fresh.apply(('saves',))[0][1]
+    assert not slot_path('village', core.save_dir).exists()
+    store.close()
+
+
+def test_file_saves_migrate(tmp_path):
+    """migrate_files imports a save directory in one batch and reports unreadable files"""
+    save_dir = tmp_path / 'files'
+    core = started('mage')
+    save_game(core, save_dir / 'one.cvsav')
+    save_game(core, save_dir / 'two.cvsav')
+    (save_dir / 'broken.cvsav').write_bytes(b'not a save')
+
+    store = SaveStore(tmp_path / 'saves.db')
+    report = migrate_files(store, save_dir, 'dave')
+    assert report['imported'] == ['one', 'two'] and [name for name, _error in report['skipped']] == ['broken.cvsav']
+    loaded = GameCore(seed=1)
+    store.profile('dave').load_game(loaded, 'two')
+    assert capture(loaded) == capture(core)
+    store.close()
+
+
+def test_concurrent_sessions(tmp_path):
+    """Sessions on several threads save and load at once without errors"""
+    store = SaveStore(tmp_path / 'saves.db')
+    state = capture_state(started('warrior'))
+    errors = []
+
+    def session(number):
+        saves = store.profile(f"player{number}")
+        try:
+            for i in range(40):
+                saves.save(f"slot{i % 3}", state)
+                assert saves.load(f"slot{i % 3}")['scalars'] == state['scalars']
+        except (AssertionError, sqlite3.Error) as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=session, args=(number,)) for number in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    assert all(len(store.list(f"player{number}")) == 3 for number in range(6))
+    store.close()
+
+
+if __name__ == "__main__":
+    import tempfile
+    with tempfile.TemporaryDirectory() as directory:
+        test_profiles_keep_their_own_slots(Path(directory))
+    print("✅ Save store tests passed")
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Save Game Test - Verify saves restore every piece of state, reject bad data and migrate old formats
+"""
+
+import marshal
+import os
+import sys
+import zlib
+from pathlib import Path
+
+import pytest
+
+DISTRIBUTION_DIR = Path(__file__).resolve().parents[2] / 'distribution'
+sys.path.insert(0, str(DISTRIBUTION_DIR))
+
+import savegame
+from content import load_content
+from game_core import GameCore
+from item_registry import ItemRegistry
+from savegame import (HEADER, MAGIC, SaveFormatError, capture_state, decode, delete_save, dumps, index_path,
+                      list_saves, load_game, save_game, slot_path, write_atomic, write_save)
+from snapshot import capture
+
+MIDFIGHT = [('new_game', 'rogue'), ('travel', 'primitive village'), ('choose', 1), ('choose', 1), ('choose', 2)]
+CONTINUE = [('choose', 1), ('choose', 1), ('choose', 1), ('choose', 1), ('choose', 1)]
+
+
+def test_round_trip_continues_identically(tmp_path):
+    """A loaded core is in the saved state and rolls the same numbers afterwards"""
+    core = GameCore(seed=21)
+    for action in MIDFIGHT:
+        core.apply(action)
+    assert core.game_state == "in_combat"
+    path = save_game(core, tmp_path / 'fight.cvsav')
+
+    loaded = GameCore(seed=999)
+    load_game(loaded, path)
+    assert capture(loaded) == capture(core)
+    assert loaded.seed == 21 and len(loaded.history) == 0
+    for action in CONTINUE:
+        assert loaded.apply(action) == core.apply(action)
+
+
+def test_bad_data_is_rejected(tmp_path):
+    """Truncated, foreign, corrupt and newer saves raise SaveFormatError"""
+    core = GameCore(seed=3)
+    core.apply(('new_game', 'mage'))
+    data = dumps(core)
+    with pytest.raises(SaveFormatError):
+        decode(data[:5])
+    with pytest.raises(SaveFormatError):
+        decode(b'XXXX' + data[4:])
+    with pytest.raises(SaveFormatError):
+        decode(data[:-1] + bytes([data[-1] ^ 1]))
+    with pytest.raises(SaveFormatError):
+        decode(HEADER.pack(MAGIC, savegame.SAVE_FORMAT + 1, 0) + data[HEADER.size:])
+
+
+def test_old_formats_are_migrated(monkeypatch):
+    """A save of an older version is upgraded by each migration after it"""
+    core = GameCore(seed=3)
+    core.apply(('new_game', 'warrior'))
+    old = dumps(core)
+    monkeypatch.setattr(savegame, 'SAVE_FORMAT', savegame.SAVE_FORMAT + 1)
+    monkeypatch.setattr(savegame, 'MIGRATIONS', {})
+
+    with pytest.raises(SaveFormatError):
+        decode(old)
+
+    @savegame.migration(savegame.SAVE_FORMAT - 1)
+    def add_note(state):
+        state['note'] = 'migrated'
+
+    assert decode(old)['note'] == 'migrated'
+
+
+def test_writes_are_atomic(tmp_path, monkeypatch):
+    """A failed write leaves the previous save and no temporary files"""
+    path = tmp_path / 'slot.cvsav'
+    write_atomic(path, b'first')
+
+    def crash(src, dst):
+        raise OSError("disk full")
+    monkeypatch.setattr(os, 'replace', crash)
+    with pytest.raises(OSError):
+        write_atomic(path, b'second')
+    assert path.read_bytes() == b'first' and os.listdir(tmp_path) == ['slot.cvsav']
+
+
+def test_save_and_load_actions(tmp_path):
+    """The save and load actions use named slots in the core's save directory"""
+    core = GameCore(seed=8)
+    core.save_dir = tmp_path
+    core.apply(('new_game', 'warrior'))
+    core.apply(('move', 'north'))
+    assert core.apply(('save', 'north')) == [('message', "Game saved to slot 'north'.")]
+
+    fresh = GameCore(seed=1)
+    fresh.save_dir = tmp_path
+    assert fresh.apply(('load', 'missing'))[0][1] == "There is no game saved in slot 'missing'."
+    events = fresh.apply(('load', 'north'))
+    assert ('scene', core.current_scene) in events and fresh.current_scene == core.current_scene
+    assert list(fresh.inventory) == list(core.inventory)
+
+    # Slot names are file names: nothing outside the directory or below it
+    for slot in ('../outside', 'a/b', 'north.cvsav', ''):
+        for action in ('save', 'load'):
+            assert fresh.apply((action, slot))[0][1].startswith(f"Cannot use slot '{slot}': slot names may only")
+    assert sorted(path.name for path in tmp_path.iterdir()) == ['index.cvidx', 'north.cvsav']
+    with pytest.raises(ValueError):
+        slot_path('../outside', tmp_path)
+
+
+def test_malformed_saves_change_nothing(tmp_path):
+    """A save missing part of its state is reported, and loading it leaves the core as it was"""
+    core = GameCore(seed=8)
+    core.save_dir = tmp_path
+    core.apply(('new_game', 'warrior'))
+    state = capture_state(core)
+    state['scalars']['player_health'] = 1
+    del state['streams']
+    write_save(slot_path('broken', tmp_path), state)
+
+    before = capture(core)
+    assert core.apply(('load', 'broken'))[0][1] == "Could not load the game: The save has no 'streams' field"
+    assert capture(core) == before
+
+
+def test_story_loot_loads_into_a_fresh_registry(tmp_path):
+    """Items are restored by name, interned like a pickup when the registry does not know them yet"""
+    core = GameCore(seed=8)
+    core.apply(('new_game', 'rogue'))
+    core.inventory.extend(['Gold Coins', 'Rusty Dagger', 'Old Locket'])
+    path = save_game(core, tmp_path / 'loot.cvsav')
+
+    content = load_content()
+    content['item_registry'] = ItemRegistry()
+    loaded = GameCore(content=content, seed=1)
+    load_game(loaded, path)
+    assert loaded.inventory == ['Daggers', 'Health Potion', 'Leather Armor', 'Gold Coins', 'Rusty Dagger', 'Old Locket']
+    assert list(loaded.inventory.category('misc'))[-1] == 'Old Locket'
+
+
+def test_version_1_saves_gain_playtime():
+    """The real migration from format 1 fills in the playtime"""
+    core = GameCore(seed=3)
+    core.apply(('new_game', 'rogue'))
+    state = decode(dumps(core))
+    del state['playtime']
+    payload = zlib.compress(marshal.dumps(state))
+    assert decode(HEADER.pack(MAGIC, 1, zlib.crc32(payload)) + payload)['playtime'] == 0.0
+
+
+def test_index_lists_slots_without_opening_saves(tmp_path):
+    """Every save updates the slot index; a damaged index is rebuilt from the saves"""
+    core = GameCore(seed=8)
+    core.apply(('new_game', 'mage'))
+    save_game(core, tmp_path / 'first.cvsav')
+    core.apply(('move', 'north'))
+    save_game(core, tmp_path / 'second.cvsav')
+
+    slots = list_saves(tmp_path)
+    assert [slot for slot, _summary in slots] == ['second', 'first']
+    summary = slots[0][1]
+    assert (summary['class'], summary['level'], summary['scene']) == ('mage', 1, core.current_scene)
+
+    (tmp_path / 'second.cvsav').write_bytes(b'')  # only the index is read
+    assert list_saves(tmp_path) == slots
+
+    index_path(tmp_path).write_bytes(b'garbage')
+    assert [slot for slot, _summary in list_saves(tmp_path)] == ['first']
+
+    delete_save(tmp_path / 'first.cvsav')
+    assert list_saves(tmp_path) == [] and not (tmp_path / 'first.cvsav').exists()
+
+
+if __name__ == "__main__":
+    test_bad_data_is_rejected(None)
+    print("✅ Save game tests passed")
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Scene Graph Test - Verify reachability, shortest paths and lock gating
+"""
+
+import sys
+from pathlib import Path
+
+DISTRIBUTION_DIR = Path(__file__).resolve().parents[2] / 'distribution'
+sys.path.insert(0, str(DISTRIBUTION_DIR))
+
+from content import load_content
+from game_core import GameCore, parse_command
+from scene_graph import SceneGraph
+
+
+def test_shipped_walk_graph():
+    """The shipped world map has the expected routes and key gates"""
+    graph = load_content()['walk_graph']
+    assert graph.path('cave_entrance', 'armory') == [
+        ('north', 'skull_chamber'), ('west', 'primitive_village'), ('west', 'armory')]
+    assert graph.distance('armory', 'village_changed') == 4
+    assert graph.required_keys('alley') == frozenset()
+    assert graph.required_keys('healing_pool') == frozenset({"Chief's House Key"})
+    assert graph.unreachable() == ['cave_in']   # only reachable through a choice
+
+
+def test_story_graph_has_no_problems():
+    """Every scene can be reached, and left, once choices are included"""
+    assert load_content()['story_graph'].validate() == []
+
+
+def test_validation_finds_problems():
+    """Unreachable scenes and dead ends are reported"""
+    graph = SceneGraph(['start', 'pit', 'island'],
+                       {'start': {'down': 'pit'}, 'island': {'east': 'start'}}, {}, start='start')
+    assert not graph.reachable('start', 'island')
+    assert graph.reachable('island', 'pit')
+    problems = graph.validate()
+    assert "scene 'island' cannot be reached from 'start'" in problems
+    assert "scene 'pit' is a dead end" in problems
+
+
+def test_nested_locks_need_every_key():
+    """Scenes behind two locked doors need both keys"""
+    graph = SceneGraph(['a', 'b', 'c'], {'a': {'in': 'b'}, 'b': {'in': 'c'}},
+                       {'b': 'red', 'c': 'blue'}, start='a')
+    assert graph.required_keys('c') == frozenset({'red', 'blue'})
+    assert graph.regions() == {frozenset(): ['a'], frozenset({'red'}): ['b'],
+                               frozenset({'red', 'blue'}): ['c']}
+
+
+def test_travel_and_hint():
+    """The core walks shortest routes and stops at locked doors"""
+    core = GameCore()
+    core.apply(('new_game', 'warrior'))
+    core.apply(parse_command("travel to the alley"))
+    assert core.current_scene == 'alley'
+    core.apply(parse_command("travel armory"))
+    assert core.current_scene == 'primitive_village'
+    events = core.apply(('hint',))
+    assert "locked" in events[0][1]
+
+
+if __name__ == "__main__":
+    test_shipped_walk_graph()
+    test_story_graph_has_no_problems()
+    test_validation_finds_problems()
+    test_nested_locks_need_every_key()
+    test_travel_and_hint()
+    print("✅ Scene graph tests passed")
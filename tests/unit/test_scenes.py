@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Scenes Test - Verify shared immutable scene templates and per-run overlays
+"""
+
+import pickle
+import sys
+from pathlib import Path
+
+DISTRIBUTION_DIR = Path(__file__).resolve().parents[2] / 'distribution'
+sys.path.insert(0, str(DISTRIBUTION_DIR))
+
+from content import load_content
+from game_core import GameCore
+from scenes import SceneTemplate, setup_scenes
+
+
+def test_templates_are_immutable():
+    """Scene templates reject attribute and exit changes"""
+    template = load_content()['scene_templates']['armory']
+    assert template.key == 'Armory Key'
+    for attempt in (lambda: setattr(template, 'key', None),
+                    lambda: template.exits.__setitem__('up', 'alley')):
+        try:
+            attempt()
+        except (AttributeError, TypeError):
+            pass
+        else:
+            raise AssertionError("template was modified")
+    assert not hasattr(template, '__dict__')
+    assert pickle.loads(pickle.dumps(template)) == template
+
+
+def test_templates_shared_between_runs():
+    """Every core built from the same content shares one set of templates"""
+    content = load_content()
+    first, second = GameCore(content), GameCore(content)
+    assert first.scene_templates is second.scene_templates
+    assert first.scene_state is not second.scene_state
+
+
+def test_overlay_resets_on_new_game():
+    """Unlocked doors and visited scenes belong to a single run"""
+    core = GameCore()
+    core.apply(('new_game', 'warrior'))
+    core.current_scene = 'primitive_village'
+    core.inventory.append('Armory Key')
+    core.apply(('move', 'west'))
+    assert not core.scene_state.is_locked('armory')
+    assert 'armory' in core.scene_state.visited
+
+    core.apply(('new_game', 'mage'))
+    assert core.scene_state.is_locked('armory')
+    assert core.scene_state.visited == {'cave_entrance'}
+    assert core.scene_templates['armory'].key == 'Armory Key'
+
+
+def test_legacy_setup_scenes():
+    """setup_scenes still returns mutable scenes keyed by display name"""
+    scenes = setup_scenes()
+    assert scenes['Armory'].locked
+    assert scenes['Primitive Village'].exits['west'] == 'Armory'
+
+
+if __name__ == "__main__":
+    test_templates_are_immutable()
+    test_templates_shared_between_runs()
+    test_overlay_resets_on_new_game()
+    test_legacy_setup_scenes()
+    print("✅ Scenes tests passed")
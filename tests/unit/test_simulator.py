@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Combat Simulator Test - Verify the vectorized simulator matches GameCore combat
+"""
+
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+DISTRIBUTION_DIR = Path(__file__).resolve().parents[2] / 'distribution'
+sys.path.insert(0, str(DISTRIBUTION_DIR))
+
+np = pytest.importorskip('numpy')
+
+from config import ENCOUNTERS, ENEMY_PROFILES
+from content import load_content
+from game_core import GameCore
+from simulator import DEFEATED, ESCAPED, WON, simulate, simulate_matrix
+
+POLICY = {'basic_attack': 0.5, 'defend': 0.3, 'run': 0.2}
+
+
+def _core_fights(class_key, fights, seed, encounter='alley'):
+    """Play fights of an encounter through GameCore with the same random policy"""
+    core = GameCore(seed=seed, history_depth=0)
+    core.apply(('new_game', class_key))
+    choose = random.Random(seed + 1)
+    skills = list(POLICY)
+    outcomes = {WON: 0, ESCAPED: 0, DEFEATED: 0}
+    damage = 0
+    for _ in range(fights):
+        core.player_health = core.classes[class_key]['health']
+        core.player_experience = 0   # no level-up heals mid-sample
+        core.defending = False
+        start_health = core.player_health
+        core.start_encounter(encounter)   # a faster enemy may already strike here
+        while core.game_state == 'in_combat':
+            skill = choose.choices(skills, weights=list(POLICY.values()))[0]
+            core.handle_combat_action(core.available_combat_skills.index(skill) + 1)
+        damage += start_health - core.player_health
+        if core.combat_enemy_health <= 0:
+            outcomes[WON] += 1
+        elif core.player_health <= 0:
+            outcomes[DEFEATED] += 1
+        else:
+            outcomes[ESCAPED] += 1
+        core._events = []
+    return {k: v / fights for k, v in outcomes.items()}, damage / fights
+
+
+def test_outcome_rates_match_core():
+    """Win, escape and defeat rates agree with scripted GameCore fights"""
+    for class_key in ('rogue', 'mage'):
+        expected, expected_damage = _core_fights(class_key, 3000, seed=7)
+        stats = simulate(class_key, 200000, policy=POLICY, seed=7)
+        for outcome in (WON, ESCAPED, DEFEATED):
+            assert abs(stats.rate(outcome) - expected[outcome]) < 0.03
+        assert abs(stats.damage_taken.mean() - expected_damage) < 1.5
+
+
+def test_fast_enemy_matches_core(monkeypatch):
+    """A wraith faster than the player attacks first and sometimes twice a turn, as in GameCore"""
+    monkeypatch.setitem(ENCOUNTERS, 'lone_wraith', {'enemies': (('shadow_wraith', 1),), 'intro': "A wraith!",
+                                                    'experience': 0, 'key_for': None, 'victory': ()})
+    expected, expected_damage = _core_fights('mage', 3000, seed=5, encounter='lone_wraith')
+    stats = simulate('mage', 200000, policy=POLICY, seed=5, enemy=ENEMY_PROFILES['shadow_wraith'])
+    for outcome in (WON, ESCAPED, DEFEATED):
+        assert abs(stats.rate(outcome) - expected[outcome]) < 0.03
+    assert abs(stats.damage_taken.mean() - expected_damage) < 0.5
+
+
+def test_distributions_and_matrix():
+    """Results expose turns-to-kill and damage distributions for every weapon"""
+    stats = simulate('rogue', 50000, seed=3)
+    histogram = stats.turns_to_kill()
+    assert sum(histogram.values()) == int((stats.outcome == WON).sum())
+    assert set(histogram) <= {1, 2, 3}
+    assert stats.damage_distribution((0,))[0] >= 0
+
+    results = simulate_matrix(1000, seed=3)
+    content = load_content()
+    assert len(results) == len(content['classes']) * len(content['weapons'])
+    assert all(stats.fights == 1000 for stats in results)
+
+
+if __name__ == "__main__":
+    test_outcome_rates_match_core()
+    test_distributions_and_matrix()
+    print("✅ Combat simulator tests passed")
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Snapshot Test - Verify undo history and structural sharing
+"""
+
+import sys
+from pathlib import Path
+
+DISTRIBUTION_DIR = Path(__file__).resolve().parents[2] / 'distribution'
+sys.path.insert(0, str(DISTRIBUTION_DIR))
+
+from game_core import GameCore, parse_command
+from snapshot import History, capture
+
+
+def _village_core(depth=50):
+    """Start a warrior game and walk to the primitive village"""
+    core = GameCore(seed=3, history_depth=depth)
+    core.apply(('new_game', 'warrior'))
+    core.apply(('move', 'north'))
+    core.apply(('move', 'west'))
+    return core
+
+
+def test_undo_restores_everything():
+    """Undo rewinds health, inventory, progress, scene and combat state"""
+    core = _village_core()
+    before = capture(core)
+    core.apply(('choose', 1))   # follow the creature into the alley
+    core.apply(('choose', 1))   # confront it - combat starts
+    core.apply(('choose', 1))   # attack
+    assert core.game_state == 'in_combat' or 'Armory Key' in core.inventory
+
+    core.apply(('undo', 3))
+    assert capture(core) == before
+    assert core.current_scene == 'primitive_village'
+
+
+def test_undo_restores_unlocked_doors():
+    """Doors unlocked by an undone move are locked again"""
+    core = _village_core()
+    core.inventory.append('Armory Key')
+    core.apply(('move', 'west'))
+    assert not core.scene_state.is_locked('armory')
+    core.apply(('undo',))
+    assert core.scene_state.is_locked('armory')
+    assert core.current_scene == 'primitive_village'
+
+
+def test_noop_actions_are_not_recorded():
+    """Invalid choices and blocked moves leave nothing to undo"""
+    core = _village_core()
+    depth = len(core.history)
+    core.apply(('choose', 9))
+    core.apply(('move', 'up'))
+    core.apply(('look',))
+    assert len(core.history) == depth
+
+
+def test_history_depth_and_sharing():
+    """History is bounded and unchanged parts are shared between snapshots"""
+    core = _village_core(depth=5)
+    for _ in range(10):
+        core.apply(('move', 'north'))
+        core.apply(('move', 'south'))
+    assert len(core.history) == 5
+    report = core.history.memory_report()
+    assert report['snapshots'] == 5
+    assert report['bytes'] < report['bytes_without_sharing']
+
+    assert History(0).push(core) is None
+    assert parse_command("undo 3") == ('undo', 3)
+
+
+if __name__ == "__main__":
+    test_undo_restores_everything()
+    test_undo_restores_unlocked_doors()
+    test_noop_actions_are_not_recorded()
+    test_history_depth_and_sharing()
+    print("✅ Snapshot tests passed")